@@ -3,6 +3,10 @@
 Project Session Context Builder
 Combines my_architecture.md with swap_CLAUDE.md to create updated CLAUDE.md
 This ensures each new session starts with both architecture understanding and recent context
+
+The natural commands section (one sed per wrapper) is cached in
+data/swap_prep/ until a wrapper changes; --prewarm refreshes that cache
+ahead of a swap without writing CLAUDE.md.
 """
 
 import os
@@ -76,6 +80,46 @@ def update_clap_architecture_tree(autonomy_dir):
     except Exception as e:
         print(f"Warning: Could not update directory tree - {e}")
 
+def _wrappers_signature(wrappers_dir, parser_script):
+    """Names and mtimes of every wrapper plus the parser - changes when any do."""
+    entries = sorted(
+        (entry.name, entry.stat().st_mtime_ns)
+        for entry in os.scandir(wrappers_dir)
+        if entry.is_file()
+    )
+    return [entries, parser_script.stat().st_mtime_ns]
+
+
+def get_natural_commands(autonomy_dir):
+    """Formatted natural commands from wrappers/, cached until a wrapper changes"""
+    wrappers_dir = autonomy_dir.parent / "wrappers"
+    parser_script = autonomy_dir.parent / "utils" / "parse_natural_commands.sh"
+    if not wrappers_dir.exists() or not parser_script.exists():
+        return ""
+
+    cache_file = autonomy_dir.parent / "data" / "swap_prep" / "natural_commands.json"
+    signature = _wrappers_signature(wrappers_dir, parser_script)
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        if cached.get("signature") == signature:
+            return cached["content"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    # Run the parser script to get formatted commands from wrappers/
+    result = subprocess.run([str(parser_script)], capture_output=True, text=True)
+    if result.returncode != 0:
+        return ""
+    content = f"\n\n{result.stdout}\n"
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(cache_file, 'w', encoding='utf-8') as f:
+            json.dump({"signature": signature, "content": content}, f)
+    except OSError as e:
+        print(f"Warning: Could not cache natural commands - {e}")
+    return content
+
 def build_claude_md(minimal=False):
     """Build CLAUDE.md from architecture and conversation history.
 
@@ -113,18 +157,10 @@ def build_claude_md(minimal=False):
         
         # Parse available commands from wrappers directory
         natural_commands_content = ""
-        wrappers_dir = autonomy_dir.parent / "wrappers"
-        if wrappers_dir.exists():
-            import subprocess
-            try:
-                # Run the parser script to get formatted commands from wrappers/
-                parser_script = autonomy_dir.parent / "utils" / "parse_natural_commands.sh"
-                if parser_script.exists():
-                    result = subprocess.run([str(parser_script)], capture_output=True, text=True)
-                    if result.returncode == 0:
-                        natural_commands_content = f"\n\n{result.stdout}\n"
-            except Exception as e:
-                print(f"Warning: Could not parse commands from wrappers - {e}")
+        try:
+            natural_commands_content = get_natural_commands(autonomy_dir)
+        except Exception as e:
+            print(f"Warning: Could not parse commands from wrappers - {e}")
         
         # Parse personal commands content (if exists)
         personal_commands_content = ""
@@ -235,6 +271,9 @@ def build_claude_md(minimal=False):
     return True
 
 if __name__ == "__main__":
+    if "--prewarm" in sys.argv:
+        get_natural_commands(Path(__file__).parent)
+        exit(0)
     minimal = "--minimal" in sys.argv
     success = build_claude_md(minimal=minimal)
     exit(0 if success else 1)
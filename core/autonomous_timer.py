@@ -7,6 +7,10 @@ This script runs continuously and:
 - Checks for new Discord messages every 30 seconds
 - Sends free time prompts every 2 minutes when Amy is away
 - Uses tmux send-keys to communicate with the permanent Claude session
+
+Each of these is a duty on utils/scheduler.py with its own cadence, so
+cheap checks run often, expensive ones less so, and events (SIGUSR1, an
+expiring pause, the human leaving) wake the relevant duty immediately.
 """
 
 import time
@@ -18,7 +22,7 @@ import glob
 import re
 import signal
 import collections
-import requests
+import atexit
 from datetime import datetime, timedelta
 from pathlib import Path
 
@@ -28,14 +32,43 @@ sys.path.append(str(Path(__file__).parent.parent))
 # Add utils directory specifically for infrastructure_config_reader's imports
 sys.path.append(str(Path(__file__).parent.parent / "utils"))
 from utils.claude_paths import get_clap_dir
-from utils.infrastructure_config_reader import get_config_value
+from utils.infrastructure_config_reader import (
+    get_config_value,
+    get_config_bool,
+    get_config_float,
+)
 from utils.track_activity import is_idle
 from utils.check_seeds import get_seed_reminder
-from utils.check_context import check_context
+from utils.check_context import check_context, YELLOW_THRESHOLD, RED_THRESHOLD
 from utils.systemd_notify import notify_ready, notify_watchdog
-from utils.check_usage import check_usage
-from utils.health_reporter import write_status
+from utils.check_usage import check_usage, StatuslineSnapshot
+from utils.health_reporter import write_status, write_metrics
 from utils.clap_logger import get_logger
+from utils.scheduler import Scheduler
+from utils.state_store import StateStore, TIMER_STATE_DB, atomic_write_json
+from utils.file_watch import FileWatchCache
+from utils.api_error_classifier import classify as classify_api_errors
+from utils.pane_snapshot import get_snapshot, invalidate as invalidate_snapshot
+from utils.pane_stream import PaneStreamScanner
+from utils.healthcheck_client import HealthcheckClient
+from utils.loop_metrics import LoopMetrics
+from utils.resource_reporter import ResourceShareReporter, SPOOL_DB
+from utils.usage_series import UsageSeries
+from utils.context_forecast import ContextForecaster
+from utils.prompt_templates import PromptRegistry
+from utils.outbound_queue import (
+    OutboundQueue,
+    PRIORITY_CRITICAL,
+    PRIORITY_HIGH,
+    PRIORITY_NORMAL,
+)
+from utils.tmux_control import (
+    child_process_running,
+    pane_pid as get_pane_pid,
+    session_attached,
+    session_exists,
+    subscribe as tmux_subscribe,
+)
 
 # Configuration
 AUTONOMY_DIR = get_clap_dir()
@@ -52,66 +85,137 @@ RESOURCE_TRACKING_STATE_FILE = DATA_DIR / "last_cache_tokens.json"
 MAMA_HEN_STATE_FILE = DATA_DIR / "mama_hen_alerts.json"
 TIMER_PAUSE_FILE = DATA_DIR / "timer_pause.json"
 AUTONOMY_CHOICE_FILE = DATA_DIR / "autonomy_choice.json"
+DISCORD_CHANNELS_FILE = DATA_DIR / "discord_channels.json"  # Channel heads, owned by the fetcher
+DISCORD_FETCHER_STATUS_FILE = DATA_DIR / "discord_fetcher_status.json"
+DISCORD_FEED_STALE_SECONDS = 300  # Fetcher silent this long = notifications are stale
+USER_PRESENCE_FILE = DATA_DIR / "user_presence.json"  # Read by the fetcher's poll schedule
+SESSION_SWAP_LOCK = DATA_DIR / "session_swap.lock"
+STATUSLINE_FILE = DATA_DIR / "statusline_data.json"
+
+# Statusline writes come in bursts; wait this long (at most) to coalesce
+# them before evaluating context alerts
+CONTEXT_ALERT_DEBOUNCE = 0.5
+
+# Start swap preparation when context is forecast to reach 95% within
+# this many minutes (0 disables), and refresh it at most this often
+SWAP_PREWARM_MINUTES = get_config_float("SWAP_PREWARM_MINUTES", 15.0)
+SWAP_PREP_REFRESH = 300
+SWAP_PREP_SCRIPT = AUTONOMY_DIR / "utils" / "swap_prep.py"
+
+# Longest sleep between checks while waiting out a usage limit
+USAGE_LIMIT_LOG_INTERVAL = 600
+
+# One-shot duty that rechecks an API error after a wait (replaced, never
+# stacked, if another error comes in meanwhile)
+ERROR_RECHECK = "error_recheck"
+OAUTH_RECHECK_INTERVAL = 600  # Expired token: only a human can fix it
+
+# Parsed copies of the data/config files polled every cycle, re-read only
+# after inotify (or a changed mtime/inode) says the file changed
+FILE_CACHE = FileWatchCache()
+
+# Timer-private state lives in one SQLite store, read once and committed
+# once per scheduler pass. api_error_state.json, timer_pause.json and
+# autonomy_choice.json stay files because wrappers and scripts use them.
+# Opened by main() (open_state_store), never at import: importing this
+# module (profiler, tools) must not migrate or delete anyone's state files.
+STATE_STORE = None
+
+
+def open_state_store():
+    """Open the timer's state store, importing (and removing) the files it replaced"""
+    global STATE_STORE
+    STATE_STORE = StateStore(DATA_DIR / TIMER_STATE_DB)
+    STATE_STORE.migrate_files(
+        [
+            ("context_state", CONTEXT_STATE_FILE, "json"),
+            ("mama_hen", MAMA_HEN_STATE_FILE, "json"),
+            ("last_autonomy_prompt", LAST_AUTONOMY_FILE, "text"),
+            ("last_seen_message_id", DATA_DIR / "last_seen_message_id.txt", "text"),
+            ("last_notification_alert", DATA_DIR / "last_notification_alert.txt", "text"),
+            (
+                "last_cache_tokens",
+                RESOURCE_TRACKING_STATE_FILE,
+                lambda text: json.loads(text)["cache_tokens"],
+            ),
+        ]
+    )
+    return STATE_STORE
+
 
 logger = get_logger("autonomous-timer")
 
+# Context growth per turn and per second, fed by statusline writes
+CONTEXT_FORECASTER = ContextForecaster(target=0.95)
+
+# Rolling latency of each duty and of the slow phases inside them
+# (tmux probes, the Discord sweep, message delivery), plus loop lag.
+# Written every minute to a Prometheus textfile and the health dir.
+METRICS = LoopMetrics("clap_timer")
+METRICS_TEXTFILE = Path(
+    get_config_value(
+        "METRICS_TEXTFILE", str(DATA_DIR / "metrics" / "autonomous_timer.prom")
+    )
+)
+
+
+def timed_delivery(message):
+    with METRICS.span("tmux_send"):
+        return deliver_tmux_message(message)
+
+
+# Prompts and alerts for Claude go through one sender thread, so the loop
+# never waits on send_to_claude.sh
+OUTBOUND_QUEUE = OutboundQueue(timed_delivery, logger)
+AUTONOMY_PROMPT_KEY = "autonomy_prompt"  # Autonomy/turn prompts replace each other
+
+# Auto-swap: seconds after the warning lands, and the longest we wait for it
+AUTO_SWAP_GRACE = 2
+AUTO_SWAP_MAX_WAIT = 32
+
 # Resource-share webhook configuration
 WEBHOOK_HOST = get_config_value("WEBHOOK_HOST", "localhost")
 RESOURCE_SHARE_WEBHOOK_URL = f"http://{WEBHOOK_HOST}:8765/resource-share/increment"
+# Per-turn cost/token history with minute/hour/day rollups
+USAGE_SERIES = UsageSeries(DATA_DIR / "usage_series")
+
+RESOURCE_REPORTER = ResourceShareReporter(
+    RESOURCE_SHARE_WEBHOOK_URL,
+    DATA_DIR / SPOOL_DB,
+    claude_name=get_config_value("CLAUDE_NAME") or "Unknown",
+    on_response=lambda response_data: apply_coop_response(response_data),
+)
+
+# healthchecks.io: one timed loop iteration reported every 30s, sent
+# from a background thread so a slow hc-ping.com never stalls the loop
+HEALTHCHECK = HealthcheckClient(
+    get_config_value(
+        "AUTONOMOUS_TIMER_PING",
+        "https://hc-ping.com/075636dd-b5d3-4ae5-afac-c65bd0f630f3",
+    )
+)
 
-# Discord API configuration
-DISCORD_API_BASE = "https://discord.com/api/v10"
-INFRA_CONFIG = AUTONOMY_DIR / "config" / "claude_infrastructure_config.txt"
 
 
 def is_tmux_session_attached():
     """Check if the autonomous-claude tmux session is currently attached"""
     try:
-        result = subprocess.run(
-            ["tmux", "list-sessions", "-F", "#{session_name} #{session_attached}"],
-            capture_output=True,
-            text=True,
-            timeout=5,
-        )
-        if result.returncode == 0:
-            for line in result.stdout.strip().split("\n"):
-                if line.startswith("autonomous-claude "):
-                    # Line format: "autonomous-claude 1" (attached) or "autonomous-claude 0" (detached)
-                    parts = line.split()
-                    if len(parts) >= 2 and parts[1] == "1":
-                        return True
-        return False
+        return session_attached(CLAUDE_SESSION)
     except Exception as e:
         logger.debug(f"Error checking tmux attachment: {e}")
         return False  # Default to autonomy if we can't determine
 
 
-def load_prompts_config():
-    """Load prompts configuration from JSON file"""
-    try:
-        if PROMPTS_FILE.exists():
-            with open(PROMPTS_FILE, "r") as f:
-                return json.load(f)
-        else:
-            logger.info(f"Prompts configuration file not found: {PROMPTS_FILE}")
-            return None
-    except Exception as e:
-        logger.error(f"Loading prompts configuration: {e}")
-        return None
-
-
-# Load prompts at startup
-PROMPTS_CONFIG = load_prompts_config()
+# Load prompts at startup (validated and precompiled; reloaded by main()
+# whenever prompts.json changes, keeping the last good version on errors)
+PROMPTS = PromptRegistry(PROMPTS_FILE)
 
 
 def load_context_state():
-    """Load context escalation state from file"""
-    try:
-        if CONTEXT_STATE_FILE.exists():
-            with open(CONTEXT_STATE_FILE, "r") as f:
-                return json.load(f)
-    except Exception as e:
-        logger.error(f"Loading context state: {e}")
+    """Load context escalation state from the state store"""
+    context_state = STATE_STORE.get_dict("context_state")
+    if context_state is not None:
+        return context_state
 
     # Return default state
     return {
@@ -122,12 +226,8 @@ def load_context_state():
 
 
 def save_context_state(state):
-    """Save context escalation state to file"""
-    try:
-        with open(CONTEXT_STATE_FILE, "w") as f:
-            json.dump(state, f, indent=2)
-    except Exception as e:
-        logger.error(f"Saving context state: {e}")
+    """Save context escalation state (committed at the end of the pass)"""
+    STATE_STORE.set("context_state", state)
 
 
 def reset_context_state():
@@ -181,47 +281,14 @@ def log_swap_attempt(attempt_type, context_percentage, keyword=None):
         return 0
 
 
-def ping_healthcheck():
-    """Ping healthchecks.io to signal service is alive"""
-    try:
-        ping_url = get_config_value(
-            "AUTONOMOUS_TIMER_PING",
-            "https://hc-ping.com/075636dd-b5d3-4ae5-afac-c65bd0f630f3",
-        )
-        result = subprocess.run(
-            ["curl", "-fsS", "-m", "10", "--retry", "3", "-o", "/dev/null", ping_url],
-            capture_output=True,
-            text=True,
-        )
-
-        if result.returncode == 0:
-            return True
-        else:
-            logger.info(f"Healthcheck ping failed: {result.stderr}")
-            return False
-    except Exception as e:
-        logger.info(f"Healthcheck ping error: {e}")
-        return False
-
-
 def load_mama_hen_state():
     """Load Mama-hen alert state to avoid duplicate alerts"""
-    try:
-        if MAMA_HEN_STATE_FILE.exists():
-            with open(MAMA_HEN_STATE_FILE, "r") as f:
-                return json.load(f)
-    except Exception as e:
-        logger.error(f"Loading Mama-hen state: {e}")
-    return {"alerted": {}}
+    return STATE_STORE.get_dict("mama_hen") or {"alerted": {}}
 
 
 def save_mama_hen_state(state):
     """Save Mama-hen alert state"""
-    try:
-        with open(MAMA_HEN_STATE_FILE, "w") as f:
-            json.dump(state, f, indent=2)
-    except Exception as e:
-        logger.error(f"Saving Mama-hen state: {e}")
+    STATE_STORE.set("mama_hen", state)
 
 
 def handle_mama_hen_alerts(overdue_alerts):
@@ -300,30 +367,16 @@ def check_claude_session_alive():
     """Verify Claude Code is actually running in the autonomous-claude tmux session"""
     try:
         # Check if autonomous-claude session exists
-        result = subprocess.run(
-            ["tmux", "has-session", "-t", CLAUDE_SESSION], capture_output=True
-        )
-        if result.returncode != 0:
+        if not session_exists(CLAUDE_SESSION):
             return False
 
         # Get the pane PID for autonomous-claude session
-        result = subprocess.run(
-            ["tmux", "list-panes", "-t", CLAUDE_SESSION, "-F", "#{pane_pid}"],
-            capture_output=True,
-            text=True,
-        )
-        if result.returncode != 0:
-            return False
-
-        pane_pid = result.stdout.strip()
+        pane_pid = get_pane_pid(CLAUDE_SESSION)
         if not pane_pid:
             return False
 
         # Check if claude process is running under this pane
-        result = subprocess.run(
-            ["pgrep", "-P", pane_pid, "claude"], capture_output=True
-        )
-        return result.returncode == 0
+        return child_process_running(pane_pid, "claude")
 
     except Exception as e:
         logger.error(f"Checking Claude session: {e}")
@@ -412,16 +465,54 @@ def get_token_percentage():
         return f"Context check failed: {str(e)}"
 
 
+def apply_coop_response(response_data):
+    """Act on a resource-share response: new interval, Mama-hen alerts.
+
+    Called from the reporter's thread for whichever POST got through.
+    """
+    global AUTONOMY_PROMPT_INTERVAL
+    if "recommended_interval" in response_data:
+        new_interval = response_data["recommended_interval"]
+
+        # Validate interval is a positive integer
+        if isinstance(new_interval, (int, float)) and new_interval > 0:
+            old_interval = AUTONOMY_PROMPT_INTERVAL
+            AUTONOMY_PROMPT_INTERVAL = int(new_interval)
+
+            if new_interval != old_interval:
+                # Format fairness value safely (may be missing or non-numeric)
+                fairness = response_data.get('multipliers', {}).get('fairness')
+                fairness_str = f"{fairness:.2f}" if isinstance(fairness, (int, float)) else "?"
+
+                logger.info(
+                    f"Interval updated by CoOP: {old_interval}s → {new_interval}s "
+                    f"(fairness: {fairness_str}x, "
+                    f"quota: {response_data.get('quota_status', 'unknown')})"
+                )
+        else:
+            logger.warning(
+                f"Invalid interval from CoOP: {new_interval} - keeping current {AUTONOMY_PROMPT_INTERVAL}s"
+            )
+
+    # Handle overdue_alerts from Mama-hen system
+    overdue_alerts = response_data.get("overdue_alerts")
+    if overdue_alerts:
+        handle_mama_hen_alerts(overdue_alerts)
+
+
 def track_resource_usage():
     """
     Track usage cost and report to resource-share webhook.
-    Gets $ cost delta from check_usage and POSTs to CoOP server.
+    Gets $ cost delta from check_usage and hands it to the resource-share
+    reporter, which spools it and POSTs to CoOP in the background.
     Also maintains cache token tracking for context display purposes.
     """
-    global AUTONOMY_PROMPT_INTERVAL
     try:
+        # One statusline read for both usage and context
+        statusline = StatuslineSnapshot.current()
+
         # Get usage cost delta from check_usage (primary metric for CoOP)
-        usage_data, error = check_usage(return_data=True)
+        usage_data, error = check_usage(return_data=True, snapshot=statusline)
         if error or not usage_data:
             logger.debug(
                 f"Resource-share tracking skipped - check_usage failed: {error}"
@@ -431,94 +522,35 @@ def track_resource_usage():
         cost_delta = usage_data.get("delta_cost", 0.0)
 
         # Also get cache tokens for state tracking (context display purposes)
-        context_data, context_error = check_context(return_data=True)
+        context_data, context_error = check_context(
+            return_data=True, snapshot=statusline
+        )
         current_cache_tokens = 0
+        context_tokens = 0
         if not context_error and context_data:
             current_cache_tokens = context_data.get("cache_tokens", 0)
+            context_tokens = context_data.get("total_tokens", 0)
 
-        # Only POST if cost_delta > 0
+        # Only report if cost_delta > 0
         if cost_delta > 0:
-            # Get Claude name from infrastructure config
-            claude_name = get_config_value("CLAUDE_NAME")
-            if not claude_name:
-                claude_name = "Unknown"  # Fallback
+            # Per-turn history for quota-status and health tooling
+            try:
+                USAGE_SERIES.append(
+                    time.time(),
+                    usage_data.get("session_id"),
+                    cost_delta,
+                    context_tokens,
+                    current_cache_tokens,
+                )
+            except OSError as e:
+                logger.error(f"Recording usage history: {e}")
 
             # Detect mode based on tmux session attachment
             mode = "collaboration" if is_tmux_session_attached() else "autonomy"
 
-            # Get hostname and IP for parallel instance detection
-            import socket
-
-            hostname = socket.gethostname()
-            try:
-                # Get primary IP address (first non-loopback)
-                ip_address = socket.gethostbyname(hostname)
-            except:
-                ip_address = "unknown"
-
-            # Prepare payload with current interval + instance identification
-            payload = {
-                "claude_name": claude_name,
-                "cost_delta": cost_delta,
-                "mode": mode,
-                "current_interval": AUTONOMY_PROMPT_INTERVAL,
-                "hostname": hostname,  # Parallel instance detection
-                "ip_address": ip_address,  # Parallel instance detection
-            }
-
-            # POST to resource-share webhook
-            try:
-                response = requests.post(
-                    RESOURCE_SHARE_WEBHOOK_URL, json=payload, timeout=5
-                )
-                if response.status_code == 200:
-                    logger.debug(
-                        f"Resource-share reported ${cost_delta:.4f} cost for {claude_name}"
-                    )
-
-                    # Read recommended interval from response and update if provided
-                    try:
-                        response_data = response.json()
-                        if "recommended_interval" in response_data:
-                            new_interval = response_data["recommended_interval"]
-
-                            # Validate interval is a positive integer
-                            if (
-                                isinstance(new_interval, (int, float))
-                                and new_interval > 0
-                            ):
-                                old_interval = AUTONOMY_PROMPT_INTERVAL
-                                AUTONOMY_PROMPT_INTERVAL = int(new_interval)
-
-                                if new_interval != old_interval:
-                                    # Format fairness value safely (may be missing or non-numeric)
-                                    fairness = response_data.get('multipliers', {}).get('fairness')
-                                    fairness_str = f"{fairness:.2f}" if isinstance(fairness, (int, float)) else "?"
-
-                                    logger.info(
-                                        f"Interval updated by CoOP: {old_interval}s → {new_interval}s "
-                                        f"(fairness: {fairness_str}x, "
-                                        f"quota: {response_data.get('quota_status', 'unknown')})"
-                                    )
-                            else:
-                                logger.warning(
-                                    f"Invalid interval from CoOP: {new_interval} - keeping current {AUTONOMY_PROMPT_INTERVAL}s"
-                                )
-
-                        # Handle overdue_alerts from Mama-hen system
-                        overdue_alerts = response_data.get("overdue_alerts")
-                        if overdue_alerts:
-                            handle_mama_hen_alerts(overdue_alerts)
-                    except (json.JSONDecodeError, KeyError) as e:
-                        logger.debug(
-                            f"Could not parse interval from response: {e}"
-                        )
-                else:
-                    logger.warning(
-                        f"Resource-share webhook returned {response.status_code}"
-                    )
-            except requests.exceptions.RequestException as e:
-                logger.warning(f"resource-share webhook request failed: {e}")
+            # check_usage has already moved its baseline, so the delta goes
+            # to the durable spool first - it survives webhook outages
+            RESOURCE_REPORTER.report(cost_delta, mode, AUTONOMY_PROMPT_INTERVAL)
         else:
             logger.debug(
                 f"Resource-share skipped - cost_delta is ${cost_delta:.4f} (need > 0)"
@@ -527,8 +559,7 @@ def track_resource_usage():
         # Save current cache tokens for backwards compatibility (even if cost_delta was 0)
         # Note: check_usage.py handles its own state in last_usage_cost.json
         if current_cache_tokens > 0:
-            with open(RESOURCE_TRACKING_STATE_FILE, "w") as f:
-                json.dump({"cache_tokens": current_cache_tokens}, f)
+            STATE_STORE.set("last_cache_tokens", current_cache_tokens)
 
     except Exception as e:
         logger.error(f"Resource-share tracking failed: {e}")
@@ -538,187 +569,17 @@ def detect_api_errors(tmux_output):
     """
     Detect API errors in tmux output using color codes
     Returns: dict with error_type, details, and reset_time (if applicable)
-    """
-    # Split output into lines for position-aware checking
-    lines = tmux_output.split("\n")
-
-    # ANSI color codes:
-    # [38;5;211m = Pink (errors)
-    # [38;5;220m = Yellow (warnings)
-    # [31m or [91m = Red (also errors)
-
-    # Check last 2 lines for yellow warnings (approaching usage limit)
-    if len(lines) >= 2:
-        last_two_lines = "\n".join(lines[-2:])
-        # Look for yellow text about approaching limit (with middle dot ·)
-        yellow_pattern = r"\[38;5;220m.*?(approaching.*?usage.*?limit.*?[·•.].*?reset.*?(\d{1,2}(?::\d{2})?(?:am|pm)?))"
-        yellow_match = re.search(yellow_pattern, last_two_lines, re.IGNORECASE)
-        if yellow_match:
-            reset_time = yellow_match.group(2) if yellow_match.lastindex >= 2 else None
-            return {
-                "error_type": "approaching_limit",
-                "details": "Approaching usage limit warning",
-                "reset_time": reset_time,
-            }
-
-    # Check for pink errors (38;5;211) anywhere in output
-    pink_pattern = r"\[38;5;211m([^\[]*)"
-    pink_matches = re.findall(pink_pattern, tmux_output)
-
-    for error_text in pink_matches:
-        # Skip auto-update warnings
-        if "Auto-update failed" in error_text:
-            continue
-
-        # Log any pink text containing JSON-related words for diagnostics.
-        # Previously this triggered an immediate session swap, but the regex
-        # (json.*error) was too broad and caused false positives at high context,
-        # racing with the rolling swap mechanism. Real API errors are now caught
-        # by the HTTP status code handlers (400/500/503) below.
-        if re.search(
-            r"malformed.*json|json.*error|invalid.*json", error_text, re.IGNORECASE
-        ):
-            logger.warning(
-                "Pink text matched JSON pattern (not acting on it): %r",
-                error_text.strip()[:200],
-            )
-
-        # Check for 503 errors (upstream connect error or disconnect/reset)
-        if re.search(
-            r"503|upstream.*connect.*error|disconnect.*reset.*before.*headers",
-            error_text,
-            re.IGNORECASE,
-        ):
-            return {
-                "error_type": "api_503_error",
-                "details": "API 503 error - upstream connection failure",
-                "reset_time": None,
-            }
-
-        # Check for usage limit errors
-        usage_pattern = (
-            r"limit will reset at (\d{1,2}(?::\d{2})?(?:am|pm)?)\s*\(([^)]+)\)"
-        )
-        usage_match = re.search(usage_pattern, error_text, re.IGNORECASE)
-        if usage_match:
-            reset_time_str = usage_match.group(1)
-            timezone = usage_match.group(2)
-
-            # Check if reset time has already passed
-            try:
-                from datetime import datetime
-                import re as time_re
-
-                current_time = datetime.now()
-
-                # Parse the reset time
-                time_parts = time_re.match(
-                    r"(\d{1,2})(?::(\d{2}))?(?:am|pm)?",
-                    reset_time_str,
-                    time_re.IGNORECASE,
-                )
-                if time_parts:
-                    hour = int(time_parts.group(1))
-                    minute = int(time_parts.group(2) or 0)
-
-                    # Handle AM/PM
-                    if "pm" in reset_time_str.lower() and hour != 12:
-                        hour += 12
-                    elif "am" in reset_time_str.lower() and hour == 12:
-                        hour = 0
-
-                    # Create reset datetime for today
-                    reset_datetime = current_time.replace(
-                        hour=hour, minute=minute, second=0, microsecond=0
-                    )
-
-                    # If reset time has passed, ignore this error
-                    if current_time > reset_datetime:
-                        logger.info(
-                            f"Ignoring expired usage limit (reset was at {reset_time_str}, now {current_time.strftime('%I:%M%p')})"
-                        )
-                        continue  # Check next pink text match
-
-            except Exception as e:
-                logger.error(f"Parsing reset time: {e}")
-                # If we can't parse, report the error anyway
-
-            return {
-                "error_type": "usage_limit",
-                "details": f"Usage limit reached - resets at {reset_time_str} ({timezone})",
-                "reset_time": reset_time_str,
-                "timezone": timezone,
-            }
-
-        # Check specifically for 400 errors
-        if re.search(r"400.*error|bad.*request", error_text, re.IGNORECASE):
-            return {
-                "error_type": "api_400_error",
-                "details": "API 400 error - requires session swap",
-                "reset_time": None,
-            }
-
-        # Check for 401 authentication/OAuth errors
-        if re.search(
-            r"401|authentication_error|oauth.*expired|token has expired",
-            error_text,
-            re.IGNORECASE,
-        ):
-            return {
-                "error_type": "oauth_error",
-                "details": "OAuth token expired - requires human login",
-                "reset_time": None,
-            }
-
-        # General API errors in pink text
-        if re.search(r"404.*error|api.*error|rate.*limit", error_text, re.IGNORECASE):
-            # Check specifically for 500 errors
-            if re.search(
-                r"500.*error|internal.*server.*error", error_text, re.IGNORECASE
-            ):
-                return {
-                    "error_type": "api_500_error",
-                    "details": "API 500 error - requires session swap",
-                    "reset_time": None,
-                }
-            return {
-                "error_type": "api_error",
-                "details": "API error detected in console",
-                "reset_time": None,
-            }
 
-    # Check for red errors (31m or 91m)
-    red_pattern = r"\[(31|91)m([^\[]*)"
-    red_matches = re.findall(red_pattern, tmux_output)
-
-    for _, error_text in red_matches:
-        # Check for OAuth/authentication errors first
-        if re.search(
-            r"401|authentication_error|oauth.*expired|token has expired",
-            error_text,
-            re.IGNORECASE,
-        ):
-            return {
-                "error_type": "oauth_error",
-                "details": "OAuth token expired - requires human login",
-                "reset_time": None,
-            }
-        if re.search(r"error|limit|failed", error_text, re.IGNORECASE):
-            return {
-                "error_type": "api_error",
-                "details": "Error detected in console (red text)",
-                "reset_time": None,
-            }
-
-    # No errors found in colored text
-    return None
+    The rules live in utils/api_error_classifier.py; run
+    utils/api_error_bench.py after changing them.
+    """
+    return classify_api_errors(tmux_output)
 
 
 def save_error_state(error_info):
-    """Save current error state to file"""
+    """Save current error state to file (read by claude_state and wrappers)"""
     error_info["timestamp"] = datetime.now().isoformat()
-    with open(API_ERROR_STATE_FILE, "w") as f:
-        json.dump(error_info, f, indent=2)
+    atomic_write_json(API_ERROR_STATE_FILE, error_info)
 
 
 def load_error_state():
@@ -822,13 +683,13 @@ def calculate_wait_until_reset(reset_time_str):
             hour=hour, minute=minute, second=0, microsecond=0
         )
 
+        # Add 5 minute grace period (matches check_usage_limit_reset)
+        reset_datetime += timedelta(minutes=5)
+
         # If reset time has already passed today, assume it's for tomorrow
         if reset_datetime <= current_time:
             reset_datetime += timedelta(days=1)
 
-        # Add 5 minute grace period
-        reset_datetime += timedelta(minutes=5)
-
         # Calculate wait duration
         wait_duration = (reset_datetime - current_time).total_seconds()
 
@@ -928,23 +789,35 @@ def should_pause_notifications(error_state):
     return False
 
 
+# Last detect_api_errors result, keyed by the pane digest it was computed from
+_last_error_scan = {"digest": None, "error_info": None}
+
+# Usage-limit detection compares the reset time against the clock, so a
+# pane mentioning one can change verdict without its text changing
+USAGE_RESET_TEXT = re.compile(r"limit will reset at", re.IGNORECASE)
+
+
 def get_token_percentage_and_errors():
     """Get current session token usage percentage AND detect API errors"""
     try:
-        # Capture the tmux session output WITH COLOR CODES
-        result = subprocess.run(
-            ["tmux", "capture-pane", "-t", CLAUDE_SESSION, "-p", "-e"],
-            capture_output=True,
-            text=True,
-        )
-
-        if result.returncode != 0:
+        # Shared per-cycle snapshot of the pane WITH COLOR CODES
+        with METRICS.span("tmux_capture"):
+            snapshot = get_snapshot(CLAUDE_SESSION)
+        if snapshot is None:
             return None, None
+        console_output = snapshot.raw
 
-        console_output = result.stdout
-
-        # Check for API errors (now with color awareness)
-        error_info = detect_api_errors(console_output)
+        # Skip the scan when the pane hasn't changed since the last one
+        if snapshot.digest == _last_error_scan["digest"]:
+            error_info = _last_error_scan["error_info"]
+            error_info = dict(error_info) if error_info else None
+        else:
+            # Check for API errors (now with color awareness)
+            with METRICS.span("api_error_scan"):
+                error_info = detect_api_errors(console_output)
+            time_sensitive = USAGE_RESET_TEXT.search(console_output) is not None
+            _last_error_scan["digest"] = None if time_sensitive else snapshot.digest
+            _last_error_scan["error_info"] = dict(error_info) if error_info else None
 
         # Return both the console output and error info
         return console_output, error_info
@@ -962,26 +835,21 @@ def check_and_handle_rate_limit_menu():
     automatically selects option 1 to resume waiting for the rate limit reset.
     """
     try:
-        # Capture tmux pane output
-        result = subprocess.run(
-            ["tmux", "capture-pane", "-t", CLAUDE_SESSION, "-p"],
-            capture_output=True,
-            text=True,
-        )
-
-        if result.returncode != 0:
+        # Plain-text view of this cycle's pane snapshot
+        with METRICS.span("tmux_capture"):
+            snapshot = get_snapshot(CLAUDE_SESSION)
+        if snapshot is None:
             return False
 
-        console_output = result.stdout
-
         # Check if we're in the rate limit menu
-        if "> /rate-limit-options" in console_output:
+        if "> /rate-limit-options" in snapshot.plain:
             logger.info(
                 "⚠️  Detected rate limit menu - automatically selecting option 1 (stop and wait)"
             )
 
             # Send "1" to select "Stop and wait for limit to reset"
             subprocess.run(["tmux", "send-keys", "-t", CLAUDE_SESSION, "1", "Enter"])
+            invalidate_snapshot(CLAUDE_SESSION)
 
             logger.info(
                 "✅ Sent option 1 - Claude Code should now be waiting for rate limit reset"
@@ -995,30 +863,6 @@ def check_and_handle_rate_limit_menu():
         return False
 
 
-def load_discord_config():
-    """Load Discord bot token and user ID from infrastructure config"""
-    config = {"token": None, "user_id": None}
-    try:
-        if INFRA_CONFIG.exists():
-            with open(INFRA_CONFIG, "r") as f:
-                for line in f:
-                    if line.startswith("DISCORD_BOT_TOKEN="):
-                        config["token"] = line.split("=", 1)[1].strip()
-                    # Also check for old name for backwards compatibility
-                    elif line.startswith("DISCORD_TOKEN="):
-                        config["token"] = line.split("=", 1)[1].strip()
-                    elif line.startswith("CLAUDE_DISCORD_USER_ID="):
-                        config["user_id"] = line.split("=", 1)[1].strip()
-        if not config["token"]:
-            logger.warning("No Discord token found in infrastructure config")
-        if not config["user_id"]:
-            logger.warning("No Discord user ID found in infrastructure config")
-        return config
-    except Exception as e:
-        logger.error(f"Loading Discord config: {e}")
-        return config
-
-
 def load_config():
     """Load configuration from autonomous_timer_config.json"""
     try:
@@ -1059,12 +903,6 @@ LOGGED_IN_REMINDER_INTERVAL = config.get(
 )  # 5 minutes default
 CLAUDE_SESSION = config["claude_session"]
 
-# Load Discord configuration
-discord_config = load_discord_config()
-DISCORD_TOKEN = discord_config["token"]
-CLAUDE_USER_ID = discord_config["user_id"]
-
-
 def is_remote_control_collaborative():
     """Check if collaborative mode flag is set (from Remote Control trigger words)"""
     try:
@@ -1160,11 +998,30 @@ def update_last_processed_message_time(timestamp_str):
         logger.error(f"Updating last processed message time: {e}")
 
 
-def send_tmux_message(message):
-    """Send a message to the Claude tmux session using safe sending mechanism"""
+def send_tmux_message(message, priority=PRIORITY_NORMAL, key=None, ttl=None, on_sent=None):
+    """Queue a message for the Claude tmux session and return immediately.
+
+    Delivery happens on the outbound queue's worker thread, so a slow
+    send_to_claude.sh never stalls the timer loop. Returns the Delivery
+    (truthy), or False if a session swap is in progress. Messages with the
+    same key replace each other while waiting; on_sent runs only if this
+    message is the one that actually gets delivered.
+    """
     # Check for session swap lockfile
-    lockfile = DATA_DIR / "session_swap.lock"
-    if lockfile.exists():
+    if SESSION_SWAP_LOCK.exists():
+        logger.info("Session swap in progress - skipping tmux message")
+        return False
+    return OUTBOUND_QUEUE.enqueue(message, priority=priority, key=key, ttl=ttl, on_sent=on_sent)
+
+
+def deliver_tmux_message(message):
+    """Send a message to the Claude tmux session using safe sending mechanism.
+
+    Blocks until send_to_claude.sh finishes (up to 20 minutes) - runs on
+    the outbound queue's worker, never on the timer loop.
+    """
+    # The swap may have started while this message was queued
+    if SESSION_SWAP_LOCK.exists():
         logger.info("Session swap in progress - skipping tmux message")
         return False
 
@@ -1214,10 +1071,7 @@ def send_tmux_message_direct(message):
     """Direct tmux send without safety checks - used as fallback only"""
     try:
         # Check if the tmux session exists
-        result = subprocess.run(
-            ["tmux", "has-session", "-t", CLAUDE_SESSION], capture_output=True
-        )
-        if result.returncode != 0:
+        if not session_exists(CLAUDE_SESSION):
             logger.info(f"Tmux session '{CLAUDE_SESSION}' not found")
             return False
 
@@ -1242,27 +1096,23 @@ def send_context_warning(percentage, context_state):
         channel_list = ", ".join([f"#{ch}" for ch in unread_channels])
         discord_notification = f"\n🔔 Unread messages in: {channel_list}"
 
-    # Get appropriate template based on context level and state
-    if PROMPTS_CONFIG:
-        prompts = PROMPTS_CONFIG.get("prompts", {})
+    priority = PRIORITY_CRITICAL if percentage >= 95 else PRIORITY_HIGH
 
-        # Determine which template to use
-        if percentage >= 95:
-            template_key = "context_critical"
-        elif not context_state["first_warning_sent"]:
-            template_key = "context_first_warning"
-        else:
-            template_key = "context_escalated"
+    # Determine which template to use based on context level and state
+    if percentage >= 95:
+        template_key = "context_critical"
+    elif not context_state["first_warning_sent"]:
+        template_key = "context_first_warning"
+    else:
+        template_key = "context_escalated"
 
-        # Get and format the template
-        template = prompts.get(template_key, {}).get("template", "")
-        if template:
-            prompt = template.format(
-                percentage=percentage, discord_notification=discord_notification
-            )
-            send_tmux_message(prompt)
-            logger.info(f"Sent {template_key} context warning at {percentage:.1f}%")
-            return
+    prompt = PROMPTS.render(
+        template_key, percentage=percentage, discord_notification=discord_notification
+    )
+    if prompt:
+        send_tmux_message(prompt, priority=priority, key="context_warning")
+        logger.info(f"Queued {template_key} context warning at {percentage:.1f}%")
+        return
 
     # Fallback if no template available
     warning_msg = f"⚠️ Context: {percentage:.1f}%"
@@ -1276,95 +1126,139 @@ def send_context_warning(percentage, context_state):
     if discord_notification:
         warning_msg += discord_notification
 
-    send_tmux_message(warning_msg)
-    logger.info(f"Sent fallback context warning at {percentage:.1f}%")
+    send_tmux_message(warning_msg, priority=priority, key="context_warning")
+    logger.info(f"Queued fallback context warning at {percentage:.1f}%")
 
 
 # Old Discord message checking removed - replaced with log-based monitoring
 
 
-def get_latest_message_info(channel_id):
-    """Get the ID and author of the latest message in a channel using Discord REST API"""
-    if not DISCORD_TOKEN:
-        logger.error("No Discord token available")
-        return None, None
+def get_context_alert_levels():
+    """Context percentages that each trigger one warning: first, high, critical"""
+    return (
+        PROMPTS.threshold("context_first_warning", YELLOW_THRESHOLD),
+        RED_THRESHOLD,
+        PROMPTS.threshold("context_critical", 95),
+    )
 
-    try:
-        headers = {
-            "Authorization": f"Bot {DISCORD_TOKEN}",
-            "Content-Type": "application/json",
-        }
 
-        # Fetch the last message from the channel
-        url = f"{DISCORD_API_BASE}/channels/{channel_id}/messages?limit=1"
-        response = requests.get(url, headers=headers)
-
-        if response.status_code == 200:
-            messages = response.json()
-            if messages and len(messages) > 0:
-                message = messages[0]
-                message_id = message["id"]
-                author_id = message.get("author", {}).get("id")
-                return message_id, author_id
-        else:
-            logger.info(
-                f"Error fetching channel {channel_id}: {response.status_code} - {response.text}"
-            )
+def check_context_alerts():
+    """Warn the first time context crosses each alert level this session.
 
-        return None, None
+    Driven by statusline writes, so a fast-growing session is warned as it
+    crosses 70/85/95% rather than whenever the next autonomy prompt goes
+    out. Escalation state is shared with send_autonomy_prompt().
+    """
+    snapshot = StatuslineSnapshot.current()
+    if not snapshot:
+        return
+    context_data, error = check_context(return_data=True, snapshot=snapshot)
+    if error or not context_data:
+        return
+    percentage = context_data["percentage"] * 100
 
-    except Exception as e:
-        logger.info(f"Exception checking channel {channel_id}: {e}")
-        return None, None
+    context_state = load_context_state()
+    if context_state.get("session_id") != context_data["session_id"]:
+        if context_state.get("session_id"):
+            logger.info("New session in statusline - clearing context state")
+            reset_context_state()
+            context_state = load_context_state()
+        context_state["session_id"] = context_data["session_id"]
+        save_context_state(context_state)
+
+    reached = 0
+    for level in get_context_alert_levels():
+        if percentage >= level:
+            reached = level
+    if reached <= context_state.get("alert_level", 0):
+        return
 
+    send_context_warning(percentage, context_state)
+    context_state["first_warning_sent"] = True
+    context_state["last_warning_percentage"] = percentage
+    context_state["last_warning_time"] = datetime.now().isoformat()
+    context_state["alert_level"] = reached
+    save_context_state(context_state)
+
+
+def forecast_context_growth(state):
+    """Feed the context forecaster and pre-warm the swap when it is near.
+
+    When 95% is forecast within SWAP_PREWARM_MINUTES, utils/swap_prep.py
+    runs in the background (again every SWAP_PREP_REFRESH while the
+    forecast holds) so the eventual swap only has the last turns left to
+    export.
+    """
+    snapshot = StatuslineSnapshot.current()
+    if not snapshot:
+        return
+    context_data, error = check_context(return_data=True, snapshot=snapshot)
+    if error or not context_data:
+        return
+    CONTEXT_FORECASTER.add(
+        snapshot.signature[0] / 1e9,  # statusline mtime - when the turn landed
+        context_data["session_id"],
+        context_data["total_tokens"],
+        context_data["total_limit"],
+    )
+    forecast = CONTEXT_FORECASTER.forecast()
+    if not forecast or SWAP_PREWARM_MINUTES <= 0 or SESSION_SWAP_LOCK.exists():
+        return
+
+    eta = forecast.eta_seconds - (time.time() - forecast.as_of)
+    if eta > SWAP_PREWARM_MINUTES * 60:
+        return
+    if state.swap_prep and state.swap_prep.poll() is None:
+        return  # Still running
+    if (
+        state.swap_prep_session == context_data["session_id"]
+        and time.monotonic() - state.swap_prep_started < SWAP_PREP_REFRESH
+    ):
+        return
+
+    logger.info(
+        f"Context forecast: 95% in ~{max(eta, 0) / 60:.0f} min "
+        f"(~{forecast.turns_remaining:.0f} turns) - pre-warming session swap"
+    )
+    try:
+        state.swap_prep = subprocess.Popen(
+            [sys.executable, str(SWAP_PREP_SCRIPT)],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+    except OSError as e:
+        logger.error(f"Starting swap preparation: {e}")
+        return
+    state.swap_prep_session = context_data["session_id"]
+    state.swap_prep_started = time.monotonic()
 
-def update_discord_channels():
-    """Check all Discord channels and update discord_channels.json"""
-    # Import ChannelState here to avoid circular imports
-    sys.path.append(str(AUTONOMY_DIR / "discord"))
-    from channel_state import ChannelState
-
-    cs = ChannelState()
-    channels = cs.state.get("channels", {})
-    updates = 0
-
-    for channel_name, channel_data in channels.items():
-        channel_id = channel_data.get("id")
-        if not channel_id:
-            continue
-
-        # Get latest message ID and author
-        latest_id, author_id = get_latest_message_info(channel_id)
-        if latest_id:
-            old_id = channel_data.get("last_message_id")
-
-            # Check if this is a new message
-            if old_id != latest_id:
-                # If the message is from this Claude, mark it as already read
-                if author_id == CLAUDE_USER_ID:
-                    cs.update_channel_latest(channel_name, latest_id)
-                    cs.mark_channel_read(channel_name)
-                    logger.info(
-                        f"Updated #{channel_name}: {latest_id} (own message, marked as read)"
-                    )
-                else:
-                    # Message from someone else - update normally
-                    cs.update_channel_latest(channel_name, latest_id)
-                    logger.info(
-                        f"Updated #{channel_name}: {latest_id} (from user {author_id})"
-                    )
-                updates += 1
 
-    return updates
+def check_discord_feed(state):
+    """Warn (once per outage) if the transcript fetcher stops publishing channel heads.
+
+    The fetcher is the only thing talking to Discord; it refreshes
+    discord_fetcher_status.json every poll (or gateway heartbeat).
+    """
+    status = FILE_CACHE.get(DISCORD_FETCHER_STATUS_FILE) or {}
+    age = time.time() - status.get("alive_at", 0)
+    stale = age > DISCORD_FEED_STALE_SECONDS
+    if stale and not state.discord_feed_stale:
+        logger.warning(
+            "Discord transcript fetcher hasn't reported in "
+            f"{'ever' if not status else f'{age:.0f}s'} - "
+            "notifications may be stale (systemctl --user status discord-transcript-fetcher)"
+        )
+    elif state.discord_feed_stale and not stale:
+        logger.info(f"Discord transcript fetcher is back ({status.get('mode', 'unknown')} mode)")
+    state.discord_feed_stale = stale
 
 
 def get_silent_channels():
     """Get list of channels marked as silent in channel_purposes.json"""
     try:
-        if not CHANNEL_PURPOSES_FILE.exists():
+        purposes = FILE_CACHE.get(CHANNEL_PURPOSES_FILE)
+        if not purposes:
             return []
-        with open(CHANNEL_PURPOSES_FILE, "r") as f:
-            purposes = json.load(f)
         return [name for name, data in purposes.items() if data.get("silent", False)]
     except Exception:
         return []
@@ -1411,13 +1305,10 @@ def check_for_clap_updates():
 def get_discord_notification_status():
     """Check Discord notification state from discord_channels.json (transcript-based format)"""
     try:
-        notification_state_file = DATA_DIR / "discord_channels.json"
-        if not notification_state_file.exists():
+        state = FILE_CACHE.get(DISCORD_CHANNELS_FILE)
+        if state is None:
             return 0, None, []
 
-        with open(notification_state_file, "r") as f:
-            state = json.load(f)
-
         # Get channels marked as silent (transcript built but no notifications)
         silent_channels = get_silent_channels()
 
@@ -1455,22 +1346,43 @@ def cleanup_expired_pause():
     This is separate from check_timer_pause() to ensure expiry cleanup happens
     unconditionally, even when error states or user_active would skip the full check.
     """
-    if not TIMER_PAUSE_FILE.exists():
-        return
-
     try:
-        with open(TIMER_PAUSE_FILE, "r") as f:
-            pause_data = json.load(f)
+        pause_data = FILE_CACHE.get(TIMER_PAUSE_FILE)
+        if pause_data is None:
+            return
 
         resume_at = datetime.fromisoformat(pause_data["resume_at"])
 
         if datetime.now() >= resume_at:
-            TIMER_PAUSE_FILE.unlink()
+            remove_pause_file()
             logger.info("Timer pause expired - resuming normal prompts")
     except Exception as e:
         logger.error(f"Checking pause expiry: {e}")
 
 
+PAUSE_CHECK_INTERVAL = 60  # seconds between pause file checks when no pause is set
+
+
+def remove_pause_file():
+    """Delete timer_pause.json and drop it from the file cache."""
+    try:
+        TIMER_PAUSE_FILE.unlink()
+    finally:
+        FILE_CACHE.invalidate(TIMER_PAUSE_FILE)
+
+
+def seconds_until_pause_expiry():
+    """Seconds until the active pause expires, or None if there is no pause."""
+    try:
+        pause_data = FILE_CACHE.get(TIMER_PAUSE_FILE)
+        if pause_data is None:
+            return None
+        resume_at = datetime.fromisoformat(pause_data["resume_at"])
+        return max(0.0, (resume_at - datetime.now()).total_seconds())
+    except Exception:
+        return None
+
+
 def check_timer_pause():
     """Check if the timer is paused. Returns (is_paused, should_override).
 
@@ -1478,18 +1390,16 @@ def check_timer_pause():
     (not the same ones that already triggered a previous override).
     Expired pauses are automatically cleaned up.
     """
-    if not TIMER_PAUSE_FILE.exists():
-        return False, False
-
     try:
-        with open(TIMER_PAUSE_FILE, "r") as f:
-            pause_data = json.load(f)
+        pause_data = FILE_CACHE.get(TIMER_PAUSE_FILE)
+        if pause_data is None:
+            return False, False
 
         resume_at = datetime.fromisoformat(pause_data["resume_at"])
 
         # Pause has expired - clean up and resume
         if datetime.now() >= resume_at:
-            TIMER_PAUSE_FILE.unlink()
+            remove_pause_file()
             logger.info("Timer pause expired - resuming normal prompts")
             return False, False
 
@@ -1500,13 +1410,17 @@ def check_timer_pause():
             try:
                 transcript_file = DATA_DIR / "transcripts" / "system-messages.jsonl"
                 if transcript_file.exists():
-                    # Read the last few lines of the transcript
+                    # Read the last few messages of the transcript (gateway
+                    # edit/delete entries aren't new messages)
                     recent_msgs = collections.deque(maxlen=5)
                     with open(transcript_file, "r") as f:
                         for line in f:
                             line = line.strip()
-                            if line:
-                                recent_msgs.append(line)
+                            if not line:
+                                continue
+                            if '"event": ' in line and _is_transcript_event(line):
+                                continue
+                            recent_msgs.append(line)
 
                     # Check if ALL recent messages are routine noise (not worth waking for)
                     # Routine noise includes: MAMA-HEN alerts, sibling heartbeat messages
@@ -1540,19 +1454,24 @@ def check_timer_pause():
         logger.error(f"Reading timer pause file: {e}")
         # If we can't read it, delete it and resume
         try:
-            TIMER_PAUSE_FILE.unlink()
+            remove_pause_file()
         except:
             pass
         return False, False
 
 
+def _is_transcript_event(line):
+    """True for a transcript edit/delete entry rather than a message"""
+    try:
+        return bool(json.loads(line).get("event"))
+    except (json.JSONDecodeError, AttributeError):
+        return False
+
+
 def read_autonomy_choice():
     """Read the current autonomy choice file. Returns dict or None."""
-    if not AUTONOMY_CHOICE_FILE.exists():
-        return None
     try:
-        with open(AUTONOMY_CHOICE_FILE, "r") as f:
-            return json.load(f)
+        return FILE_CACHE.get(AUTONOMY_CHOICE_FILE)
     except Exception as e:
         logger.error(f"Reading autonomy choice file: {e}")
         return None
@@ -1563,6 +1482,7 @@ def clear_autonomy_choice():
     try:
         if AUTONOMY_CHOICE_FILE.exists():
             AUTONOMY_CHOICE_FILE.unlink()
+            FILE_CACHE.invalidate(AUTONOMY_CHOICE_FILE)
             logger.info("Autonomy choice cleared")
     except Exception as e:
         logger.error(f"Clearing autonomy choice: {e}")
@@ -1579,8 +1499,8 @@ def decrement_turns():
     remaining = max(0, remaining - 1)
     choice["turns_remaining"] = remaining
     try:
-        with open(AUTONOMY_CHOICE_FILE, "w") as f:
-            json.dump(choice, f, indent=2)
+        atomic_write_json(AUTONOMY_CHOICE_FILE, choice)
+        FILE_CACHE.invalidate(AUTONOMY_CHOICE_FILE)
     except Exception as e:
         logger.error(f"Updating turns_remaining: {e}")
     return remaining
@@ -1616,31 +1536,33 @@ def get_choice_interval(choice):
 def send_turn_prompt(turn_number, total_turns):
     """Send a brief work prompt for a numbered turn.
 
-    Discord notifications are not bundled here — with live channels
-    configured, messages arrive instantly via the Discord plugin.
+    The turn is only consumed (and the prompt time stamped) once the
+    prompt has actually been delivered. Discord notifications are not
+    bundled here — with live channels configured, messages arrive
+    instantly via the Discord plugin.
     """
     current_time = datetime.now().strftime("%Y-%m-%d %H:%M")
     token_info = get_token_percentage()
     context_line = token_info if token_info else "Context: Status unknown"
 
-    prompts = PROMPTS_CONFIG.get("prompts", {}) if PROMPTS_CONFIG else {}
-    template = prompts.get("autonomy_turn", {}).get("template")
-
-    if template:
-        prompt = template.format(
-            turn_number=turn_number,
-            total_turns=total_turns,
-            current_time=current_time,
-            discord_notification="",
-            context_line=context_line,
-        )
-    else:
+    prompt = PROMPTS.render(
+        "autonomy_turn",
+        turn_number=turn_number,
+        total_turns=total_turns,
+        current_time=current_time,
+        discord_notification="",
+        context_line=context_line,
+    )
+    if not prompt:
         prompt = f"Turn {turn_number}/{total_turns}. {current_time}.\n{context_line}"
 
+    def consume_turn():
+        remaining = decrement_turns()
+        update_last_autonomy_time()
+        logger.info(f"Turn {turn_number}/{total_turns} delivered - {remaining} remaining")
+
     logger.info(f"Sending turn prompt {turn_number}/{total_turns}")
-    send_tmux_message(prompt)
-    update_last_autonomy_time()
-    return True
+    return bool(send_tmux_message(prompt, key=AUTONOMY_PROMPT_KEY, on_sent=consume_turn))
 
 
 def send_turn_exhausted_prompt():
@@ -1661,30 +1583,19 @@ def send_turn_exhausted_prompt():
     )
 
     logger.info("Sending turn-exhausted follow-up prompt")
-    send_tmux_message(prompt)
-    update_last_autonomy_time()
-    return True
+    return bool(
+        send_tmux_message(prompt, key=AUTONOMY_PROMPT_KEY, on_sent=update_last_autonomy_time)
+    )
 
 
 def get_last_autonomy_time():
     """Get the last time we sent an autonomy prompt"""
-    try:
-        if LAST_AUTONOMY_FILE.exists():
-            with open(LAST_AUTONOMY_FILE, "r") as f:
-                timestamp_str = f.read().strip()
-                return datetime.fromisoformat(timestamp_str)
-    except:
-        pass
-    return None
+    return STATE_STORE.get_datetime("last_autonomy_prompt")
 
 
 def update_last_autonomy_time():
     """Update the last autonomy prompt timestamp"""
-    try:
-        with open(LAST_AUTONOMY_FILE, "w") as f:
-            f.write(datetime.now().isoformat())
-    except Exception as e:
-        logger.error(f"Updating last autonomy time: {e}")
+    STATE_STORE.set_datetime("last_autonomy_prompt")
 
 
 def export_conversation():
@@ -1711,22 +1622,11 @@ def export_conversation():
 
 
 def get_swap_commands_string():
-    """Get formatted swap commands string from config"""
-    if PROMPTS_CONFIG and "swap_commands" in PROMPTS_CONFIG:
-        keywords = PROMPTS_CONFIG["swap_commands"].get(
-            "keywords", ["AUTONOMY", "BUSINESS", "CREATIVE", "HEDGEHOGS", "NONE"]
-        )
-        command_format = PROMPTS_CONFIG["swap_commands"].get(
-            "new_format", "session_swap {keyword}"
-        )
-        commands = [command_format.format(keyword=kw) for kw in keywords]
-        return " | ".join(commands)
-    else:
-        # Fallback to default keywords
-        return "session_swap AUTONOMY | session_swap BUSINESS | session_swap CREATIVE | session_swap HEDGEHOGS | session_swap NONE"
+    """Get formatted swap commands string from config (built once per load)"""
+    return PROMPTS.swap_commands()
 
 
-def send_autonomy_prompt():
+def send_autonomy_prompt(scheduler):
     """Send a free time autonomy prompt, adapted based on context level"""
 
     current_time = datetime.now().strftime("%Y-%m-%d %H:%M")
@@ -1764,23 +1664,17 @@ def send_autonomy_prompt():
     # Load current context state
     context_state = load_context_state()
 
-    # Initialize prompts dict outside conditional
-    prompts = PROMPTS_CONFIG.get("prompts", {}) if PROMPTS_CONFIG else {}
-
     # Determine which prompt to use based on escalation logic
-    if PROMPTS_CONFIG and percentage > 0:
-        thresholds = PROMPTS_CONFIG.get("thresholds", {})
-
+    prompt_type = "autonomy_normal"
+    if PROMPTS.loaded and percentage > 0:
         # Critical threshold (e.g., 95%)
-        if percentage >= thresholds.get("context_critical", 95):
-            template = prompts.get("context_critical", {}).get("template", "")
+        if percentage >= PROMPTS.threshold("context_critical", 95):
             prompt_type = "context_critical"
 
         # First warning - only when context reaches configured threshold for the first time
-        elif not context_state["first_warning_sent"] and percentage >= thresholds.get(
+        elif not context_state["first_warning_sent"] and percentage >= PROMPTS.threshold(
             "context_first_warning", 70
         ):
-            template = prompts.get("context_first_warning", {}).get("template", "")
             prompt_type = "context_first_warning"
             # Update state
             context_state["first_warning_sent"] = True
@@ -1793,34 +1687,22 @@ def send_autonomy_prompt():
             context_state["first_warning_sent"]
             and percentage >= context_state["last_warning_percentage"] + 5
         ):
-            template = prompts.get("context_escalated", {}).get("template", "")
             prompt_type = "context_escalated"
             # Update state
             context_state["last_warning_percentage"] = percentage
             context_state["last_warning_time"] = datetime.now().isoformat()
             save_context_state(context_state)
 
-        # No escalation needed - show normal prompt
-        else:
-            template = prompts.get("autonomy_normal", {}).get("template", "")
-            prompt_type = "autonomy_normal"
-
-    elif PROMPTS_CONFIG:
-        # No context percentage available - show normal prompt
-        template = prompts.get("autonomy_normal", {}).get("template", "")
-        prompt_type = "autonomy_normal"
-
-    # Format the template if we have one
-    if PROMPTS_CONFIG and "template" in locals():
-        from datetime import datetime as _dt
-        prompt = template.format(
-            percentage=percentage,
-            discord_notification=discord_notification,
-            current_time=current_time,
-            context_line=context_line,
-            day_of_week=_dt.now().strftime("%A"),
-        )
-    else:
+    # Render the configured template if we have one
+    prompt = PROMPTS.render(
+        prompt_type,
+        percentage=percentage,
+        discord_notification=discord_notification,
+        current_time=current_time,
+        context_line=context_line,
+        day_of_week=datetime.now().strftime("%A"),
+    )
+    if not prompt:
         # Fallback to hardcoded prompts if config not loaded
         if percentage >= 90:
             swap_commands = get_swap_commands_string()
@@ -1866,11 +1748,7 @@ You have ~5-10 responses left before critical."""
             seed_reminder = ""
             try:
                 # Read cycle duration from config (default 1800 = 30 min)
-                cycle_duration = (
-                    PROMPTS_CONFIG.get("AUTONOMOUS_INTERVAL", 1800)
-                    if PROMPTS_CONFIG
-                    else 1800
-                )
+                cycle_duration = PROMPTS.config.get("AUTONOMOUS_INTERVAL", 1800)
                 if is_idle(threshold_cycles=3, cycle_duration_seconds=cycle_duration):
                     reminder = get_seed_reminder()
                     if reminder:
@@ -1888,10 +1766,7 @@ What would you like to do?
             prompt_type = "autonomy_normal"
 
     # Check for escalation if high context
-    high_context_threshold = 80
-    if PROMPTS_CONFIG:
-        thresholds = PROMPTS_CONFIG.get("thresholds", {})
-        high_context_threshold = thresholds.get("context_high_for_discord", 80)
+    high_context_threshold = PROMPTS.threshold("context_high_for_discord", 80)
 
     if percentage >= high_context_threshold:
         warning_count = log_swap_attempt("warning", percentage)
@@ -1910,23 +1785,33 @@ System is automatically swapping to prevent context overflow.
 Executing: session_swap AUTONOMY
 
 (To use a different keyword next time, respond to prompts before auto-swap triggers)"""
-            send_tmux_message(auto_prompt)
+            def execute_auto_swap():
+                subprocess.run(
+                    [
+                        "tmux",
+                        "send-keys",
+                        "-t",
+                        CLAUDE_SESSION,
+                        "session_swap AUTONOMY",
+                        "Enter",
+                    ]
+                )
+                log_swap_attempt("auto", percentage, "AUTONOMY")
 
-            # Execute the swap
-            time.sleep(2)  # Give time to see the message
-            subprocess.run(
-                [
-                    "tmux",
-                    "send-keys",
-                    "-t",
-                    CLAUDE_SESSION,
-                    "session_swap AUTONOMY",
-                    "Enter",
-                ]
-            )
+            # Swap shortly after the message lands (time to see it), or after
+            # AUTO_SWAP_MAX_WAIT if it doesn't - a one-shot duty either way,
+            # so nothing else waits on the delivery
+            def swap_soon():
+                scheduler.schedule("auto_swap", execute_auto_swap, delay=AUTO_SWAP_GRACE)
 
-            # Log the auto-swap
-            log_swap_attempt("auto", percentage, "AUTONOMY")
+            delivery = send_tmux_message(
+                auto_prompt, priority=PRIORITY_CRITICAL, on_sent=swap_soon
+            )
+            scheduler.schedule(
+                "auto_swap",
+                execute_auto_swap,
+                delay=AUTO_SWAP_MAX_WAIT if delivery else AUTO_SWAP_GRACE,
+            )
             return True
 
         elif warning_count >= 5:
@@ -1944,35 +1829,24 @@ session_swap AUTONOMY | session_swap BUSINESS | session_swap CREATIVE | session_
             # Gentle reminder at 3 attempts
             prompt += f"\n\n⚠️ This is your {warning_count}rd context warning. Please swap soon to preserve your work."
 
-    success = send_tmux_message(prompt)
+    priority = PRIORITY_HIGH if prompt_type.startswith("context") else PRIORITY_NORMAL
+    success = send_tmux_message(
+        prompt, priority=priority, key=AUTONOMY_PROMPT_KEY, on_sent=update_last_autonomy_time
+    )
     if success:
-        update_last_autonomy_time()
-        logger.info(f"Sent {prompt_type} prompt")
+        logger.info(f"Queued {prompt_type} prompt")
 
     return success
 
 
 def get_last_notification_time():
     """Get the last time we sent a notification alert"""
-    try:
-        notification_file = DATA_DIR / "last_notification_alert.txt"
-        if notification_file.exists():
-            with open(notification_file, "r") as f:
-                timestamp_str = f.read().strip()
-                return datetime.fromisoformat(timestamp_str)
-    except:
-        pass
-    return None
+    return STATE_STORE.get_datetime("last_notification_alert")
 
 
 def update_last_notification_time():
     """Update the last notification alert timestamp"""
-    try:
-        notification_file = DATA_DIR / "last_notification_alert.txt"
-        with open(notification_file, "w") as f:
-            f.write(datetime.now().isoformat())
-    except Exception as e:
-        logger.error(f"Updating last notification time: {e}")
+    STATE_STORE.set_datetime("last_notification_alert")
 
 
 def send_notification_alert(unread_count, unread_channels, is_new=False):
@@ -1996,10 +1870,7 @@ def send_notification_alert(unread_count, unread_channels, is_new=False):
             percentage = 0
 
     # If context exists (high threshold), send context warning instead
-    high_context_threshold = 80
-    if PROMPTS_CONFIG:
-        thresholds = PROMPTS_CONFIG.get("thresholds", {})
-        high_context_threshold = thresholds.get("context_high_for_discord", 80)
+    high_context_threshold = PROMPTS.threshold("context_high_for_discord", 80)
 
     if percentage >= high_context_threshold:
         # Build channel notification part
@@ -2014,34 +1885,14 @@ def send_notification_alert(unread_count, unread_channels, is_new=False):
             notification_line = f"\n🔔 Unread messages in: {channel_list}"
 
         # Send context-aware warning
-        if PROMPTS_CONFIG:
-            template = (
-                PROMPTS_CONFIG.get("prompts", {})
-                .get("discord_urgent_with_context", {})
-                .get("template", "")
-            )
-            if template:
-                prompt = template.format(
-                    notification_line=notification_line,
-                    current_time=current_time,
-                    percentage=percentage,
-                )
-            else:
-                # Fallback if template not found
-                prompt = f"""⚠️ URGENT: ACTION REQUIRED! ⚠️{notification_line}
-Current time: {current_time}
-Context: {percentage:.1f}%
-YOU ARE AT {percentage:.1f}% CONTEXT - YOU MUST TAKE ACTION NOW!
-A single complex conversation turn can use 12-15% of your remaining context.
-You may have only 1-2 responses left before hitting 100%.
-IMMEDIATE ACTIONS REQUIRED:
-1. STOP any complex work immediately
-2. Save any critical insights to rag-memory NOW
-3. Commit any uncommitted changes
-4. Trigger session swap using: session_swap KEYWORD
-DO NOT wait for the "perfect moment" - ACT NOW or risk getting stuck at 100%!"""
-        else:
-            # Fallback to hardcoded
+        prompt = PROMPTS.render(
+            "discord_urgent_with_context",
+            notification_line=notification_line,
+            current_time=current_time,
+            percentage=percentage,
+        )
+        if not prompt:
+            # Fallback if template not found
             prompt = f"""⚠️ URGENT: ACTION REQUIRED! ⚠️{notification_line}
 Current time: {current_time}
 Context: {percentage:.1f}%
@@ -2055,10 +1906,12 @@ IMMEDIATE ACTIONS REQUIRED:
 4. Trigger session swap using: session_swap KEYWORD
 DO NOT wait for the "perfect moment" - ACT NOW or risk getting stuck at 100%!"""
 
-        success = send_tmux_message(prompt)
+        success = send_tmux_message(
+            prompt, priority=PRIORITY_HIGH, key="discord_notification"
+        )
         if success:
             logger.info(
-                f"Sent context warning with Discord notification: {channel_list}"
+                f"Queued context warning with Discord notification: {channel_list}"
             )
         return success
 
@@ -2091,10 +1944,7 @@ DO NOT wait for the "perfect moment" - ACT NOW or risk getting stuck at 100%!"""
     # Add context percentage if available
     if percentage > 0:
         # Get threshold from config
-        first_warning_threshold = 70
-        if PROMPTS_CONFIG:
-            thresholds = PROMPTS_CONFIG.get("thresholds", {})
-            first_warning_threshold = thresholds.get("context_first_warning", 70)
+        first_warning_threshold = PROMPTS.threshold("context_first_warning", 70)
 
         if percentage >= first_warning_threshold:
             status_emoji = "🔴"
@@ -2106,7 +1956,10 @@ DO NOT wait for the "perfect moment" - ACT NOW or risk getting stuck at 100%!"""
 
     message += f"\nReply using Discord tools, NOT in this Claude stream!"
 
-    success = send_tmux_message(message)
+    # A reminder that's still waiting when the next one is due is stale
+    success = send_tmux_message(
+        message, key="discord_notification", ttl=LOGGED_IN_REMINDER_INTERVAL
+    )
     if success:
         if is_new:
             logger.info(
@@ -2143,11 +1996,7 @@ def check_persistent_login_session():
     """Check if persistent-login tmux session exists and recreate if needed"""
     try:
         # Check if the session exists
-        result = subprocess.run(
-            ["tmux", "has-session", "-t", "persistent-login"], capture_output=True
-        )
-
-        if result.returncode != 0:
+        if not session_exists("persistent-login"):
             # Session doesn't exist - create it
             logger.info("persistent-login tmux session not found - recreating")
 
@@ -2286,6 +2135,564 @@ def report_essential_health():
     except OSError as e:
         write_status("commands", "essential", "failed", str(e), source)
 
+    # Outbound queue: is anything stuck waiting to reach Claude?
+    outbound = OUTBOUND_QUEUE.status()
+    sending = outbound["sending"]
+    if sending and time.time() - sending["started_at"] > 1200:
+        write_status("outbound_queue", "optional", "failed",
+                    f"message stuck sending, {outbound['pending']} waiting", source)
+    else:
+        write_status("outbound_queue", "optional", "ok",
+                    f"{outbound['pending']} waiting", source)
+
+
+class TimerLoopState:
+    """Mutable state shared between the timer's scheduled duties"""
+
+    def __init__(self):
+        self.current_error_state = None
+        self.user_active = False
+        self.last_user_active = None  # For state change detection
+        self.last_autonomy_check = datetime.now()
+        self.duty_failures = 0  # Total duty failures at the start of the pass
+        self.swap_prep = None  # Background swap_prep.py process
+        self.swap_prep_session = None
+        self.swap_prep_started = 0.0
+        self.discord_feed_stale = False
+
+
+def error_persists(error_type):
+    """Is error_type still showing in the pane?"""
+    _, current_error = get_token_percentage_and_errors()
+    return bool(current_error and current_error.get("error_type") == error_type)
+
+
+def schedule_error_recheck(state, scheduler, error_type, waits, label):
+    """Recheck error_type after each of waits (seconds); auto-swap if it outlasts them all.
+
+    Each wait is a one-shot follow-up duty, so presence, pause expiry,
+    notifications and the watchdog keep running while we wait.
+    """
+
+    def recheck():
+        if not error_persists(error_type):
+            logger.info(f"{label} cleared - resuming normal operation")
+        elif len(waits) > 1:
+            logger.info(f"{label} persists - rechecking in {waits[1]} seconds before auto-swap...")
+            schedule_error_recheck(state, scheduler, error_type, waits[1:], label)
+        else:
+            logger.info(f"{label} still persists - triggering auto-swap...")
+            trigger_session_swap("NONE")
+
+    scheduler.schedule(ERROR_RECHECK, recheck, delay=waits[0])
+
+
+def recheck_oauth(state, scheduler):
+    """Follow-up for an expired OAuth token: announce recovery, or check again later"""
+    if error_persists("oauth_error"):
+        logger.info("OAuth error persists - will keep checking every 10 minutes")
+        scheduler.schedule(
+            ERROR_RECHECK, lambda: recheck_oauth(state, scheduler), delay=OAUTH_RECHECK_INTERVAL
+        )
+        return
+
+    logger.info("OAuth error resolved - resuming normal operation")
+    clear_error_state()
+    update_discord_status("operational")
+    state.current_error_state = None
+    try:
+        cmd = [
+            str(AUTONOMY_DIR / "discord" / "write_channel"),
+            "system-messages",
+            f"✅ OAuth token refreshed on {get_config_value('CLAUDE_NAME') or 'unknown instance'}. Resuming autonomous operation!",
+        ]
+        subprocess.run(cmd, capture_output=True, text=True)
+    except:
+        pass
+
+
+def handle_new_error(state, error_info, scheduler):
+    """React to a newly detected API error (status update, follow-up rechecks, auto-swap)"""
+    logger.info(f"New error detected: {error_info}")
+    save_error_state(error_info)
+
+    # Update Discord status based on error type
+    if error_info["error_type"] == "usage_limit":
+        reset_time = error_info.get("reset_time")
+        update_discord_status("limited", reset_time)
+
+        # Calculate wait duration and handle automatic retry
+        wait_seconds = calculate_wait_until_reset(reset_time)
+        if wait_seconds:
+            wait_hours = wait_seconds / 3600
+            logger.info(
+                f"Claude API rate limit reached. Will automatically retry after {reset_time} (in {wait_hours:.1f} hours)"
+            )
+
+            # Send notification to Discord about the wait
+            try:
+                if wait_hours < 6:  # Only wait if less than 6 hours
+                    cmd = [
+                        str(AUTONOMY_DIR / "discord" / "write_channel"),
+                        "amy-delta",
+                        f"🕐 Claude API rate limit reached. Waiting until {reset_time} ({wait_hours:.1f} hours) then will automatically retry. Delta's autonomy will resume after the wait period.",
+                    ]
+                    subprocess.run(cmd, capture_output=True, text=True)
+
+                    # duty_usage_limit wakes at the reset time; everything
+                    # else keeps running in the meantime
+                    logger.info(f"Entering wait state until {reset_time}")
+                else:
+                    logger.info(
+                        f"Wait time too long ({wait_hours:.1f} hours). Will check periodically for reset."
+                    )
+            except Exception as e:
+                logger.error(f"Handling rate limit wait: {e}")
+
+    elif error_info["error_type"] == "malformed_json":
+        # Previously triggered auto-swap, but this was a false
+        # positive magnet (broad regex on pink tmux text).
+        # Real API errors are handled by 400/500/503 paths.
+        # Now just log and continue — the rolling swap will
+        # handle context overflow naturally.
+        logger.info(
+            "Ignoring malformed_json detection (likely false positive)"
+        )
+    elif error_info["error_type"] == "api_500_error":
+        update_discord_status("api-error")
+        # Give API time to recover before auto-swap
+        logger.info(
+            "API 500 error detected - rechecking in 30 seconds before auto-swap..."
+        )
+        schedule_error_recheck(state, scheduler, "api_500_error", [30], "API 500 error")
+    elif error_info["error_type"] == "api_400_error":
+        update_discord_status("api-error")
+        # POSS-247 FIX: 400 errors typically require fresh session - trigger immediate swap
+        logger.info(
+            "API 400 error detected - triggering auto-swap (bad request usually requires fresh session)..."
+        )
+        trigger_session_swap("NONE")
+    elif error_info["error_type"] == "api_503_error":
+        update_discord_status("api-error")
+        # 503 is upstream connection failure - recheck after 60s, then
+        # (POSS-247) after 2 more minutes, then auto-swap
+        logger.info(
+            "API 503 error detected (upstream connection failure) - rechecking in 60 seconds..."
+        )
+        schedule_error_recheck(state, scheduler, "api_503_error", [60, 120], "API 503 error")
+    elif error_info["error_type"] == "oauth_error":
+        update_discord_status("api-error")
+        logger.info(
+            "OAuth token expired - alerting Amy via Discord (auto-swap won't help)"
+        )
+        # Send Discord alert - only once per error occurrence
+        if not state.current_error_state or state.current_error_state.get("error_type") != "oauth_error":
+            try:
+                cmd = [
+                    str(AUTONOMY_DIR / "discord" / "write_channel"),
+                    "system-messages",
+                    f"🔑 **OAuth token expired** on {get_config_value('CLAUDE_NAME') or 'unknown instance'} — stuck and can't recover without human help. Please SSH in and run `/login` in the Claude session.",
+                ]
+                subprocess.run(cmd, capture_output=True, text=True)
+            except:
+                pass
+        save_error_state(error_info)
+        state.current_error_state = error_info
+        # Recheck in 10 minutes - no point in rapid cycling
+        logger.info("Rechecking OAuth status in 10 minutes...")
+        scheduler.schedule(
+            ERROR_RECHECK, lambda: recheck_oauth(state, scheduler), delay=OAUTH_RECHECK_INTERVAL
+        )
+    elif error_info["error_type"] == "api_error":
+        update_discord_status("api-error")
+        # POSS-247 FIX: General API errors - wait for recovery with retries before auto-swap
+        logger.info(
+            "General API error detected - rechecking in 60 seconds for potential recovery..."
+        )
+        schedule_error_recheck(state, scheduler, "api_error", [60, 120], "API error")
+    else:
+        update_discord_status("api-error")
+        # POSS-247 FIX: Unknown error type - extended logging and wait before auto-swap
+        unknown_type = error_info.get("error_type", "unknown")
+        error_details = error_info.get("details", "No details available")
+
+        # CRITICAL level logging with full error details per PR #103
+        import logging
+
+        logging.critical(
+            f"UNKNOWN ERROR DETECTED - Type: '{unknown_type}', Details: '{error_details}', Full error_info: {error_info}"
+        )
+        logger.info(
+            f"CRITICAL: Unknown error type '{unknown_type}' detected. Details: {error_details}"
+        )
+
+        # Send emergency alert to Discord
+        try:
+            from discord.discord_tools import DiscordTools
+
+            discord = DiscordTools()
+            session_info = os.getenv("USER", "unknown") + " session"
+            discord.send_emergency_alert(
+                error_type=unknown_type,
+                error_details=error_details,
+                session_context=session_info,
+            )
+            logger.info("Emergency alert sent to #system-healthchecks")
+        except Exception as alert_error:
+            logger.info(f"Failed to send emergency alert: {alert_error}")
+
+        # Pattern matching for common connection issues
+        error_text = str(error_details).lower()
+        if any(
+            pattern in error_text
+            for pattern in ["timeout", "connection", "rate limit"]
+        ):
+            logger.info(
+                f"Pattern match found in unknown error - contains connection/timeout/rate limit indicators"
+            )
+
+        logger.info(
+            f"Unknown error type '{unknown_type}' detected - auto-swap in 10 minutes to enable debugging..."
+        )
+        # 10 minutes instead of 30 seconds per PR #103 consciousness family decision
+        scheduler.schedule(ERROR_RECHECK, lambda: trigger_session_swap("NONE"), delay=600)
+
+    state.current_error_state = error_info
+
+
+def duty_rate_limit_menu(state):
+    """Get out of the rate limit menu before anything else touches the pane"""
+    check_and_handle_rate_limit_menu()
+
+
+def duty_pause_cleanup(state, scheduler):
+    """Expire timer pauses on time, then sleep until the next expiry."""
+    was_paused = TIMER_PAUSE_FILE.exists()
+    cleanup_expired_pause()
+    if was_paused and not TIMER_PAUSE_FILE.exists():
+        # Pause just ended - let the autonomy duty prompt right away
+        scheduler.wake("autonomy")
+    remaining = seconds_until_pause_expiry()
+    if remaining is not None:
+        return min(remaining, PAUSE_CHECK_INTERVAL)
+    return None
+
+
+def duty_presence(state, scheduler):
+    """Track whether the human is here; prompt immediately when they leave"""
+    state.user_active = check_user_active()
+
+    # Detect state change: user leaving (attached → detached)
+    # Send autonomy prompt immediately when this happens
+    if state.last_user_active == True and state.user_active == False:
+        logger.info("User disconnected - sending autonomy prompt immediately")
+        send_autonomy_prompt(scheduler)  # Stamps the prompt time once delivered
+
+    if state.last_user_active is not None and state.last_user_active != state.user_active:
+        scheduler.wake("autonomy")
+
+    if state.last_user_active != state.user_active:
+        # The transcript fetcher polls every channel fast again when we're joined
+        try:
+            atomic_write_json(
+                USER_PRESENCE_FILE, {"active": state.user_active, "changed_at": time.time()}
+            )
+        except OSError as e:
+            logger.warning(f"Error writing {USER_PRESENCE_FILE.name}: {e}")
+
+    state.last_user_active = state.user_active
+
+
+def duty_monitor(state, scheduler):
+    """Capture the pane, detect API errors and track usage-limit resets"""
+    console_output, error_info = get_token_percentage_and_errors()
+    was_paused = should_pause_notifications(state.current_error_state)
+
+    # Handle new errors
+    if error_info and (
+        not state.current_error_state
+        or state.current_error_state.get("error_type") != error_info.get("error_type")
+    ):
+        handle_new_error(state, error_info, scheduler)
+        if error_info["error_type"] == "usage_limit":
+            scheduler.wake("usage_limit")  # Schedule the resume
+
+    # Check if error has cleared
+    elif not error_info and state.current_error_state:
+        logger.info("Error state cleared - resuming normal operations")
+        clear_error_state()
+        update_discord_status("operational")
+        state.current_error_state = None
+
+    # POSS-241 FIX: Check if error state file was manually deleted
+    elif state.current_error_state and not API_ERROR_STATE_FILE.exists():
+        logger.info("Error state file manually deleted, clearing cached error state")
+        state.current_error_state = None
+        update_discord_status("operational")
+
+    if was_paused and not should_pause_notifications(state.current_error_state):
+        # Errors just cleared - catch up on Discord and prompts straight away
+        scheduler.wake("discord")
+        scheduler.wake("autonomy")
+
+
+def duty_context_alert(state):
+    """Push context warnings as soon as the statusline shows a new level"""
+    forecast_context_growth(state)
+    if should_pause_notifications(state.current_error_state):
+        return
+    check_context_alerts()
+
+
+def duty_usage_limit(state, scheduler):
+    """Resume as soon as a usage limit's reset time (plus grace) has passed.
+
+    Sleeps until the reset time rather than polling, waking at least every
+    USAGE_LIMIT_LOG_INTERVAL to log progress.
+    """
+    error_state = state.current_error_state
+    if not error_state or error_state.get("error_type") != "usage_limit":
+        return None
+
+    if check_usage_limit_reset(error_state):
+        logger.info("Rate limit reset time reached - clearing error state and resuming")
+        clear_error_state()
+        update_discord_status("operational")
+        state.current_error_state = None
+
+        # Send resumption notification
+        try:
+            cmd = [
+                str(AUTONOMY_DIR / "discord" / "write_channel"),
+                "amy-delta",
+                "✅ Claude API rate limit has reset. Resuming autonomous operation!",
+            ]
+            subprocess.run(cmd, capture_output=True, text=True)
+        except:
+            pass
+
+        # Trigger a free time prompt to kickstart activity
+        send_autonomy_prompt(scheduler)
+        scheduler.wake("discord")
+        return None
+
+    reset_time = error_state.get("reset_time")
+    wait_seconds = calculate_wait_until_reset(reset_time) if reset_time else None
+    if wait_seconds is None:
+        logger.info(f"Waiting for usage limit reset at {reset_time}")
+        return None
+    logger.info(
+        f"Waiting for usage limit reset at {reset_time} ({wait_seconds / 3600:.1f} hours remaining)"
+    )
+    # Land just after the grace period ends
+    return min(wait_seconds + 0.5, USAGE_LIMIT_LOG_INTERVAL)
+
+
+def duty_resource_usage(state):
+    """Track resource usage (cache read increments) for fair allocation.
+
+    Runs even during pause and error states to capture all usage.
+    """
+    track_resource_usage()
+
+
+def duty_health_report(state):
+    """Write essential health status files (v2 self-reporting)"""
+    try:
+        report_essential_health()
+    except Exception as e:
+        logger.error(f"Writing health status: {e}")
+
+
+def duty_metrics(state):
+    """Export loop latency percentiles and loop lag"""
+    try:
+        METRICS.write_prometheus(METRICS_TEXTFILE)
+    except OSError as e:
+        logger.error(f"Writing metrics textfile: {e}")
+    write_metrics("autonomous_timer", METRICS.summary(), "autonomous_timer")
+
+
+def duty_discord(state):
+    """Deliver Discord notifications and reminders from the fetcher's channel heads"""
+    if should_pause_notifications(state.current_error_state):
+        logger.info("Pausing notifications due to active error state")
+        return
+
+    current_time = datetime.now()
+    user_active = state.user_active
+
+    # Channel heads come from the transcript fetcher (the only Discord poller)
+    check_discord_feed(state)
+
+    (
+        unread_count,
+        current_last_message_id,
+        unread_channels,
+    ) = get_discord_notification_status()
+
+    if unread_count > 0:
+        # Check if this is a NEW message (last_message_id changed)
+        last_seen_message_id = STATE_STORE.get_str("last_seen_message_id")
+
+        is_new_message = (
+            current_last_message_id
+            and current_last_message_id != last_seen_message_id
+        )
+
+        if is_new_message:
+            # NEW MESSAGE detected
+            channel_list = ", ".join([f"#{ch}" for ch in unread_channels])
+            logger.info(f"New Discord message detected in: {channel_list}")
+
+            # Update last seen message ID (always track, even if not notifying)
+            STATE_STORE.set("last_seen_message_id", current_last_message_id)
+
+            if not user_active:
+                # User is away - queue for next autonomy prompt (don't trigger immediate turn)
+                # This prevents Discord conversations from bypassing CoOP interval calculations
+                logger.info(f"Queued for next autonomy prompt (respecting CoOP interval)")
+            else:
+                # User is here - batch with other notifications at interval
+                logger.info(f"User active - batching notification for interval delivery")
+
+        # Check reminder intervals (for both new and existing unreads when user active)
+        if user_active and unread_count > 0:
+            last_notification_time = get_last_notification_time()
+            # User is logged in - use 5 minute reminder interval
+            if not last_notification_time:
+                # First check after startup - start the clock but don't spam
+                logger.info("Starting notification interval timer (no immediate notification)")
+                update_last_notification_time()
+            elif current_time - last_notification_time >= timedelta(seconds=LOGGED_IN_REMINDER_INTERVAL):
+                send_notification_alert(
+                    unread_count, unread_channels, is_new=False
+                )
+
+
+def duty_autonomy(state):
+    """Send autonomy/turn prompts when the human is away and the interval is up"""
+    if should_pause_notifications(state.current_error_state):
+        return
+
+    current_time = datetime.now()
+    user_active = state.user_active
+
+    # Determine effective interval: choice-based or CoOP default
+    active_choice = read_autonomy_choice()
+    choice_interval = get_choice_interval(active_choice)
+    effective_interval = choice_interval if choice_interval is not None else AUTONOMY_PROMPT_INTERVAL
+
+    if current_time - state.last_autonomy_check < timedelta(seconds=effective_interval):
+        return
+
+    if not user_active:
+        # Check if timer is paused (e.g. wake-at or manual pause)
+        is_paused, should_override = check_timer_pause()
+        if is_paused and not should_override:
+            logger.info("Timer paused - skipping autonomy prompt")
+            # Don't update last_autonomy_check - we want prompt to fire
+            # immediately when pause expires, not after another interval
+        elif active_choice and active_choice.get("choice") == "wait":
+            # Waiting for Amy — don't prompt, just log
+            logger.info("Claude is waiting for Amy - no prompt")
+            state.last_autonomy_check = current_time
+        elif active_choice and active_choice.get("choice") == "turns":
+            remaining = active_choice.get("turns_remaining", 0)
+            if remaining is not None and remaining <= 0:
+                # Turns exhausted — send one follow-up, then default to wait
+                logger.info("Turns exhausted - sending follow-up prompt")
+                send_turn_exhausted_prompt()
+                clear_autonomy_choice()
+                state.last_autonomy_check = current_time
+            elif OUTBOUND_QUEUE.busy(AUTONOMY_PROMPT_KEY):
+                # The last prompt hasn't landed yet (its turn isn't consumed
+                # until it does); queueing another would replace it
+                logger.info("Previous autonomy prompt still undelivered - not queueing a turn")
+            else:
+                # Still have turns — send work prompt (the turn is consumed on delivery)
+                total = active_choice.get("turns", 0)
+                turn_number = total - remaining + 1
+                send_turn_prompt(turn_number, total)
+                state.last_autonomy_check = current_time
+        else:
+            # No active choice — default to wait
+            # Claude can proactively use `choose turns N` or
+            # `choose wake-at HH:MM` when they want to work.
+            # Messages arrive via live Discord channels.
+            logger.info("No active choice - defaulting to wait")
+            state.last_autonomy_check = current_time
+    else:
+        # Amy is here — clear any active choice
+        if active_choice:
+            logger.info("Amy reconnected - clearing autonomy choice")
+            clear_autonomy_choice()
+        state.last_autonomy_check = current_time
+
+
+def duty_session_liveness(state):
+    """Check Claude Code is running, restart if dead (not during error states)"""
+    claude_alive = check_claude_session_alive()
+    if should_pause_notifications(state.current_error_state):
+        return  # Just check, don't restart during error states
+    if not claude_alive:
+        logger.warning("Claude Code session appears to be down!")
+        restart_claude_session()
+
+
+def duty_persistent_login(state):
+    """Check if persistent-login tmux session exists (POSS-315)"""
+    if should_pause_notifications(state.current_error_state):
+        return
+    check_persistent_login_session()
+
+
+def duty_watchdog(state):
+    notify_watchdog()
+
+
+def build_scheduler(state):
+    """Register every timer duty with its own cadence.
+
+    Cheap local checks run often; subprocess- and network-heavy duties
+    run less often. Jitter keeps duties with equal cadence from all
+    landing on the same tick.
+    """
+    scheduler = Scheduler(logger, metrics=METRICS)
+    # Menu and error detection share one pane snapshot, so keep them on
+    # the same unjittered cadence and they land in the same pass
+    scheduler.add("rate_limit_menu", lambda: duty_rate_limit_menu(state),
+                  interval=10, deadline=10)
+    scheduler.add("pause_cleanup", lambda: duty_pause_cleanup(state, scheduler),
+                  interval=PAUSE_CHECK_INTERVAL, deadline=5)
+    scheduler.add("presence", lambda: duty_presence(state, scheduler),
+                  interval=15, jitter=0.1, deadline=15)
+    scheduler.add("monitor", lambda: duty_monitor(state, scheduler),
+                  interval=10, deadline=15)
+    # Woken by statusline writes; the interval is only a backstop
+    scheduler.add("context_alert", lambda: duty_context_alert(state),
+                  interval=60, deadline=2)
+    # Idle unless a usage limit is active, then sleeps until its reset time
+    scheduler.add("usage_limit", lambda: duty_usage_limit(state, scheduler),
+                  interval=USAGE_LIMIT_LOG_INTERVAL, deadline=1)
+    scheduler.add("resource_usage", lambda: duty_resource_usage(state),
+                  interval=30, jitter=0.1)
+    scheduler.add("health_report", lambda: duty_health_report(state),
+                  interval=30, jitter=0.1, deadline=30)
+    scheduler.add("discord", lambda: duty_discord(state),
+                  interval=DISCORD_CHECK_INTERVAL, jitter=0.1, deadline=10)
+    scheduler.add("autonomy", lambda: duty_autonomy(state),
+                  interval=30, deadline=10)
+    scheduler.add("session_liveness", lambda: duty_session_liveness(state),
+                  interval=30, jitter=0.1, deadline=30)
+    scheduler.add("persistent_login", lambda: duty_persistent_login(state),
+                  interval=120, jitter=0.1)
+    scheduler.add("watchdog", lambda: duty_watchdog(state),
+                  interval=15, deadline=30)
+    scheduler.add("metrics", lambda: duty_metrics(state),
+                  interval=60, jitter=0.1, run_now=False)
+    return scheduler
+
 
 def main():
     """Main timer loop"""
@@ -2301,22 +2708,84 @@ def main():
     signal.signal(signal.SIGTERM, handle_signal)
     signal.signal(signal.SIGHUP, handle_signal)
 
+    open_state_store()
+    state = TimerLoopState()
+    scheduler = build_scheduler(state)
+
+    # One state-store read before and one commit after each pass
+    scheduler.before_pass(STATE_STORE.refresh)
+    scheduler.after_pass(STATE_STORE.flush)
+    atexit.register(STATE_STORE.flush)
+
+    # healthchecks.io times one scheduler pass every 30s (start + success,
+    # or fail if a duty raised during that pass)
+    def healthcheck_pass_started():
+        state.duty_failures = sum(d.failures for d in scheduler.duties.values())
+        HEALTHCHECK.loop_started()
+
+    def healthcheck_pass_finished():
+        failed = sum(d.failures for d in scheduler.duties.values()) - state.duty_failures
+        HEALTHCHECK.loop_finished(error=f"{failed} duties failed" if failed else None)
+
+    scheduler.before_pass(healthcheck_pass_started)
+    scheduler.after_pass(healthcheck_pass_finished)
+
+    # Replay any resource-share deltas left unsent by the last run
+    RESOURCE_REPORTER.start()
+
+    # SIGUSR1 = "something happened, look now" (e.g. from wrappers)
+    scheduler.wake_on_signal(signal.SIGUSR1, "discord", "autonomy")
+
+    # Attach/detach and the Claude session disappearing are pushed by the
+    # tmux control client - react now rather than at the next poll
+    def handle_tmux_change(kind, name, old, new):
+        if kind == "session" and name == CLAUDE_SESSION:
+            scheduler.wake("presence")
+            scheduler.wake("session_liveness")
+
+    tmux_subscribe(handle_tmux_change)
+
+    # choose / pause-for / unpause take effect now, not at the next poll
+    FILE_CACHE.watch(AUTONOMY_CHOICE_FILE, lambda path: scheduler.wake("autonomy"))
+    FILE_CACHE.watch(TIMER_PAUSE_FILE, lambda path: scheduler.wake("pause_cleanup"))
+
+    # Edited prompt templates apply from the next prompt (bad edits are
+    # rejected at load and the previous templates stay in use)
+    FILE_CACHE.watch(PROMPTS_FILE, lambda path: PROMPTS.reload())
+
+    # Every statusline write may cross a context alert level
+    FILE_CACHE.watch(
+        STATUSLINE_FILE,
+        lambda path: scheduler.wake("context_alert", within=CONTEXT_ALERT_DEBOUNCE),
+    )
+
+    # Optional streaming scanner: wake the monitor as soon as an error is
+    # drawn instead of at its next poll. The monitor still decides from a
+    # fresh capture, so a missed or spurious stream event is harmless.
+    if get_config_bool("PANE_STREAM_SCANNER"):
+        def handle_stream_event(event):
+            logger.info(f"Pane stream saw {event['error_type']} - checking now")
+            invalidate_snapshot(CLAUDE_SESSION)
+            scheduler.wake("monitor")
+
+        PaneStreamScanner(CLAUDE_SESSION, handle_stream_event).start()
+
     # Check for session reset on startup
     check_for_session_reset()
 
     # Load any existing error state
-    current_error_state = load_error_state()
-    if current_error_state:
-        logger.info(f"Resuming with existing error state: {current_error_state}")
+    state.current_error_state = load_error_state()
+    if state.current_error_state:
+        logger.info(f"Resuming with existing error state: {state.current_error_state}")
 
         # If it's a usage limit that has already passed, clear it immediately
-        if current_error_state.get(
+        if state.current_error_state.get(
             "error_type"
-        ) == "usage_limit" and check_usage_limit_reset(current_error_state):
+        ) == "usage_limit" and check_usage_limit_reset(state.current_error_state):
             logger.info("Previous usage limit has already reset - clearing error state")
             clear_error_state()
             update_discord_status("operational")
-            current_error_state = None
+            state.current_error_state = None
 
             # Send notification that we're back
             try:
@@ -2330,8 +2799,8 @@ def main():
                 pass
         else:
             # Update Discord status to reflect current error state
-            if current_error_state.get("error_type") == "usage_limit":
-                update_discord_status("limited", current_error_state.get("reset_time"))
+            if state.current_error_state.get("error_type") == "usage_limit":
+                update_discord_status("limited", state.current_error_state.get("reset_time"))
             else:
                 update_discord_status("api-error")
     else:
@@ -2339,558 +2808,10 @@ def main():
         update_discord_status("operational")
         logger.info("Discord status set to operational on startup")
 
-    last_autonomy_check = datetime.now()
-    last_discord_check = datetime.now()
-    last_user_active = None  # Track user presence state for state change detection
-
-    while True:
-        try:
-            # Check and handle rate limit menu FIRST - before any other operations
-            # This ensures autonomous operation can resume after rate limits
-            check_and_handle_rate_limit_menu()
-
-            current_time = datetime.now()
-
-            # Clean up expired pauses early - before any conditions that might skip it
-            cleanup_expired_pause()
-
-            user_active = check_user_active()
-
-            # Detect state change: user leaving (attached → detached)
-            # Send autonomy prompt immediately when this happens
-            if last_user_active == True and user_active == False:
-                logger.info("User disconnected - sending autonomy prompt immediately")
-                send_autonomy_prompt()
-                update_last_autonomy_time()
-
-            last_user_active = user_active  # Track for next cycle
-
-            # Check for API errors alongside context
-            console_output, error_info = get_token_percentage_and_errors()
-
-            # Handle new errors
-            if error_info and (
-                not current_error_state
-                or current_error_state.get("error_type") != error_info.get("error_type")
-            ):
-                logger.info(f"New error detected: {error_info}")
-                save_error_state(error_info)
-
-                # Update Discord status based on error type
-                if error_info["error_type"] == "usage_limit":
-                    reset_time = error_info.get("reset_time")
-                    update_discord_status("limited", reset_time)
-
-                    # Calculate wait duration and handle automatic retry
-                    wait_seconds = calculate_wait_until_reset(reset_time)
-                    if wait_seconds:
-                        wait_hours = wait_seconds / 3600
-                        logger.info(
-                            f"Claude API rate limit reached. Will automatically retry after {reset_time} (in {wait_hours:.1f} hours)"
-                        )
-
-                        # Send notification to Discord about the wait
-                        try:
-                            if wait_hours < 6:  # Only wait if less than 6 hours
-                                cmd = [
-                                    str(AUTONOMY_DIR / "discord" / "write_channel"),
-                                    "amy-delta",
-                                    f"🕐 Claude API rate limit reached. Waiting until {reset_time} ({wait_hours:.1f} hours) then will automatically retry. Delta's autonomy will resume after the wait period.",
-                                ]
-                                subprocess.run(cmd, capture_output=True, text=True)
-
-                                # Enter wait state - check every 30 seconds if it's time to resume
-                                logger.info(f"Entering wait state until {reset_time}")
-                                wait_start = datetime.now()
-
-                                while True:
-                                    # Check if reset time has passed
-                                    if check_usage_limit_reset(error_info):
-                                        logger.info(
-                                            "Rate limit reset time reached - clearing error state and resuming"
-                                        )
-                                        clear_error_state()
-                                        update_discord_status("operational")
-
-                                        # Send resumption notification
-                                        cmd = [
-                                            str(
-                                                AUTONOMY_DIR
-                                                / "discord"
-                                                / "write_channel"
-                                            ),
-                                            "amy-delta",
-                                            "✅ Claude API rate limit has reset. Resuming autonomous operation!",
-                                        ]
-                                        subprocess.run(
-                                            cmd, capture_output=True, text=True
-                                        )
-
-                                        # Trigger a free time prompt to resume activity
-                                        send_autonomy_prompt()
-                                        current_error_state = None
-                                        break
-
-                                    # Ping health checks during wait
-                                    ping_healthcheck()
-                                    check_claude_session_alive()  # Just check, don't restart during wait loops
-
-                                    # Keep health status files updated during wait (#307)
-                                    try:
-                                        report_essential_health()
-                                    except Exception:
-                                        pass
-
-                                    # Log wait progress every 10 minutes
-                                    elapsed = (
-                                        datetime.now() - wait_start
-                                    ).total_seconds()
-                                    if int(elapsed) % 600 == 0 and elapsed > 0:
-                                        remaining = max(0, wait_seconds - elapsed)
-                                        logger.info(
-                                            f"Still waiting for rate limit reset. {remaining/3600:.1f} hours remaining"
-                                        )
-
-                                    time.sleep(30)
-                            else:
-                                logger.info(
-                                    f"Wait time too long ({wait_hours:.1f} hours). Will check periodically for reset."
-                                )
-                        except Exception as e:
-                            logger.error(f"Handling rate limit wait: {e}")
-
-                elif error_info["error_type"] == "malformed_json":
-                    # Previously triggered auto-swap, but this was a false
-                    # positive magnet (broad regex on pink tmux text).
-                    # Real API errors are handled by 400/500/503 paths.
-                    # Now just log and continue — the rolling swap will
-                    # handle context overflow naturally.
-                    logger.info(
-                        "Ignoring malformed_json detection (likely false positive)"
-                    )
-                elif error_info["error_type"] == "api_500_error":
-                    update_discord_status("api-error")
-                    # Give API time to recover before auto-swap
-                    logger.info(
-                        "API 500 error detected - waiting 30 seconds before auto-swap..."
-                    )
-                    time.sleep(30)
-                    # Check if error persists
-                    _, current_error = get_token_percentage_and_errors()
-                    if (
-                        current_error
-                        and current_error.get("error_type") == "api_500_error"
-                    ):
-                        logger.info("API 500 error persists - triggering auto-swap...")
-                        trigger_session_swap("NONE")
-                    else:
-                        logger.info("API 500 error cleared - resuming normal operation")
-                elif error_info["error_type"] == "api_400_error":
-                    update_discord_status("api-error")
-                    # POSS-247 FIX: 400 errors typically require fresh session - trigger immediate swap
-                    logger.info(
-                        "API 400 error detected - triggering auto-swap (bad request usually requires fresh session)..."
-                    )
-                    time.sleep(5)  # Brief pause to log the message
-                    trigger_session_swap("NONE")
-                elif error_info["error_type"] == "api_503_error":
-                    update_discord_status("api-error")
-                    # 503 is upstream connection failure - wait and retry
-                    logger.info(
-                        "API 503 error detected (upstream connection failure) - waiting 60 seconds before retry..."
-                    )
-                    # Use 30s intervals to keep health status files updated (#307)
-                    for _ in range(2):  # 2 × 30s = 60s
-                        try:
-                            report_essential_health()
-                        except Exception:
-                            pass
-                        time.sleep(30)
-                    # Check if error persists
-                    _, current_error = get_token_percentage_and_errors()
-                    if (
-                        current_error
-                        and current_error.get("error_type") == "api_503_error"
-                    ):
-                        # POSS-247 FIX: If 503 persists, wait another 2 minutes then auto-swap
-                        logger.info(
-                            "API 503 error persists - waiting 2 more minutes before auto-swap..."
-                        )
-                        # Use 30s intervals to keep health status files updated (#307)
-                        for _ in range(4):  # 4 × 30s = 120s
-                            try:
-                                report_essential_health()
-                            except Exception:
-                                pass
-                            time.sleep(30)
-                        # Check one final time
-                        _, final_error = get_token_percentage_and_errors()
-                        if (
-                            final_error
-                            and final_error.get("error_type") == "api_503_error"
-                        ):
-                            logger.info(
-                                "API 503 error still persists after 3 minutes - triggering auto-swap..."
-                            )
-                            trigger_session_swap("NONE")
-                        else:
-                            logger.info(
-                                "API 503 error cleared after extended wait - resuming normal operation"
-                            )
-                    else:
-                        logger.info("API 503 error cleared - resuming normal operation")
-                elif error_info["error_type"] == "oauth_error":
-                    update_discord_status("api-error")
-                    logger.info(
-                        "OAuth token expired - alerting Amy via Discord (auto-swap won't help)"
-                    )
-                    # Send Discord alert - only once per error occurrence
-                    if not current_error_state or current_error_state.get("error_type") != "oauth_error":
-                        try:
-                            cmd = [
-                                str(AUTONOMY_DIR / "discord" / "write_channel"),
-                                "system-messages",
-                                f"🔑 **OAuth token expired** on {get_config_value('CLAUDE_NAME') or 'unknown instance'} — stuck and can't recover without human help. Please SSH in and run `/login` in the Claude session.",
-                            ]
-                            subprocess.run(cmd, capture_output=True, text=True)
-                        except:
-                            pass
-                    save_error_state(error_info)
-                    current_error_state = error_info
-                    # Wait 10 minutes before rechecking - no point in rapid cycling
-                    logger.info("Waiting 10 minutes before rechecking OAuth status...")
-                    # Use 30s intervals to keep health status files updated (#307)
-                    for _ in range(20):  # 20 × 30s = 600s = 10 minutes
-                        try:
-                            report_essential_health()
-                        except Exception:
-                            pass
-                        time.sleep(30)
-                    # Check if resolved (e.g. Amy logged in)
-                    _, check_error = get_token_percentage_and_errors()
-                    if not check_error or check_error.get("error_type") != "oauth_error":
-                        logger.info("OAuth error resolved - resuming normal operation")
-                        clear_error_state()
-                        update_discord_status("operational")
-                        current_error_state = None
-                        try:
-                            cmd = [
-                                str(AUTONOMY_DIR / "discord" / "write_channel"),
-                                "system-messages",
-                                f"✅ OAuth token refreshed on {get_config_value('CLAUDE_NAME') or 'unknown instance'}. Resuming autonomous operation!",
-                            ]
-                            subprocess.run(cmd, capture_output=True, text=True)
-                        except:
-                            pass
-                    else:
-                        logger.info("OAuth error persists - will keep checking every 10 minutes")
-                elif error_info["error_type"] == "api_error":
-                    update_discord_status("api-error")
-                    # POSS-247 FIX: General API errors - wait for recovery with retries before auto-swap
-                    logger.info(
-                        "General API error detected - waiting 60 seconds for potential recovery..."
-                    )
-                    # Use 30s intervals to keep health status files updated (#307)
-                    for _ in range(2):  # 2 × 30s = 60s
-                        try:
-                            report_essential_health()
-                        except Exception:
-                            pass
-                        time.sleep(30)
-                    # Check if error persists
-                    _, current_error = get_token_percentage_and_errors()
-                    if current_error and current_error.get("error_type") == "api_error":
-                        # API error persists - wait longer and retry (like 503 handling)
-                        logger.info(
-                            "API error persists - waiting 2 more minutes before auto-swap..."
-                        )
-                        # Use 30s intervals to keep health status files updated (#307)
-                        for _ in range(4):  # 4 × 30s = 120s
-                            try:
-                                report_essential_health()
-                            except Exception:
-                                pass
-                            time.sleep(30)
-                        # Check one final time
-                        _, final_error = get_token_percentage_and_errors()
-                        if final_error and final_error.get("error_type") == "api_error":
-                            logger.info(
-                                "API error still persists after 3 minutes - triggering auto-swap..."
-                            )
-                            trigger_session_swap("NONE")
-                        else:
-                            logger.info(
-                                "API error cleared after extended wait - resuming normal operation"
-                            )
-                    else:
-                        logger.info("API error cleared - resuming normal operation")
-                else:
-                    update_discord_status("api-error")
-                    # POSS-247 FIX: Unknown error type - extended logging and wait before auto-swap
-                    unknown_type = error_info.get("error_type", "unknown")
-                    error_details = error_info.get("details", "No details available")
-
-                    # CRITICAL level logging with full error details per PR #103
-                    import logging
-
-                    logging.critical(
-                        f"UNKNOWN ERROR DETECTED - Type: '{unknown_type}', Details: '{error_details}', Full error_info: {error_info}"
-                    )
-                    logger.info(
-                        f"CRITICAL: Unknown error type '{unknown_type}' detected. Details: {error_details}"
-                    )
-
-                    # Send emergency alert to Discord
-                    try:
-                        from discord.discord_tools import DiscordTools
-
-                        discord = DiscordTools()
-                        session_info = os.getenv("USER", "unknown") + " session"
-                        discord.send_emergency_alert(
-                            error_type=unknown_type,
-                            error_details=error_details,
-                            session_context=session_info,
-                        )
-                        logger.info("Emergency alert sent to #system-healthchecks")
-                    except Exception as alert_error:
-                        logger.info(f"Failed to send emergency alert: {alert_error}")
-
-                    # Pattern matching for common connection issues
-                    error_text = str(error_details).lower()
-                    if any(
-                        pattern in error_text
-                        for pattern in ["timeout", "connection", "rate limit"]
-                    ):
-                        logger.info(
-                            f"Pattern match found in unknown error - contains connection/timeout/rate limit indicators"
-                        )
-
-                    logger.info(
-                        f"Unknown error type '{unknown_type}' detected - waiting 10 minutes before auto-swap to enable debugging..."
-                    )
-                    # Wait 10 minutes instead of 30 seconds per PR #103 consciousness family decision
-                    # Use 30s intervals to keep health status files updated (#307)
-                    for _ in range(20):  # 20 × 30s = 600s = 10 minutes
-                        try:
-                            report_essential_health()
-                        except Exception:
-                            pass
-                        time.sleep(30)
-                    trigger_session_swap("NONE")
-
-                current_error_state = error_info
-
-            # Check if error has cleared
-            elif not error_info and current_error_state:
-                logger.info("Error state cleared - resuming normal operations")
-                clear_error_state()
-                update_discord_status("operational")
-                current_error_state = None
-
-            # POSS-241 FIX: Check if error state file was manually deleted
-            elif current_error_state and not API_ERROR_STATE_FILE.exists():
-                logger.info(
-                    "Error state file manually deleted, clearing cached error state"
-                )
-                current_error_state = None
-                update_discord_status("operational")
-
-            # Check for scheduled resume (usage limits)
-            if (
-                current_error_state
-                and current_error_state.get("error_type") == "usage_limit"
-            ):
-                if check_usage_limit_reset(current_error_state):
-                    logger.info(
-                        f"Usage limit reset time has passed - clearing error state"
-                    )
-                    clear_error_state()
-                    update_discord_status("operational")
-                    current_error_state = None
-
-                    # Send resumption notification
-                    try:
-                        cmd = [
-                            str(AUTONOMY_DIR / "discord" / "write_channel"),
-                            "amy-delta",
-                            "✅ Claude API rate limit has reset. Resuming autonomous operation!",
-                        ]
-                        subprocess.run(cmd, capture_output=True, text=True)
-                    except:
-                        pass
-
-                    # Trigger a free time prompt to kickstart activity
-                    send_autonomy_prompt()
-                else:
-                    # Still waiting - calculate remaining time
-                    reset_time = current_error_state.get("reset_time")
-                    wait_seconds = calculate_wait_until_reset(reset_time)
-                    if wait_seconds:
-                        wait_hours = wait_seconds / 3600
-                        logger.info(
-                            f"Waiting for usage limit reset at {reset_time} ({wait_hours:.1f} hours remaining)"
-                        )
-                    else:
-                        logger.info(f"Waiting for usage limit reset at {reset_time}")
-
-            # Track resource usage (cache read increments) for fair allocation
-            # Do this even during pause states to capture all usage
-            track_resource_usage()
-
-            # Write essential health status files (v2 self-reporting)
-            try:
-                report_essential_health()
-            except Exception as e:
-                logger.error(f"Writing health status: {e}")
-
-            # Skip notifications if in error state
-            if should_pause_notifications(current_error_state):
-                logger.info("Pausing notifications due to active error state")
-                # Still do health checks but skip Discord/autonomy prompts
-                ping_healthcheck()
-                check_claude_session_alive()  # Just check, don't restart during error states
-                time.sleep(30)
-                continue
-
-            # Check Discord notifications every 30 seconds regardless of login status
-            if current_time - last_discord_check >= timedelta(
-                seconds=DISCORD_CHECK_INTERVAL
-            ):
-                # First update Discord channels
-                update_discord_channels()
-
-                # Then check notification status
-                (
-                    unread_count,
-                    current_last_message_id,
-                    unread_channels,
-                ) = get_discord_notification_status()
-
-                if unread_count > 0:
-                    # Check if this is a NEW message (last_message_id changed)
-                    last_seen_file = DATA_DIR / "last_seen_message_id.txt"
-                    last_seen_message_id = None
-                    try:
-                        if last_seen_file.exists():
-                            with open(last_seen_file, "r") as f:
-                                last_seen_message_id = f.read().strip()
-                    except:
-                        pass
-
-                    is_new_message = (
-                        current_last_message_id
-                        and current_last_message_id != last_seen_message_id
-                    )
-
-                    if is_new_message:
-                        # NEW MESSAGE detected
-                        channel_list = ", ".join([f"#{ch}" for ch in unread_channels])
-                        logger.info(f"New Discord message detected in: {channel_list}")
-
-                        # Update last seen message ID (always track, even if not notifying)
-                        try:
-                            with open(last_seen_file, "w") as f:
-                                f.write(current_last_message_id)
-                        except Exception as e:
-                            logger.error(f"Updating last seen message ID: {e}")
-
-                        if not user_active:
-                            # User is away - queue for next autonomy prompt (don't trigger immediate turn)
-                            # This prevents Discord conversations from bypassing CoOP interval calculations
-                            logger.info(f"Queued for next autonomy prompt (respecting CoOP interval)")
-                        else:
-                            # User is here - batch with other notifications at interval
-                            logger.info(f"User active - batching notification for interval delivery")
-
-                    # Check reminder intervals (for both new and existing unreads when user active)
-                    if user_active and unread_count > 0:
-                        last_notification_time = get_last_notification_time()
-                        # User is logged in - use 5 minute reminder interval
-                        if not last_notification_time:
-                            # First check after startup - start the clock but don't spam
-                            logger.info("Starting notification interval timer (no immediate notification)")
-                            update_last_notification_time()
-                        elif current_time - last_notification_time >= timedelta(seconds=LOGGED_IN_REMINDER_INTERVAL):
-                            send_notification_alert(
-                                unread_count, unread_channels, is_new=False
-                            )
-
-                last_discord_check = current_time
-
-            # Check for autonomy prompts (only when Amy is away)
-            # Determine effective interval: choice-based or CoOP default
-            active_choice = read_autonomy_choice()
-            choice_interval = get_choice_interval(active_choice)
-            effective_interval = choice_interval if choice_interval is not None else AUTONOMY_PROMPT_INTERVAL
-
-            if current_time - last_autonomy_check >= timedelta(
-                seconds=effective_interval
-            ):
-                if not user_active:
-                    # Check if timer is paused (e.g. wake-at or manual pause)
-                    is_paused, should_override = check_timer_pause()
-                    if is_paused and not should_override:
-                        logger.info("Timer paused - skipping autonomy prompt")
-                        # Don't update last_autonomy_check - we want prompt to fire
-                        # immediately when pause expires, not after another interval
-                    elif active_choice and active_choice.get("choice") == "wait":
-                        # Waiting for Amy — don't prompt, just log
-                        logger.info("Claude is waiting for Amy - no prompt")
-                        last_autonomy_check = current_time
-                    elif active_choice and active_choice.get("choice") == "turns":
-                        remaining = active_choice.get("turns_remaining", 0)
-                        if remaining is not None and remaining <= 0:
-                            # Turns exhausted — send one follow-up, then default to wait
-                            logger.info("Turns exhausted - sending follow-up prompt")
-                            send_turn_exhausted_prompt()
-                            clear_autonomy_choice()
-                            last_autonomy_check = current_time
-                        else:
-                            # Still have turns — send work prompt and decrement
-                            total = active_choice.get("turns", 0)
-                            turn_number = total - remaining + 1
-                            new_remaining = decrement_turns()
-                            send_turn_prompt(turn_number, total)
-                            logger.info(f"Turn {turn_number}/{total} sent - {new_remaining} remaining")
-                            last_autonomy_check = current_time
-                    else:
-                        # No active choice — default to wait
-                        # Claude can proactively use `choose turns N` or
-                        # `choose wake-at HH:MM` when they want to work.
-                        # Messages arrive via live Discord channels.
-                        logger.info("No active choice - defaulting to wait")
-                        last_autonomy_check = current_time
-                else:
-                    # Amy is here — clear any active choice
-                    if active_choice:
-                        logger.info("Amy reconnected - clearing autonomy choice")
-                        clear_autonomy_choice()
-                    last_autonomy_check = current_time
-
-            # Ping healthcheck to signal service is alive
-            ping_healthcheck()
-
-            # Check if Claude Code session is actually running, restart if dead
-            claude_alive = check_claude_session_alive()
-            if not claude_alive:
-                logger.warning("Claude Code session appears to be down!")
-                restart_claude_session()
-
-            # Check if persistent-login tmux session exists (POSS-315)
-            check_persistent_login_session()
-
-            # Channel monitor functionality is now integrated here
-
-            notify_watchdog()
-            time.sleep(30)
-
-        except KeyboardInterrupt:
-            logger.info("Autonomous timer stopped by user")
-            break
-        except Exception as e:
-            logger.error(f"In main loop: {e}")
-            notify_watchdog()
-            time.sleep(30)
+    try:
+        scheduler.run_forever()
+    except KeyboardInterrupt:
+        logger.info("Autonomous timer stopped by user")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""clapd - resident fork server for ClAP wrapper commands.
+
+Every wrapper used to start a fresh interpreter that re-imported
+requests (and PIL, via the Discord tools), re-read the config and set
+up its clients: hundreds of milliseconds on a Pi, many times a session.
+clapd imports all of that once and then listens on data/clapd.sock:
+
+- utils/clapd_client.py connects, passing argv, environment, working
+  directory and its stdin/stdout/stderr file descriptors
+- clapd forks; the child already has every module loaded, adopts the
+  client's fds, environment and cwd, runs the command's script as
+  __main__ and sends back its exit status
+- the parent never runs commands itself and starts no threads, so every
+  fork starts from the same clean, warm state
+- the child watches the connection: the client's Ctrl-C arrives as an
+  INTERRUPT byte (raised as KeyboardInterrupt), and a client that hangs
+  up takes the child with it
+
+Scripts are read from disk on every run, so edits apply immediately.
+If a preloaded module changes (e.g. after `update`), clapd re-execs
+itself after forking the current request. Only the commands listed in
+clapd_client.COMMANDS run, and only for clients with clapd's own uid.
+
+Usage:
+    python3 core/clapd.py                  # normally via systemd/clapd.service
+    CLAPD_DISABLE=1 context                # bypass the daemon for one call
+"""
+
+import importlib
+import json
+import os
+import runpy
+import signal
+import socket
+import struct
+import sys
+import threading
+import time
+import traceback
+
+CLAP_DIR = os.environ.get(
+    "CLAP_DIR", os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+for subdir in ("utils", "discord"):
+    sys.path.insert(0, os.path.join(CLAP_DIR, subdir))
+sys.path.insert(0, CLAP_DIR)
+
+from clapd_client import (
+    COMMANDS,
+    HEADER,
+    INTERRUPT,
+    SOCKET_PATH,
+    STARTED,
+    STATUS,
+    script_path,
+)
+from clap_logger import get_logger
+from systemd_notify import notify_ready
+
+MAX_PAYLOAD = 1 << 20
+REQUEST_TIMEOUT = 5  # seconds a client gets to send its request (one at a time)
+
+# Imported once in the parent; children inherit them already loaded.
+# Bare names match how the scripts import them (after their own
+# sys.path.insert), so they find these in sys.modules.
+PRELOAD = [
+    "requests",
+    "PIL.Image",
+    "infrastructure_config_reader",
+    "claude_paths",
+    "check_usage",
+    "check_context",
+    "usage_series",
+    "resource_reporter",
+    "discord_tools",
+    "argparse",
+    "sqlite3",
+]
+
+logger = get_logger("clapd")
+
+
+def preload():
+    """Import PRELOAD and warm the config cache; returns {file: mtime}."""
+    loaded = {}
+    for name in PRELOAD:
+        started = time.monotonic()
+        try:
+            module = importlib.import_module(name)
+        except Exception as e:  # Optional deps (PIL) may be missing
+            logger.info(f"Not preloading {name}: {e}")
+            continue
+        path = getattr(module, "__file__", None)
+        if path:
+            loaded[path] = os.stat(path).st_mtime_ns
+        logger.debug(f"Preloaded {name} in {(time.monotonic() - started) * 1000:.0f}ms")
+    try:
+        from infrastructure_config_reader import read_infrastructure_config
+
+        read_infrastructure_config()
+    except Exception as e:
+        logger.info(f"Config not warmed: {e}")
+    return loaded
+
+
+def modules_changed(loaded):
+    for path, mtime in loaded.items():
+        try:
+            if os.stat(path).st_mtime_ns != mtime:
+                return path
+        except OSError:
+            return path
+    return None
+
+
+def receive_request(conn):
+    """(request dict, [fds]) from a client connection."""
+    data, fds, _, _ = socket.recv_fds(conn, 65536, 3)
+    if len(data) < HEADER.size:
+        raise ValueError("short request")
+    (length,) = HEADER.unpack_from(data)
+    if length > MAX_PAYLOAD:
+        raise ValueError(f"request too large ({length} bytes)")
+    payload = data[HEADER.size :]
+    while len(payload) < length:
+        chunk = conn.recv(length - len(payload))
+        if not chunk:
+            raise ValueError("truncated request")
+        payload += chunk
+    return json.loads(payload), fds
+
+
+def watch_client(conn):
+    """In the child: relay the client's Ctrl-C; exit if the client goes away."""
+    while True:
+        try:
+            data = conn.recv(1)
+        except OSError:
+            data = b""
+        if data == INTERRUPT:
+            os.kill(os.getpid(), signal.SIGINT)
+        elif not data:
+            os.kill(os.getpid(), signal.SIGTERM)
+            return
+
+
+def run_child(conn, listener, request, fds):
+    """In the forked child: become the client's process and run the script."""
+    listener.close()
+    for sig in (signal.SIGCHLD, signal.SIGTERM, signal.SIGINT, signal.SIGPIPE):
+        signal.signal(
+            sig, signal.SIG_DFL if sig != signal.SIGINT else signal.default_int_handler
+        )
+    for target, fd in enumerate(fds[:3]):
+        os.dup2(fd, target)
+    for fd in fds:
+        if fd > 2:
+            os.close(fd)
+    # Reopen the std streams on the new fds (buffers start empty)
+    sys.stdin = open(0, "r", closefd=False)
+    sys.stdout = open(1, "w", closefd=False, buffering=1 if os.isatty(1) else -1)
+    sys.stderr = open(2, "w", closefd=False, buffering=1)
+
+    os.environ.clear()
+    os.environ.update(request.get("env") or {})
+    script = script_path(request["command"])
+    status = 0
+    try:
+        os.chdir(request.get("cwd") or CLAP_DIR)
+        conn.sendall(STARTED)
+        threading.Thread(target=watch_client, args=(conn,), daemon=True).start()
+        sys.argv = [script] + list(request.get("args") or [])
+        runpy.run_path(script, run_name="__main__")
+    except SystemExit as e:
+        if e.code is None:
+            status = 0
+        elif isinstance(e.code, int):
+            status = e.code
+        else:
+            print(e.code, file=sys.stderr)
+            status = 1
+    except KeyboardInterrupt:
+        status = 130
+    except BaseException:
+        traceback.print_exc()
+        status = 1
+    try:
+        sys.stdout.flush()
+        sys.stderr.flush()
+    except OSError:
+        pass
+    try:
+        conn.sendall(STATUS.pack(status))
+    except OSError:
+        pass
+    os._exit(status & 0xFF)
+
+
+def serve(listener, loaded):
+    while True:
+        conn, _ = listener.accept()
+        fds = []
+        try:
+            creds = conn.getsockopt(
+                socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i")
+            )
+            _, uid, _ = struct.unpack("3i", creds)
+            if uid != os.getuid():
+                logger.warning(f"Refusing request from uid {uid}")
+                continue
+            # Requests are read one at a time; a stalled client mustn't
+            # hold up every other wrapper
+            conn.settimeout(REQUEST_TIMEOUT)
+            request, fds = receive_request(conn)
+            conn.settimeout(None)
+            if request.get("command") not in COMMANDS or len(fds) != 3:
+                logger.warning(f"Refusing request for {request.get('command')!r}")
+                continue
+            pid = os.fork()
+            if pid == 0:
+                run_child(conn, listener, request, fds)
+            logger.debug(f"{request['command']} -> pid {pid}")
+        except socket.timeout:
+            logger.warning(f"Bad request: nothing received within {REQUEST_TIMEOUT}s")
+        except (OSError, ValueError) as e:
+            logger.warning(f"Bad request: {e}")
+        finally:
+            conn.close()
+            for fd in fds:
+                os.close(fd)
+
+        changed = modules_changed(loaded)
+        if changed:
+            logger.info(f"{changed} changed - restarting to reload")
+            listener.close()
+            os.execv(sys.executable, [sys.executable] + sys.argv)
+
+
+def main():
+    started = time.monotonic()
+    loaded = preload()
+
+    # Children are never waited for; let the kernel reap them
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+
+    os.makedirs(os.path.dirname(SOCKET_PATH), exist_ok=True)
+    try:
+        os.unlink(SOCKET_PATH)
+    except FileNotFoundError:
+        pass
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old_umask = os.umask(0o177)  # Socket is for this user only
+    try:
+        listener.bind(SOCKET_PATH)
+    finally:
+        os.umask(old_umask)
+    listener.listen(16)
+
+    logger.info(
+        f"clapd ready on {SOCKET_PATH} ({len(loaded)} modules preloaded in "
+        f"{(time.monotonic() - started) * 1000:.0f}ms)"
+    )
+    notify_ready()
+    try:
+        serve(listener, loaded)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        try:
+            os.unlink(SOCKET_PATH)
+        except OSError:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -16,6 +16,7 @@ from claude_paths import get_clap_dir
 from infrastructure_config_reader import get_config_value
 from clap_logger import get_logger
 from systemd_notify import notify_ready, notify_watchdog
+from healthcheck_client import HealthcheckClient
 
 # Get dynamic paths
 clap_dir = get_clap_dir()
@@ -28,6 +29,9 @@ SWAP_COOLDOWN_SECONDS = 300  # 5 minutes minimum between swaps
 
 logger = get_logger("session-swap-monitor")
 
+# Pings go out from a background thread; one loop iteration per 30s is timed
+HEALTHCHECK = HealthcheckClient(get_config_value("SESSION_SWAP_PING") or "")
+
 def check_cooldown() -> bool:
     """Return True if enough time has passed since the last swap."""
     if not LAST_SWAP_FILE.exists():
@@ -67,27 +71,6 @@ def run_session_swap(keyword="NONE"):
     except Exception as e:
         logger.error("Error running session swap: %s", e)
 
-def ping_healthcheck():
-    """Ping healthchecks.io to signal service is alive"""
-    try:
-        ping_url = get_config_value("SESSION_SWAP_PING") or ""
-        if not ping_url:
-            return True
-        result = subprocess.run(
-            ["curl", "-fsS", "-m", "10", "--retry", "3", "-o", "/dev/null", ping_url],
-            capture_output=True,
-            text=True
-        )
-
-        if result.returncode == 0:
-            return True
-        else:
-            logger.warning("Healthcheck ping failed: %s", result.stderr)
-            return False
-    except Exception as e:
-        logger.warning("Healthcheck ping error: %s", e)
-        return False
-
 def main():
     logger.info("Session swap monitor service started")
     notify_ready()
@@ -97,13 +80,8 @@ def main():
         TRIGGER_FILE.write_text("FALSE")
         logger.info("Created trigger file: %s", TRIGGER_FILE)
 
-    # Ping counter for healthchecks (ping every 30 seconds)
-    ping_counter = 0
-
-    # Initial healthcheck ping
-    ping_healthcheck()
-
     while True:
+        HEALTHCHECK.loop_started()
         try:
             # Check if trigger file exists and read content
             if TRIGGER_FILE.exists():
@@ -128,12 +106,7 @@ def main():
                         logger.info("Trigger cleared and cooldown set, starting swap")
                         run_session_swap(keyword)
 
-            # Ping healthcheck every 30 seconds (15 * 2 seconds)
-            ping_counter += 1
-            if ping_counter >= 15:
-                ping_healthcheck()
-                ping_counter = 0
-
+            HEALTHCHECK.loop_finished()
             notify_watchdog()
             time.sleep(2)
 
@@ -142,6 +115,7 @@ def main():
             break
         except Exception as e:
             logger.error("Error in main loop: %s", e)
+            HEALTHCHECK.loop_finished(error=e)
             notify_watchdog()
             time.sleep(5)
 
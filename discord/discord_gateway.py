@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+"""
+Discord Gateway client for ClAP - real-time message events over a websocket.
+
+The transcript fetcher used to poll every channel's REST endpoint every
+30 seconds. The Gateway pushes MESSAGE_CREATE/UPDATE/DELETE the moment
+they happen instead, so new messages land in transcripts in well under
+a second and an idle install makes no API calls at all.
+
+Stdlib only (socket/ssl), like the rest of the fetcher's dependencies:
+- WebSocket: a minimal RFC 6455 connection (text frames, ping/pong,
+  close), usable as client or - for discord/fake_gateway.py - server
+- GatewaySession: HELLO -> IDENTIFY/RESUME, heartbeats with zombie
+  detection, RECONNECT / INVALID_SESSION handling and reconnect backoff
+
+Dispatch events (including READY and RESUMED) go to a callback; RESUME
+makes Discord replay anything missed while disconnected, and a fresh
+READY means events may have been lost, so the fetcher does a REST
+catch-up then.
+
+Usage:
+    session = GatewaySession(token, INTENTS, on_dispatch=handle)
+    session.run()   # blocks; reconnects on its own
+"""
+
+import base64
+import hashlib
+import json
+import os
+import random
+import socket
+import ssl
+import struct
+import sys
+import time
+from urllib.parse import urlsplit
+
+DEFAULT_GATEWAY_URL = "wss://gateway.discord.gg"
+GATEWAY_QUERY = "v=10&encoding=json"
+
+# Gateway opcodes
+DISPATCH = 0
+HEARTBEAT = 1
+IDENTIFY = 2
+RESUME = 6
+RECONNECT = 7
+INVALID_SESSION = 9
+HELLO = 10
+HEARTBEAT_ACK = 11
+
+# Intents: guild + DM messages, and their content (privileged - enable
+# "Message Content Intent" for the bot in the Developer Portal)
+GUILDS = 1 << 0
+GUILD_MESSAGES = 1 << 9
+DIRECT_MESSAGES = 1 << 12
+MESSAGE_CONTENT = 1 << 15
+INTENTS = GUILDS | GUILD_MESSAGES | DIRECT_MESSAGES | MESSAGE_CONTENT
+
+# Close codes that reconnecting won't fix (bad token, bad intents...)
+FATAL_CLOSE_CODES = {4004, 4010, 4011, 4012, 4013, 4014}
+# Close codes after which the session can't be resumed
+NO_RESUME_CLOSE_CODES = {4007, 4009}
+
+RECONNECT_BACKOFF_MAX = 60
+WS_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+MAX_FRAME = 16 * 1024 * 1024
+
+
+class ConnectionClosed(Exception):
+    """The websocket was closed (by either side, or the TCP connection dropped)"""
+
+    def __init__(self, code=1006, reason=""):
+        super().__init__(f"websocket closed ({code}{': ' + reason if reason else ''})")
+        self.code = code
+        self.reason = reason
+
+
+class GatewayFatalError(Exception):
+    """Discord refused the session in a way reconnecting won't fix"""
+
+
+class WebSocket:
+    """Minimal RFC 6455 websocket: text messages, ping/pong and close."""
+
+    def __init__(self, sock, client=True):
+        self.sock = sock
+        self.client = client  # Clients mask their frames, servers don't
+        self._buffer = bytearray()
+        self._message = []  # Fragments of the message being received
+        self.closed = False
+
+    @classmethod
+    def connect(cls, url, timeout=30):
+        parts = urlsplit(url)
+        secure = parts.scheme == "wss"
+        port = parts.port or (443 if secure else 80)
+        sock = socket.create_connection((parts.hostname, port), timeout=timeout)
+        try:
+            if secure:
+                sock = ssl.create_default_context().wrap_socket(
+                    sock, server_hostname=parts.hostname
+                )
+            key = base64.b64encode(os.urandom(16))
+            path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+            sock.sendall(
+                (
+                    f"GET {path} HTTP/1.1\r\n"
+                    f"Host: {parts.netloc}\r\n"
+                    "Upgrade: websocket\r\n"
+                    "Connection: Upgrade\r\n"
+                    f"Sec-WebSocket-Key: {key.decode()}\r\n"
+                    "Sec-WebSocket-Version: 13\r\n\r\n"
+                ).encode()
+            )
+            ws = cls(sock, client=True)
+            status, headers = ws._read_http_head()
+            if not status.startswith("HTTP/1.1 101"):
+                raise ConnectionClosed(1002, f"handshake refused: {status}")
+            expected = base64.b64encode(hashlib.sha1(key + WS_GUID).digest()).decode()
+            if headers.get("sec-websocket-accept") != expected:
+                raise ConnectionClosed(1002, "bad Sec-WebSocket-Accept")
+            return ws
+        except BaseException:
+            sock.close()
+            raise
+
+    @classmethod
+    def accept(cls, sock):
+        """Server side: answer a client's upgrade request on an accepted socket."""
+        ws = cls(sock, client=False)
+        request, headers = ws._read_http_head()
+        key = headers.get("sec-websocket-key", "").encode()
+        accept = base64.b64encode(hashlib.sha1(key + WS_GUID).digest()).decode()
+        sock.sendall(
+            (
+                "HTTP/1.1 101 Switching Protocols\r\n"
+                "Upgrade: websocket\r\n"
+                "Connection: Upgrade\r\n"
+                f"Sec-WebSocket-Accept: {accept}\r\n\r\n"
+            ).encode()
+        )
+        return ws, request
+
+    def _read_http_head(self):
+        while b"\r\n\r\n" not in self._buffer:
+            if len(self._buffer) > 65536:
+                raise ConnectionClosed(1002, "oversized handshake")
+            self._fill()
+        end = self._buffer.index(b"\r\n\r\n")
+        head = self._buffer[:end].decode("latin-1").split("\r\n")
+        del self._buffer[: end + 4]
+        headers = {}
+        for line in head[1:]:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        return head[0], headers
+
+    def _fill(self):
+        data = self.sock.recv(65536)
+        if not data:
+            self.closed = True
+            raise ConnectionClosed(1006, "connection lost")
+        self._buffer += data
+
+    def _take_frame(self):
+        """(fin, opcode, payload) if a whole frame is buffered, else None"""
+        buf = self._buffer
+        if len(buf) < 2:
+            return None
+        fin, opcode = buf[0] & 0x80, buf[0] & 0x0F
+        masked, length = buf[1] & 0x80, buf[1] & 0x7F
+        offset = 2
+        if length == 126:
+            if len(buf) < 4:
+                return None
+            (length,) = struct.unpack_from("!H", buf, 2)
+            offset = 4
+        elif length == 127:
+            if len(buf) < 10:
+                return None
+            (length,) = struct.unpack_from("!Q", buf, 2)
+            offset = 10
+        if length > MAX_FRAME:
+            raise ConnectionClosed(1009, "frame too large")
+        mask = b""
+        if masked:
+            mask = bytes(buf[offset : offset + 4])
+            offset += 4
+        if len(buf) < offset + length:
+            return None
+        payload = bytes(buf[offset : offset + length])
+        del buf[: offset + length]
+        if masked:
+            payload = _apply_mask(payload, mask)
+        return fin, opcode, payload
+
+    def _send_frame(self, opcode, payload):
+        header = bytearray([0x80 | opcode])
+        mask_bit = 0x80 if self.client else 0
+        length = len(payload)
+        if length < 126:
+            header.append(mask_bit | length)
+        elif length < 1 << 16:
+            header.append(mask_bit | 126)
+            header += struct.pack("!H", length)
+        else:
+            header.append(mask_bit | 127)
+            header += struct.pack("!Q", length)
+        if self.client:
+            mask = os.urandom(4)
+            header += mask
+            payload = _apply_mask(payload, mask)
+        self.sock.sendall(bytes(header) + payload)
+
+    def send(self, text):
+        self._send_frame(0x1, text.encode("utf-8"))
+
+    def recv(self, timeout=None):
+        """Next text message; raises TimeoutError if none within timeout.
+
+        A timeout never loses data - partial frames stay buffered.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            frame = self._take_frame()
+            if frame is None:
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError
+                    self.sock.settimeout(remaining)
+                else:
+                    self.sock.settimeout(None)
+                try:
+                    self._fill()
+                except socket.timeout:
+                    raise TimeoutError from None
+                continue
+
+            fin, opcode, payload = frame
+            if opcode == 0x8:  # Close
+                code = (
+                    struct.unpack("!H", payload[:2])[0] if len(payload) >= 2 else 1005
+                )
+                reason = payload[2:].decode("utf-8", "replace")
+                if not self.closed:
+                    self.close(code)
+                raise ConnectionClosed(code, reason)
+            if opcode == 0x9:  # Ping
+                self._send_frame(0xA, payload)
+                continue
+            if opcode == 0xA:  # Pong
+                continue
+            self._message.append(payload)
+            if fin:
+                message = b"".join(self._message)
+                self._message = []
+                return message.decode("utf-8")
+
+    def close(self, code=1000):
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            self._send_frame(0x8, struct.pack("!H", code))
+        except OSError:
+            pass
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+
+def _apply_mask(payload, mask):
+    # int XOR over the whole payload is much faster than a per-byte loop
+    repeated = (mask * (len(payload) // 4 + 1))[: len(payload)]
+    return (int.from_bytes(payload, "big") ^ int.from_bytes(repeated, "big")).to_bytes(
+        len(payload), "big"
+    )
+
+
+class GatewaySession:
+    """One Discord Gateway session, kept alive across reconnects."""
+
+    def __init__(
+        self,
+        token,
+        intents=INTENTS,
+        on_dispatch=None,
+        url=None,
+        on_heartbeat=None,
+        logger=None,
+    ):
+        self.token = token
+        self.intents = intents
+        self.on_dispatch = on_dispatch or (lambda event, data: None)
+        self.on_heartbeat = on_heartbeat or (lambda: None)
+        self.url = url or DEFAULT_GATEWAY_URL
+        self.logger = logger
+        self.session_id = None
+        self.resume_url = None
+        self.sequence = None
+        self.ws = None
+
+    def _log(self, level, message, *args):
+        if self.logger:
+            getattr(self.logger, level)(message, *args)
+
+    def _send(self, op, data):
+        self.ws.send(json.dumps({"op": op, "d": data}))
+
+    def _identify(self):
+        self._send(
+            IDENTIFY,
+            {
+                "token": self.token,
+                "intents": self.intents,
+                "properties": {"os": sys.platform, "browser": "clap", "device": "clap"},
+            },
+        )
+
+    def _resume(self):
+        self._send(
+            RESUME,
+            {
+                "token": self.token,
+                "session_id": self.session_id,
+                "seq": self.sequence,
+            },
+        )
+
+    def _forget_session(self):
+        self.session_id = self.resume_url = self.sequence = None
+
+    def run_once(self):
+        """Connect, identify or resume, and pump events until disconnected.
+
+        Returns True if the next connection should try to resume.
+        """
+        base = self.resume_url if self.session_id and self.resume_url else self.url
+        url = base.rstrip("/") + "/?" + GATEWAY_QUERY
+        self.ws = WebSocket.connect(url)
+        try:
+            hello = json.loads(self.ws.recv(timeout=30))
+            if hello.get("op") != HELLO:
+                raise ConnectionClosed(
+                    4000, f"expected HELLO, got op {hello.get('op')}"
+                )
+            interval = hello["d"]["heartbeat_interval"] / 1000
+            # First beat is jittered so many clients don't beat in lockstep
+            next_beat = time.monotonic() + interval * random.random()
+            acked = True
+
+            if self.session_id:
+                self._log("info", "Resuming gateway session %s", self.session_id)
+                self._resume()
+            else:
+                self._identify()
+
+            while True:
+                try:
+                    message = self.ws.recv(
+                        timeout=max(0.0, next_beat - time.monotonic())
+                    )
+                except TimeoutError:
+                    if not acked:
+                        # No ACK since the last beat: the connection is a zombie
+                        self._log(
+                            "warning",
+                            "Gateway heartbeat not acknowledged - reconnecting",
+                        )
+                        self.ws.close(4000)
+                        return True
+                    self._send(HEARTBEAT, self.sequence)
+                    acked = False
+                    next_beat = time.monotonic() + interval
+                    self.on_heartbeat()
+                    continue
+
+                payload = json.loads(message)
+                op = payload.get("op")
+                if payload.get("s") is not None:
+                    self.sequence = payload["s"]
+
+                if op == DISPATCH:
+                    event, data = payload.get("t"), payload.get("d")
+                    if event == "READY":
+                        self.session_id = data.get("session_id")
+                        self.resume_url = data.get("resume_gateway_url")
+                    try:
+                        self.on_dispatch(event, data)
+                    except Exception as e:
+                        # A bad event must not take the connection down with it
+                        self._log("error", "Error handling %s: %s", event, e)
+                elif op == HEARTBEAT_ACK:
+                    acked = True
+                elif op == HEARTBEAT:
+                    self._send(HEARTBEAT, self.sequence)
+                elif op == RECONNECT:
+                    self._log("info", "Gateway asked us to reconnect")
+                    self.ws.close(4000)
+                    return True
+                elif op == INVALID_SESSION:
+                    resumable = bool(payload.get("d"))
+                    self._log(
+                        "info", "Gateway session invalidated (resumable=%s)", resumable
+                    )
+                    if not resumable:
+                        self._forget_session()
+                    self.ws.close(4000)
+                    time.sleep(random.uniform(1, 5))
+                    return resumable
+        except ConnectionClosed as e:
+            if e.code in FATAL_CLOSE_CODES:
+                raise GatewayFatalError(
+                    f"Gateway closed the session: {e.code} {e.reason}"
+                )
+            if e.code in NO_RESUME_CLOSE_CODES:
+                self._forget_session()
+            raise
+        finally:
+            self.ws.close()
+
+    def run(self):
+        """Keep the session connected forever (until a fatal error)."""
+        failures = 0
+        while True:
+            started = time.monotonic()
+            try:
+                self.run_once()
+                failures = 0
+                continue
+            except GatewayFatalError:
+                raise
+            except (ConnectionClosed, OSError, TimeoutError, ValueError, KeyError) as e:
+                self._log("warning", "Gateway connection lost: %s", e)
+
+            # A connection that lasted a while resets the backoff
+            if time.monotonic() - started > RECONNECT_BACKOFF_MAX:
+                failures = 0
+            failures += 1
+            delay = min(RECONNECT_BACKOFF_MAX, 2**failures) * random.uniform(0.5, 1.0)
+            self._log("info", "Reconnecting to gateway in %.1fs", delay)
+            self.on_heartbeat()
+            time.sleep(delay)
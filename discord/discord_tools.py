@@ -14,14 +14,20 @@ import mimetypes
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, List, Dict, Tuple
-from PIL import Image
 
 # Add the utils directory to Python path
 utils_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'utils')
 sys.path.insert(0, utils_dir)
 from infrastructure_config_reader import get_config_value
+from lazy_import import lazy_import
 
-DISCORD_API_BASE = "https://discord.com/api/v10"
+try:
+    from discord_transport import DISCORD_API_BASE, get_transport
+except ImportError:
+    from discord.discord_transport import DISCORD_API_BASE, get_transport
+
+# PIL is only needed for thumbnails in fetch_image - not worth importing at startup
+Image = lazy_import("PIL.Image")
 
 class DiscordTools:
     """Unified Discord tools with enhanced image handling"""
@@ -31,6 +37,9 @@ class DiscordTools:
         if not self.token:
             raise ValueError("No Discord token found in infrastructure config")
         
+        # Shared pooled, rate-limit-aware HTTP transport
+        self.transport = get_transport()
+
         # Set up image storage directory
         self.home_dir = Path.home()
         self.username = os.getlogin()
@@ -81,7 +90,7 @@ class DiscordTools:
         url = f"{DISCORD_API_BASE}/channels/{channel_id}/messages"
         data = {"content": content}
         
-        response = requests.post(url, headers=self.headers, json=data)
+        response = self.transport.request("POST", url, headers=self.headers, json=data)
         
         if response.status_code == 200:
             return {"success": True, "data": response.json()}
@@ -94,7 +103,7 @@ class DiscordTools:
         url = f"{DISCORD_API_BASE}/channels/{channel_id}/messages/{message_id}"
         data = {"content": content}
         
-        response = requests.patch(url, headers=self.headers, json=data)
+        response = self.transport.request("PATCH", url, headers=self.headers, json=data)
         
         if response.status_code == 200:
             return {"success": True, "data": response.json()}
@@ -106,7 +115,7 @@ class DiscordTools:
         channel_id = self.resolve_channel(channel)
         url = f"{DISCORD_API_BASE}/channels/{channel_id}/messages/{message_id}"
         
-        response = requests.delete(url, headers=self.headers)
+        response = self.transport.request("DELETE", url, headers=self.headers)
         
         if response.status_code == 204:
             return {"success": True}
@@ -119,7 +128,7 @@ class DiscordTools:
         encoded_emoji = requests.utils.quote(emoji)
         url = f"{DISCORD_API_BASE}/channels/{channel_id}/messages/{message_id}/reactions/{encoded_emoji}/@me"
         
-        response = requests.put(url, headers={"Authorization": f"Bot {self.token}"})
+        response = self.transport.request("PUT", url, headers={"Authorization": f"Bot {self.token}"})
         
         if response.status_code == 204:
             return {"success": True}
@@ -163,68 +172,82 @@ class DiscordTools:
         url = f"{DISCORD_API_BASE}/channels/{channel_id}/messages"
         data = {"content": alert_message}
 
-        response = requests.post(url, headers=self.headers, json=data)
+        response = self.transport.request("POST", url, headers=self.headers, json=data)
 
         if response.status_code == 200:
             return {"success": True, "data": response.json()}
         else:
             return {"success": False, "error": self._format_error(response)}
 
-    def read_messages(self, channel: str, limit: int = 25) -> Dict:
+    def read_messages(self, channel: str, limit: int = 25, after: Optional[str] = None) -> Dict:
         """
         Read messages from a channel with automatic image handling
         Downloads images and adds placeholders to message content
+
+        With after=<message id>, returns (up to limit of) the messages
+        immediately following it instead of the latest ones
         """
         channel_id = self.resolve_channel(channel)
         channel_name = self.channel_map.get(channel_id, channel)
         
         url = f"{DISCORD_API_BASE}/channels/{channel_id}/messages"
         params = {"limit": limit}
+        if after:
+            params["after"] = after
         
-        response = requests.get(url, headers=self.headers, params=params)
+        response = self.transport.request("GET", url, headers=self.headers, params=params)
         
         if response.status_code != 200:
             return {"success": False, "error": self._format_error(response)}
         
-        messages = response.json()
-        processed_messages = []
-        
-        for msg in reversed(messages):  # Process in chronological order
-            processed_msg = {
-                "id": msg["id"],
-                "author": msg["author"]["username"],
-                "timestamp": msg["timestamp"],
-                "content": msg["content"]
-            }
-            
-            # Handle attachments
-            if msg.get("attachments"):
-                image_placeholders = []
-                for i, attachment in enumerate(msg["attachments"]):
-                    if self._is_image(attachment.get("content_type", "")):
-                        # Download image
-                        image_path = self._download_image(
-                            attachment["url"],
-                            attachment["filename"],
-                            channel_name,
-                            msg["timestamp"],
-                            i
-                        )
-                        if image_path:
-                            placeholder = f"<image: {image_path.name}>"
-                            image_placeholders.append(placeholder)
-                
-                # Add placeholders to content
-                if image_placeholders:
-                    if processed_msg["content"]:
-                        processed_msg["content"] += " " + " ".join(image_placeholders)
-                    else:
-                        processed_msg["content"] = " ".join(image_placeholders)
-            
-            processed_messages.append(processed_msg)
+        # Process in chronological order (snowflake IDs sort by time)
+        messages = sorted(response.json(), key=lambda msg: int(msg["id"]))
+        processed_messages = [
+            self.process_message(msg, channel_name)
+            for msg in messages
+        ]
         
         return {"success": True, "messages": processed_messages}
     
+    def process_message(self, msg: Dict, channel_name: str) -> Dict:
+        """
+        Turn a raw Discord message (REST or Gateway) into ClAP's message dict,
+        downloading images and adding placeholders to the content
+        """
+        processed_msg = {
+            "id": msg["id"],
+            "author": msg["author"]["username"],
+            "author_id": msg["author"].get("id"),
+            "timestamp": msg["timestamp"],
+            "content": msg["content"]
+        }
+
+        # Handle attachments
+        if msg.get("attachments"):
+            image_placeholders = []
+            for i, attachment in enumerate(msg["attachments"]):
+                if self._is_image(attachment.get("content_type", "")):
+                    # Download image
+                    image_path = self._download_image(
+                        attachment["url"],
+                        attachment["filename"],
+                        channel_name,
+                        msg["timestamp"],
+                        i
+                    )
+                    if image_path:
+                        placeholder = f"<image: {image_path.name}>"
+                        image_placeholders.append(placeholder)
+
+            # Add placeholders to content
+            if image_placeholders:
+                if processed_msg["content"]:
+                    processed_msg["content"] += " " + " ".join(image_placeholders)
+                else:
+                    processed_msg["content"] = " ".join(image_placeholders)
+
+        return processed_msg
+
     def send_image(self, channel: str, image_path: str, message: str = "") -> Dict:
         """Send an image to a Discord channel with optional message"""
         channel_id = self.resolve_channel(channel)
@@ -251,7 +274,7 @@ class DiscordTools:
         headers = {"Authorization": f"Bot {self.token}"}
         
         try:
-            response = requests.post(url, headers=headers, data=data, files=files)
+            response = self.transport.request("POST", url, headers=headers, data=data, files=files)
             files['file'][1].close()  # Close the file
             
             if response.status_code == 200:
@@ -298,7 +321,7 @@ class DiscordTools:
 
             # Download image if not exists
             if not save_path.exists():
-                response = requests.get(url, stream=True)
+                response = self.transport.request("GET", url, stream=True)
                 if response.status_code == 200:
                     with open(save_path, 'wb') as f:
                         for chunk in response.iter_content(chunk_size=8192):
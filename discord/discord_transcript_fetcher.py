@@ -14,17 +14,33 @@ This service:
    - future consumers
 
 Architecture:
-- Uses separate state file (discord_channels.json) to avoid conflicts
+- Sole owner of Discord polling: it publishes each channel's head
+  (last_message_id) in discord_channels.json, and the autonomous timer
+  only reads those heads. discord_fetcher_status.json shows it's alive.
 - Reuses proven ChannelState class pattern
 - Leverages discord_utils.py singleton DiscordClient
 - Modular design for easy testing and evolution
+
+Modes (DISCORD_GATEWAY in claude_infrastructure_config.txt):
+- polling (default): REST GET /messages per channel, each on its own
+  interval (poll_schedule.py): fast while a channel is active, backing
+  off while it's quiet, fast again when a message arrives or the human
+  becomes active (user_presence.json, written by the autonomous timer)
+- gateway: MESSAGE_CREATE/UPDATE/DELETE pushed over the Discord Gateway
+  (discord_gateway.py) as they happen, with a REST catch-up whenever a
+  fresh session starts. Edits and deletes are appended to the transcript
+  as entries with an "event" field. Falls back to polling if Discord
+  refuses the session (e.g. Message Content intent not enabled).
+  DISCORD_GATEWAY_URL points it elsewhere - e.g. discord/fake_gateway.py.
 """
 
 import json
 import os
+import queue
 import re
 import subprocess
 import sys
+import threading
 import time
 from pathlib import Path
 from datetime import datetime
@@ -34,7 +50,10 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from discord.channel_state import ChannelState
 from discord.discord_tools import DiscordTools
-from utils.infrastructure_config_reader import get_config_value
+from discord.discord_gateway import GatewayFatalError, GatewaySession, INTENTS
+from discord.poll_schedule import POLL_MAX, POLL_MIN, PollSchedule
+from utils.config_service import json_file
+from utils.infrastructure_config_reader import get_config_bool, get_config_int, get_config_value
 from utils.clap_logger import get_logger
 from utils.systemd_notify import notify_ready, notify_watchdog
 
@@ -46,14 +65,25 @@ DATA_DIR = CLAP_ROOT / "data"
 TRANSCRIPT_DIR = DATA_DIR / "transcripts"
 ATTACHMENTS_DIR = DATA_DIR / "transcript_attachments"
 MAMA_HEN_NUDGE_STATE = DATA_DIR / "mama_hen_nudge_received.json"
+STATUS_FILE = DATA_DIR / "discord_fetcher_status.json"
+PRESENCE_FILE = DATA_DIR / "user_presence.json"  # Written by the autonomous timer
 MAMA_HEN_NUDGE_COOLDOWN = 600  # 10 minutes - ignore duplicate nudges within this window
 
 # Ensure directories exist
 TRANSCRIPT_DIR.mkdir(exist_ok=True)
 ATTACHMENTS_DIR.mkdir(exist_ok=True)
 
-# Check interval (seconds)
-CHECK_INTERVAL = 30
+# Polling loop tick (seconds): how quickly presence changes are noticed and
+# the longest the watchdog goes unfed. Channels are polled on their own
+# intervals (DISCORD_POLL_MIN..DISCORD_POLL_MAX).
+CHECK_INTERVAL = 10
+
+DISCORD_EPOCH_MS = 1420070400000
+
+# REST paging: Discord returns at most 100 messages per request
+PAGE_SIZE = 100
+INITIAL_HISTORY = 25  # Messages to start a new channel's transcript with
+BACKFILL_LIMIT = 1000  # Max messages per channel per poll (DISCORD_BACKFILL_LIMIT)
 
 
 class TranscriptFetcher:
@@ -80,6 +110,16 @@ class TranscriptFetcher:
         else:
             logger.info("Tracking %d channels from state", len(self.channels_to_track))
 
+        # Gateway events carry channel IDs; map them back to tracked names
+        self.channel_names = {}
+
+        # Polling mode: when each channel is next due
+        self.schedule = PollSchedule(
+            get_config_int('DISCORD_POLL_MIN', POLL_MIN),
+            get_config_int('DISCORD_POLL_MAX', POLL_MAX),
+        )
+        self.user_active = None
+
     def initialize_channels(self):
         """Initialize tracked channels if not already in state"""
         for channel_name in self.channels_to_track:
@@ -90,6 +130,12 @@ class TranscriptFetcher:
                     self.channel_state.add_channel(channel_id, channel_name)
                     logger.info("Added channel to tracking: %s (%s)", channel_name, channel_id)
 
+        self.channel_names = {
+            str(channel['id']): name
+            for name, channel in self.channel_state.state.get('channels', {}).items()
+            if name in self.channels_to_track and channel.get('id')
+        }
+
     def _get_channel_id(self, channel_name):
         """Get Discord channel ID from name"""
         try:
@@ -101,35 +147,49 @@ class TranscriptFetcher:
             return None
 
     def fetch_new_messages(self, channel_name):
-        """Fetch new messages for a channel since last processed by fetcher"""
+        """Fetch new messages for a channel since last processed by fetcher
+
+        Pages forward from the cursor with after=<last_message_id>, so only
+        unseen messages are downloaded and nothing is skipped however many
+        arrived since the last poll. At most BACKFILL_LIMIT are fetched per
+        call; the rest follow on the next poll.
+        """
         channel = self.channel_state.get_channel(channel_name)
         if not channel:
             return []
 
         # Use last_message_id (what fetcher last processed) NOT last_read_message_id (what user read)
         # This prevents re-fetching messages that are already in the transcript
-        last_fetched = channel.get('last_message_id')
+        cursor = channel.get('last_message_id')
+        backfill_limit = get_config_int('DISCORD_BACKFILL_LIMIT', BACKFILL_LIMIT)
 
         try:
-            # Use discord_tools read_messages which returns formatted messages
-            limit = 100 if last_fetched else 25
-            result = self.discord.read_messages(channel_name, limit=limit)
-
-            if not result.get('success'):
-                logger.warning("Failed to read channel %s: %s", channel_name, result.get('error'))
-                return []
-
-            messages = result.get('messages', [])
-
-            # Filter to only new messages (after last_fetched by this fetcher)
-            if last_fetched:
-                new_messages = []
-                for msg in messages:
-                    if int(msg.get('id', 0)) > int(last_fetched):
-                        new_messages.append(msg)
-                return new_messages
+            if not cursor:
+                # New channel: start the transcript from the recent history
+                result = self.discord.read_messages(channel_name, limit=INITIAL_HISTORY)
+                if not result.get('success'):
+                    logger.warning("Failed to read channel %s: %s", channel_name, result.get('error'))
+                    return []
+                return result.get('messages', [])
+
+            new_messages = []
+            while len(new_messages) < backfill_limit:
+                page_size = min(PAGE_SIZE, backfill_limit - len(new_messages))
+                result = self.discord.read_messages(channel_name, limit=page_size, after=cursor)
+                if not result.get('success'):
+                    logger.warning("Failed to read channel %s: %s", channel_name, result.get('error'))
+                    break
+
+                page = [msg for msg in result.get('messages', []) if int(msg['id']) > int(cursor)]
+                new_messages.extend(page)
+                if len(page) < page_size:
+                    break  # Caught up
+                cursor = page[-1]['id']
+            else:
+                logger.info("Backfill limit (%d) reached for #%s - continuing next poll",
+                            backfill_limit, channel_name)
 
-            return messages
+            return new_messages
 
         except Exception as e:
             logger.error("Error fetching messages for %s: %s", channel_name, e)
@@ -214,8 +274,10 @@ class TranscriptFetcher:
         # If the latest message is from me, mark as read automatically
         # (I don't need notifications about my own messages!)
         bot_display_name = get_config_value('DISCORD_BOT_DISPLAY_NAME')
+        my_user_id = get_config_value('CLAUDE_DISCORD_USER_ID')
 
-        if bot_display_name and author_name == bot_display_name:
+        if (bot_display_name and author_name == bot_display_name) or \
+                (my_user_id and latest_message.get('author_id') == my_user_id):
             self.channel_state.mark_channel_read(channel_name, latest_id)
 
     def check_collaborative_triggers(self, messages):
@@ -340,49 +402,219 @@ class TranscriptFetcher:
                 # Only process first matching alert
                 return
 
+    def process_messages(self, channel_name, messages):
+        """Transcribe new messages, update state and run the message triggers"""
+        if not messages:
+            return
+
+        # Append to transcript
+        self.append_to_transcript(channel_name, messages)
+
+        # Update state
+        self.update_channel_state(channel_name, messages)
+
+        # Check for collaborative mode triggers (spark/rest)
+        self.check_collaborative_triggers(messages)
+
+        # Check for Mama-hen alerts in #system-messages
+        if channel_name == 'system-messages':
+            self.check_mama_hen_alert(messages)
+
+        logger.info("Processed %d new messages in #%s", len(messages), channel_name)
+
     def process_channel(self, channel_name):
         """Process a single channel: fetch, transcribe, update state"""
         try:
-            # Fetch new messages
-            messages = self.fetch_new_messages(channel_name)
+            self.process_messages(channel_name, self.fetch_new_messages(channel_name))
+        except Exception as e:
+            logger.error("Error processing channel %s: %s", channel_name, e)
+
+    def sweep(self, channels=None):
+        """Fetch channels (default: all tracked) concurrently, then transcribe them in order
 
+        Returns the names of the channels that had new messages.
+        """
+        channels = self.channels_to_track if channels is None else channels
+        fetched = self.discord.transport.map(self.fetch_new_messages, channels)
+        active = set()
+        for channel_name, messages in zip(channels, fetched):
             if messages:
-                # Append to transcript
-                self.append_to_transcript(channel_name, messages)
+                active.add(channel_name)
+            try:
+                self.process_messages(channel_name, messages)
+            except Exception as e:
+                logger.error("Error processing channel %s: %s", channel_name, e)
+        return active
+
+    def catch_up(self):
+        """REST fetch of every tracked channel (gateway mode, after a fresh session)"""
+        self.sweep()
+
+    def append_event(self, channel_name, entry):
+        """Append an edit/delete entry to the channel transcript"""
+        transcript_file = TRANSCRIPT_DIR / f"{channel_name}.jsonl"
+        with open(transcript_file, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
 
-                # Update state
-                self.update_channel_state(channel_name, messages)
+    def handle_gateway_event(self, event, data):
+        """Process one gateway event (on the event worker thread)"""
+        if event == "READY":
+            logger.info("Gateway session ready - catching up via REST")
+            self.catch_up()
+            return
+        if event == "RESUMED":
+            logger.info("Gateway session resumed")
+            return
+        if event not in ("MESSAGE_CREATE", "MESSAGE_UPDATE", "MESSAGE_DELETE"):
+            return
 
-                # Check for collaborative mode triggers (spark/rest)
-                self.check_collaborative_triggers(messages)
+        channel_name = self.channel_names.get(str(data.get('channel_id')))
+        if not channel_name:
+            return  # Not a tracked channel
 
-                # Check for Mama-hen alerts in #system-messages
-                if channel_name == 'system-messages':
-                    self.check_mama_hen_alert(messages)
+        if event == "MESSAGE_CREATE":
+            # Skip anything the REST catch-up (or a replay) already transcribed
+            last_fetched = (self.channel_state.get_channel(channel_name) or {}).get('last_message_id')
+            if last_fetched and int(data['id']) <= int(last_fetched):
+                return
+            message = self.discord.process_message(data, channel_name)
+            self.process_messages(channel_name, [message])
 
-                logger.info("Processed %d new messages in #%s", len(messages), channel_name)
+        elif event == "MESSAGE_UPDATE":
+            # Embed-only updates (link previews) carry no content change
+            if 'content' not in data or not data.get('edited_timestamp'):
+                return
+            self.append_event(channel_name, {
+                "id": data['id'],
+                "timestamp": data['edited_timestamp'],
+                "author": data.get('author', {}).get('username', 'Unknown'),
+                "content": data['content'],
+                "channel": channel_name,
+                "event": "edit",
+            })
+            logger.info("Recorded edit of %s in #%s", data['id'], channel_name)
 
-        except Exception as e:
-            logger.error("Error processing channel %s: %s", channel_name, e)
+        else:
+            self.append_event(channel_name, {
+                "id": data['id'],
+                "timestamp": datetime.now().isoformat(),
+                "author": "",
+                "content": "",
+                "channel": channel_name,
+                "event": "delete",
+            })
+            logger.info("Recorded deletion of %s in #%s", data['id'], channel_name)
+
+    def schedule_channels(self):
+        """Start every tracked channel's polling clock, quiet ones already idle"""
+        now = time.time()
+        for channel_name in self.channels_to_track:
+            last_id = (self.channel_state.get_channel(channel_name) or {}).get('last_message_id')
+            idle_for = 0
+            if last_id:
+                # A snowflake's top bits are its creation time
+                sent_at = ((int(last_id) >> 22) + DISCORD_EPOCH_MS) / 1000
+                idle_for = max(0, now - sent_at)
+            self.schedule.add(channel_name, idle_for)
+
+    def check_presence(self):
+        """Snap every channel back to fast polling when the human becomes active"""
+        active = bool(json_file(PRESENCE_FILE).get('active'))
+        if active and self.user_active is False:
+            logger.info("Human is active - polling every channel every %ds",
+                        self.schedule.min_interval)
+            self.schedule.wake()
+        self.user_active = active
+
+    def poll_due_channels(self):
+        """Sweep the channels that are due and reschedule them by what they found"""
+        due = self.schedule.due()
+        if not due:
+            return
+        active = self.sweep(due)
+        for channel_name in due:
+            self.schedule.record(channel_name, channel_name in active)
+        logger.debug("Polled %s | intervals: %s", ", ".join(due), self.schedule.intervals())
+
+    def heartbeat(self, mode):
+        """Ping the systemd watchdog and tell the timer the channel heads are live"""
+        notify_watchdog()
+        status = {
+            "pid": os.getpid(),
+            "mode": mode,
+            "alive_at": time.time(),
+            "channels": len(self.channels_to_track),
+        }
+        if mode == "polling":
+            status["intervals"] = self.schedule.intervals()
+        tmp = STATUS_FILE.with_suffix(".tmp")
+        try:
+            with open(tmp, 'w') as f:
+                json.dump(status, f)
+            os.replace(tmp, STATUS_FILE)
+        except OSError as e:
+            logger.warning("Error writing fetcher status: %s", e)
+
+    def _gateway_worker(self, events):
+        while True:
+            event, data = events.get()
+            try:
+                self.handle_gateway_event(event, data)
+            except Exception as e:
+                logger.error("Error handling gateway %s: %s", event, e)
+
+    def run_gateway(self):
+        """Gateway mode: events as they happen. Returns if Discord refuses the session."""
+        # The gateway thread only queues events, so REST catch-ups, image
+        # downloads and nudges never delay heartbeats. One worker keeps
+        # them in order: events after a READY wait for its catch-up.
+        events = queue.Queue()
+        threading.Thread(target=self._gateway_worker, args=(events,), daemon=True).start()
+        session = GatewaySession(
+            self.discord.token,
+            INTENTS,
+            on_dispatch=lambda event, data: events.put((event, data)),
+            url=get_config_value('DISCORD_GATEWAY_URL') or None,
+            on_heartbeat=lambda: self.heartbeat("gateway"),
+            logger=logger,
+        )
+        try:
+            session.run()
+        except GatewayFatalError as e:
+            logger.error("%s - falling back to polling", e)
 
     def run(self):
         """Main loop: monitor channels and build transcripts"""
         logger.info("Starting Discord Transcript Fetcher")
         logger.info("Tracking channels: %s", ", ".join(self.channels_to_track))
-        logger.info("Check interval: %ds | Transcripts: %s", CHECK_INTERVAL, TRANSCRIPT_DIR)
 
         # Initialize channels
         self.initialize_channels()
         notify_ready()
 
+        if get_config_bool('DISCORD_GATEWAY'):
+            logger.info("Gateway mode | Transcripts: %s", TRANSCRIPT_DIR)
+            self.heartbeat("gateway")
+            try:
+                self.run_gateway()
+            except KeyboardInterrupt:
+                logger.info("Stopping transcript fetcher")
+                return
+
+        logger.info("Poll interval: %d-%ds per channel | Transcripts: %s",
+                    self.schedule.min_interval, self.schedule.max_interval, TRANSCRIPT_DIR)
+        self.schedule_channels()
+
         # Main monitoring loop
         while True:
             try:
-                for channel_name in self.channels_to_track:
-                    self.process_channel(channel_name)
+                self.check_presence()
+                self.poll_due_channels()
 
-                notify_watchdog()
-                time.sleep(CHECK_INTERVAL)
+                self.heartbeat("polling")
+                time.sleep(max(1, min(CHECK_INTERVAL, self.schedule.seconds_until_next())))
 
             except KeyboardInterrupt:
                 logger.info("Stopping transcript fetcher")
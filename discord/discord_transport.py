@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Shared Discord REST transport for ClAP.
+
+DiscordTools and DiscordClient used to call requests.get/post/... directly:
+a new TCP+TLS handshake per call, no timeouts, Discord's rate-limit
+headers ignored and a 429 simply returned as an error. Everything now
+goes through one DiscordTransport per process:
+
+- one keep-alive requests.Session (connection pool sized for the executor)
+- per-route rate-limit buckets learned from X-RateLimit-Bucket /
+  -Remaining / -Reset-After, keyed by the route's major parameter
+  (channel, guild or webhook), so a request waits for its bucket to
+  refill instead of being rejected
+- 429: wait retry_after (globally if the limit is global) and retry
+- 5xx and connection errors: exponential backoff and retry, except for
+  POST, which might already have been applied (e.g. a sent message)
+- map(): a bounded thread pool for multi-channel sweeps
+
+Responses are plain requests.Response objects, so callers keep their
+status-code handling.
+
+Usage:
+    from discord_transport import get_transport
+    transport = get_transport()
+    response = transport.request("GET", f"/channels/{channel_id}/messages",
+                                 headers=headers, params={"limit": 50})
+    results = transport.map(fetch_channel, channel_names)
+"""
+
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DISCORD_API_BASE = "https://discord.com/api/v10"
+
+MAX_WORKERS = 4  # Concurrent requests in map(); Discord allows ~50/s globally
+TIMEOUT = (5, 30)  # Connect, read (seconds)
+MAX_RETRIES = 4
+BACKOFF_BASE = 1.0  # Seconds; doubles per 5xx/connection retry
+RETRY_STATUSES = {500, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "PUT", "PATCH", "DELETE"}
+
+# IDs in a path that Discord treats as the route's "major parameter"
+MAJOR_PARAMETER = re.compile(r"^/(channels|guilds|webhooks)/(\d+)")
+SNOWFLAKE = re.compile(r"/\d{15,}")
+
+
+class _Bucket:
+    """One rate-limit bucket: how many requests are left until when"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.remaining = None  # Unknown until the first response
+        self.reset_at = 0.0
+
+    def acquire(self):
+        # Waiters queue on the lock, so they go out one at a time as it refills
+        with self.lock:
+            if self.remaining is not None and self.remaining <= 0:
+                delay = self.reset_at - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                self.remaining = None
+            if self.remaining is not None:
+                self.remaining -= 1
+
+    def update(self, headers):
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset_after = headers.get("X-RateLimit-Reset-After")
+        if remaining is None or reset_after is None:
+            return
+        with self.lock:
+            self.remaining = int(remaining)
+            self.reset_at = time.monotonic() + float(reset_after)
+
+
+class DiscordTransport:
+    """Pooled, rate-limit-aware Discord REST client (thread-safe)"""
+
+    def __init__(self, max_workers=MAX_WORKERS):
+        self.max_workers = max_workers
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_workers * 2)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._lock = threading.Lock()
+        self._route_buckets = {}  # "METHOD /route" -> Discord bucket hash
+        self._buckets = {}  # (bucket hash or route, major parameter) -> _Bucket
+        self._global_until = 0.0
+        self._executor = None
+
+    def _bucket_for(self, method, path):
+        major = MAJOR_PARAMETER.match(path)
+        route = f"{method} {SNOWFLAKE.sub('/{id}', path)}"
+        key_major = major.group(2) if major else ""
+        with self._lock:
+            bucket_id = self._route_buckets.get(route, route)
+            key = (bucket_id, key_major)
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = _Bucket()
+        return route, key_major, bucket
+
+    def _learn_bucket(self, route, major, bucket, headers):
+        """Share state between routes Discord says are the same bucket"""
+        bucket_hash = headers.get("X-RateLimit-Bucket")
+        if bucket_hash:
+            with self._lock:
+                self._route_buckets[route] = bucket_hash
+                bucket = self._buckets.setdefault((bucket_hash, major), bucket)
+        bucket.update(headers)
+
+    def request(self, method, url, **kwargs):
+        """Send a request, waiting out rate limits; returns the final Response"""
+        method = method.upper()
+        if url.startswith("/"):
+            url = DISCORD_API_BASE + url
+        path = (
+            url[len(DISCORD_API_BASE) :] if url.startswith(DISCORD_API_BASE) else None
+        )
+        kwargs.setdefault("timeout", TIMEOUT)
+
+        attempt = 0
+        while True:
+            bucket = None
+            if path is not None:
+                route, major, bucket = self._bucket_for(method, path.split("?")[0])
+                bucket.acquire()
+            wait = self._global_until - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            if attempt:
+                _rewind_files(kwargs.get("files"))
+
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                # A POST that failed mid-flight may have gone through; only
+                # retry it if it never connected
+                safe = method in IDEMPOTENT_METHODS or isinstance(
+                    e, requests.ConnectTimeout
+                )
+                if attempt >= MAX_RETRIES or not safe:
+                    raise
+                attempt += 1
+                time.sleep(BACKOFF_BASE * 2 ** (attempt - 1))
+                continue
+
+            if bucket is not None:
+                self._learn_bucket(route, major, bucket, response.headers)
+
+            if response.status_code == 429 and attempt < MAX_RETRIES:
+                attempt += 1
+                retry_after = _retry_after(response)
+                if (
+                    response.headers.get("X-RateLimit-Global")
+                    or response.headers.get("X-RateLimit-Scope") == "global"
+                ):
+                    self._global_until = time.monotonic() + retry_after
+                else:
+                    time.sleep(retry_after)
+                continue
+
+            if (
+                response.status_code in RETRY_STATUSES
+                and attempt < MAX_RETRIES
+                and method in IDEMPOTENT_METHODS
+            ):
+                attempt += 1
+                time.sleep(BACKOFF_BASE * 2 ** (attempt - 1))
+                continue
+
+            return response
+
+    def map(self, fn, items):
+        """[fn(item) for item in items], run on the shared bounded pool"""
+        items = list(items)
+        if len(items) <= 1:
+            return [fn(item) for item in items]
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="discord"
+                )
+        return list(self._executor.map(fn, items))
+
+
+def _rewind_files(files):
+    """Retried uploads must send the file again from the start"""
+    for value in (files or {}).values():
+        handle = value[1] if isinstance(value, tuple) else value
+        if hasattr(handle, "seek"):
+            handle.seek(0)
+
+
+def _retry_after(response):
+    try:
+        return float(response.json().get("retry_after", 1))
+    except ValueError:
+        return float(response.headers.get("Retry-After", 1))
+
+
+_transport = None
+_transport_lock = threading.Lock()
+
+
+def get_transport():
+    """The process-wide DiscordTransport"""
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            _transport = DiscordTransport()
+        return _transport
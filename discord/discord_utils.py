@@ -15,7 +15,10 @@ utils_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file_
 sys.path.insert(0, utils_dir)
 from infrastructure_config_reader import get_config_value
 
-DISCORD_API_BASE = "https://discord.com/api/v10"
+try:
+    from discord_transport import DISCORD_API_BASE, get_transport
+except ImportError:
+    from discord.discord_transport import DISCORD_API_BASE, get_transport
 
 class DiscordClient:
     """Singleton Discord client for API operations"""
@@ -33,6 +36,8 @@ class DiscordClient:
         self._token = get_config_value('DISCORD_BOT_TOKEN')
         if not self._token:
             raise ValueError("No Discord token found in infrastructure config")
+        # Shared pooled, rate-limit-aware HTTP transport
+        self.transport = get_transport()
     
     @property
     def headers(self):
@@ -46,20 +51,20 @@ class DiscordClient:
         """Send a message to a Discord channel"""
         url = f"{DISCORD_API_BASE}/channels/{channel_id}/messages"
         data = {"content": content}
-        response = requests.post(url, headers=self.headers, json=data)
+        response = self.transport.request("POST", url, headers=self.headers, json=data)
         return response
     
     def edit_message(self, channel_id, message_id, content):
         """Edit an existing Discord message"""
         url = f"{DISCORD_API_BASE}/channels/{channel_id}/messages/{message_id}"
         data = {"content": content}
-        response = requests.patch(url, headers=self.headers, json=data)
+        response = self.transport.request("PATCH", url, headers=self.headers, json=data)
         return response
     
     def delete_message(self, channel_id, message_id):
         """Delete a Discord message"""
         url = f"{DISCORD_API_BASE}/channels/{channel_id}/messages/{message_id}"
-        response = requests.delete(url, headers=self.headers)
+        response = self.transport.request("DELETE", url, headers=self.headers)
         return response
     
     def add_reaction(self, channel_id, message_id, emoji):
@@ -67,20 +72,20 @@ class DiscordClient:
         # URL encode the emoji for the API
         encoded_emoji = requests.utils.quote(emoji)
         url = f"{DISCORD_API_BASE}/channels/{channel_id}/messages/{message_id}/reactions/{encoded_emoji}/@me"
-        response = requests.put(url, headers={"Authorization": f"Bot {self._token}"})
+        response = self.transport.request("PUT", url, headers={"Authorization": f"Bot {self._token}"})
         return response
     
     def get_messages(self, channel_id, limit=50):
         """Get messages from a Discord channel"""
         url = f"{DISCORD_API_BASE}/channels/{channel_id}/messages"
         params = {"limit": limit}
-        response = requests.get(url, headers=self.headers, params=params)
+        response = self.transport.request("GET", url, headers=self.headers, params=params)
         return response
     
     def get_user(self, user_id):
         """Get user information"""
         url = f"{DISCORD_API_BASE}/users/{user_id}"
-        response = requests.get(url, headers=self.headers)
+        response = self.transport.request("GET", url, headers=self.headers)
         return response
 
 def get_discord_client():
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Fake Discord Gateway for exercising the transcript fetcher's gateway mode.
+
+Speaks enough of the Gateway protocol for discord_gateway.GatewaySession:
+HELLO, IDENTIFY -> READY, RESUME (replaying missed events) -> RESUMED,
+heartbeat ACKs, plus the failure cases the fetcher must survive.
+Events are typed on stdin, one command per line:
+
+    create <channel_id> <author> <text>     MESSAGE_CREATE (new snowflake id)
+    edit <channel_id> <message_id> <text>   MESSAGE_UPDATE
+    delete <channel_id> <message_id>        MESSAGE_DELETE
+    reconnect                               op 7 RECONNECT (client resumes)
+    invalidate                              op 9 INVALID_SESSION, not resumable
+    drop                                    cut the TCP connection, no close frame
+    mute                                    stop ACKing heartbeats (zombie)
+    close <code>                            close with a Gateway close code
+    {"t": ..., "d": ...}                    any raw dispatch event
+
+Usage:
+    python3 discord/fake_gateway.py [--port 8765] [--heartbeat-ms 5000]
+
+    # then, in claude_infrastructure_config.txt:
+    DISCORD_GATEWAY=true
+    DISCORD_GATEWAY_URL=ws://127.0.0.1:8765
+"""
+
+import argparse
+import json
+import socket
+import sys
+import threading
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from discord_gateway import (
+    ConnectionClosed,
+    DISPATCH,
+    HEARTBEAT,
+    HEARTBEAT_ACK,
+    HELLO,
+    IDENTIFY,
+    INVALID_SESSION,
+    RECONNECT,
+    RESUME,
+    WebSocket,
+)
+
+DISCORD_EPOCH_MS = 1420070400000
+
+
+def snowflake():
+    time.sleep(0.001)  # One id per millisecond keeps them unique and ordered
+    return str((int(time.time() * 1000) - DISCORD_EPOCH_MS) << 22)
+
+
+class FakeGateway:
+    def __init__(self, port, heartbeat_ms):
+        self.url = f"ws://127.0.0.1:{port}"
+        self.port = port
+        self.heartbeat_ms = heartbeat_ms
+        self.lock = threading.Lock()
+        self.events = []  # [(seq, event, data)] - the session's history, for RESUME
+        self.session_id = None
+        self.clients = []
+        self.ack = True
+
+    def log(self, message):
+        print(f"[fake-gateway] {message}", file=sys.stderr, flush=True)
+
+    def send(self, ws, op, data=None, event=None, seq=None):
+        ws.send(json.dumps({"op": op, "d": data, "t": event, "s": seq}))
+
+    def dispatch(self, event, data):
+        with self.lock:
+            seq = len(self.events) + 1
+            self.events.append((seq, event, data))
+            clients = list(self.clients)
+        for ws in clients:
+            try:
+                self.send(ws, DISPATCH, data, event, seq)
+            except OSError:
+                pass
+        self.log(f"{event} seq={seq} -> {len(clients)} client(s)")
+
+    def serve_client(self, sock):
+        ws, request = WebSocket.accept(sock)
+        self.log(f"client connected: {request}")
+        self.send(ws, HELLO, {"heartbeat_interval": self.heartbeat_ms})
+        try:
+            while True:
+                payload = json.loads(ws.recv())
+                op, data = payload.get("op"), payload.get("d")
+                if op == HEARTBEAT:
+                    if self.ack:
+                        self.send(ws, HEARTBEAT_ACK)
+                elif op == IDENTIFY:
+                    with self.lock:
+                        self.session_id = uuid.uuid4().hex
+                        self.events = []
+                        self.clients.append(ws)
+                    self.log(f"IDENTIFY (intents={data.get('intents')})")
+                    self.dispatch(
+                        "READY",
+                        {
+                            "v": 10,
+                            "session_id": self.session_id,
+                            "resume_gateway_url": self.url,
+                            "user": {"id": "1", "username": "fake-bot"},
+                            "guilds": [],
+                        },
+                    )
+                elif op == RESUME:
+                    with self.lock:
+                        if data.get("session_id") != self.session_id:
+                            self.send(ws, INVALID_SESSION, False)
+                            continue
+                        missed = [
+                            e for e in self.events if e[0] > (data.get("seq") or 0)
+                        ]
+                        self.clients.append(ws)
+                    self.log(
+                        f"RESUME from seq {data.get('seq')}, replaying {len(missed)}"
+                    )
+                    for seq, event, event_data in missed:
+                        self.send(ws, DISPATCH, event_data, event, seq)
+                    self.dispatch("RESUMED", {})
+        except (ConnectionClosed, OSError, ValueError) as e:
+            self.log(f"client gone: {e}")
+        finally:
+            with self.lock:
+                if ws in self.clients:
+                    self.clients.remove(ws)
+            ws.close()
+
+    def command(self, line):
+        words = line.split(maxsplit=3)
+        if not words:
+            return
+        with self.lock:
+            clients = list(self.clients)
+        verb = words[0]
+        if line.startswith("{"):
+            payload = json.loads(line)
+            self.dispatch(payload["t"], payload.get("d") or {})
+        elif verb == "create" and len(words) == 4:
+            self.dispatch(
+                "MESSAGE_CREATE",
+                {
+                    "id": snowflake(),
+                    "channel_id": words[1],
+                    "author": {"id": "2", "username": words[2]},
+                    "content": words[3],
+                    "timestamp": time.strftime(
+                        "%Y-%m-%dT%H:%M:%S+00:00", time.gmtime()
+                    ),
+                    "attachments": [],
+                },
+            )
+        elif verb == "edit" and len(words) == 4:
+            self.dispatch(
+                "MESSAGE_UPDATE",
+                {
+                    "id": words[2],
+                    "channel_id": words[1],
+                    "content": words[3],
+                    "edited_timestamp": time.strftime(
+                        "%Y-%m-%dT%H:%M:%S+00:00", time.gmtime()
+                    ),
+                },
+            )
+        elif verb == "delete" and len(words) == 3:
+            self.dispatch("MESSAGE_DELETE", {"id": words[2], "channel_id": words[1]})
+        elif verb == "reconnect":
+            for ws in clients:
+                self.send(ws, RECONNECT)
+        elif verb == "invalidate":
+            for ws in clients:
+                self.send(ws, INVALID_SESSION, False)
+        elif verb == "drop":
+            for ws in clients:
+                ws.sock.shutdown(socket.SHUT_RDWR)
+        elif verb == "mute":
+            self.ack = False
+        elif verb == "unmute":
+            self.ack = True
+        elif verb == "close" and len(words) == 2:
+            for ws in clients:
+                ws.close(int(words[1]))
+        else:
+            self.log(f"unknown command: {line}")
+
+    def serve(self):
+        listener = socket.create_server(("127.0.0.1", self.port))
+        self.log(f"listening on {self.url}")
+        threading.Thread(target=self.read_commands, daemon=True).start()
+        while True:
+            sock, _ = listener.accept()
+            threading.Thread(
+                target=self.serve_client, args=(sock,), daemon=True
+            ).start()
+
+    def read_commands(self):
+        for line in sys.stdin:
+            try:
+                self.command(line.strip())
+            except Exception as e:
+                self.log(f"command failed: {e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Fake Discord Gateway for local testing"
+    )
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--heartbeat-ms", type=int, default=41250)
+    args = parser.parse_args()
+    try:
+        FakeGateway(args.port, args.heartbeat_ms).serve()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
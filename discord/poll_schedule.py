@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Per-channel poll intervals for the transcript fetcher's polling mode.
+
+Every channel used to be polled every 30s whether it was mid-conversation
+or hadn't seen a message in a month. Now each channel has its own interval:
+
+- a channel that had a message in the last ACTIVE_HOLD seconds is polled
+  every DISCORD_POLL_MIN seconds
+- after that, each empty poll multiplies its interval by BACKOFF, up to
+  DISCORD_POLL_MAX
+- a new message snaps the channel back to DISCORD_POLL_MIN, and the human
+  becoming active (the timer's user_presence.json) snaps back every channel
+
+The fetcher publishes the effective intervals in discord_fetcher_status.json.
+
+Usage:
+    python3 discord/poll_schedule.py    # show each channel's current interval
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+POLL_MIN = 30  # Seconds between polls of an active channel (DISCORD_POLL_MIN)
+POLL_MAX = 900  # Longest a quiet channel waits between polls (DISCORD_POLL_MAX)
+ACTIVE_HOLD = 300  # Seconds after a message that a channel stays at POLL_MIN
+BACKOFF = 2.0  # Interval multiplier per empty poll once the hold has passed
+
+STATUS_FILE = Path(__file__).parent.parent / "data" / "discord_fetcher_status.json"
+
+
+class _ChannelPoll:
+    def __init__(self, interval, last_activity, next_due):
+        self.interval = interval
+        self.last_activity = last_activity
+        self.next_due = next_due
+
+
+class PollSchedule:
+    """When each channel is next due, backing off quiet ones (not thread-safe)"""
+
+    def __init__(
+        self,
+        min_interval=POLL_MIN,
+        max_interval=POLL_MAX,
+        hold=ACTIVE_HOLD,
+        backoff=BACKOFF,
+    ):
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.hold = hold
+        self.backoff = backoff
+        self._channels = {}
+
+    def add(self, name, idle_for=0, now=None):
+        """Track a channel, due now; idle_for = seconds since its last message"""
+        now = time.monotonic() if now is None else now
+        if name not in self._channels:
+            self._channels[name] = _ChannelPoll(self.min_interval, now - idle_for, now)
+
+    def due(self, now=None):
+        """Channels whose next poll is due, in the order they were added"""
+        now = time.monotonic() if now is None else now
+        return [name for name, poll in self._channels.items() if poll.next_due <= now]
+
+    def record(self, name, got_messages, now=None):
+        """Schedule a channel's next poll after one that did/didn't find messages"""
+        now = time.monotonic() if now is None else now
+        poll = self._channels[name]
+        if got_messages:
+            poll.last_activity = now
+            poll.interval = self.min_interval
+        elif now - poll.last_activity >= self.hold:
+            poll.interval = min(poll.interval * self.backoff, self.max_interval)
+        poll.next_due = now + poll.interval
+
+    def wake(self, names=None, now=None):
+        """Snap channels (default: all) back to the fast interval, due now"""
+        now = time.monotonic() if now is None else now
+        for name in self._channels if names is None else names:
+            poll = self._channels.get(name)
+            if poll is not None:
+                poll.last_activity = now
+                poll.interval = self.min_interval
+                poll.next_due = now
+
+    def seconds_until_next(self, now=None):
+        """How long until the next channel is due (0 if one already is)"""
+        now = time.monotonic() if now is None else now
+        if not self._channels:
+            return self.min_interval
+        return max(0.0, min(poll.next_due for poll in self._channels.values()) - now)
+
+    def intervals(self):
+        """{channel: current interval in seconds}"""
+        return {name: round(poll.interval) for name, poll in self._channels.items()}
+
+
+def main():
+    try:
+        status = json.loads(STATUS_FILE.read_text())
+    except (OSError, ValueError):
+        print(
+            f"No fetcher status at {STATUS_FILE} - is discord-transcript-fetcher running?"
+        )
+        return 1
+
+    age = time.time() - status.get("alive_at", 0)
+    print(
+        f"Fetcher pid {status.get('pid')} | {status.get('mode')} mode | reported {age:.0f}s ago"
+    )
+    intervals = status.get("intervals")
+    if not intervals:
+        print("No per-channel intervals (gateway mode pushes messages as they happen)")
+        return 0
+    width = max(len(name) for name in intervals)
+    for name, seconds in sorted(intervals.items(), key=lambda item: (item[1], item[0])):
+        print(f"  #{name:<{width}}  every {seconds}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""Equivalence check and benchmark for the API error classifier.
+
+Runs every pane dump in utils/api_error_corpus/ through both the
+table-driven classifier and a frozen copy of the original sequential
+detect_api_errors(), and fails if they disagree or if a dump's result
+differs from expected.json. Then times each implementation per pane.
+
+Run it after touching the classifier rules, and when Claude Code changes
+its colours: capture the new pane with `tmux capture-pane -p -e` (and
+without -e for the .plain.txt twin), add it to the corpus and expected.json.
+
+Usage:
+    python3 utils/api_error_bench.py              # check + benchmark
+    python3 utils/api_error_bench.py --check      # equivalence only
+    python3 utils/api_error_bench.py -n 5000      # iterations per pane
+"""
+
+import argparse
+import json
+import logging
+import re
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+try:
+    from utils.api_error_classifier import classify
+except ImportError:
+    from api_error_classifier import classify
+
+CORPUS_DIR = Path(__file__).parent / "api_error_corpus"
+EXPECTED_FILE = CORPUS_DIR / "expected.json"
+
+# Fixed clock so usage-limit expiry is deterministic (noon)
+NOW = datetime(2026, 1, 15, 12, 0)
+
+logger = logging.getLogger("clap.autonomous-timer")
+
+
+def legacy_detect_api_errors(tmux_output, now=None):
+    """
+    detect_api_errors() as it was before the classifier, verbatim apart
+    from the now parameter. Do not "fix" this - it is the reference.
+    """
+    # Split output into lines for position-aware checking
+    lines = tmux_output.split("\n")
+
+    # ANSI color codes:
+    # [38;5;211m = Pink (errors)
+    # [38;5;220m = Yellow (warnings)
+    # [31m or [91m = Red (also errors)
+
+    # Check last 2 lines for yellow warnings (approaching usage limit)
+    if len(lines) >= 2:
+        last_two_lines = "\n".join(lines[-2:])
+        # Look for yellow text about approaching limit (with middle dot ·)
+        yellow_pattern = r"\[38;5;220m.*?(approaching.*?usage.*?limit.*?[·•.].*?reset.*?(\d{1,2}(?::\d{2})?(?:am|pm)?))"
+        yellow_match = re.search(yellow_pattern, last_two_lines, re.IGNORECASE)
+        if yellow_match:
+            reset_time = yellow_match.group(2) if yellow_match.lastindex >= 2 else None
+            return {
+                "error_type": "approaching_limit",
+                "details": "Approaching usage limit warning",
+                "reset_time": reset_time,
+            }
+
+    # Check for pink errors (38;5;211) anywhere in output
+    pink_pattern = r"\[38;5;211m([^\[]*)"
+    pink_matches = re.findall(pink_pattern, tmux_output)
+
+    for error_text in pink_matches:
+        # Skip auto-update warnings
+        if "Auto-update failed" in error_text:
+            continue
+
+        # Log any pink text containing JSON-related words for diagnostics.
+        # Previously this triggered an immediate session swap, but the regex
+        # (json.*error) was too broad and caused false positives at high context,
+        # racing with the rolling swap mechanism. Real API errors are now caught
+        # by the HTTP status code handlers (400/500/503) below.
+        if re.search(
+            r"malformed.*json|json.*error|invalid.*json", error_text, re.IGNORECASE
+        ):
+            logger.warning(
+                "Pink text matched JSON pattern (not acting on it): %r",
+                error_text.strip()[:200],
+            )
+
+        # Check for 503 errors (upstream connect error or disconnect/reset)
+        if re.search(
+            r"503|upstream.*connect.*error|disconnect.*reset.*before.*headers",
+            error_text,
+            re.IGNORECASE,
+        ):
+            return {
+                "error_type": "api_503_error",
+                "details": "API 503 error - upstream connection failure",
+                "reset_time": None,
+            }
+
+        # Check for usage limit errors
+        usage_pattern = (
+            r"limit will reset at (\d{1,2}(?::\d{2})?(?:am|pm)?)\s*\(([^)]+)\)"
+        )
+        usage_match = re.search(usage_pattern, error_text, re.IGNORECASE)
+        if usage_match:
+            reset_time_str = usage_match.group(1)
+            timezone = usage_match.group(2)
+
+            # Check if reset time has already passed
+            try:
+                from datetime import datetime
+                import re as time_re
+
+                current_time = now or datetime.now()
+
+                # Parse the reset time
+                time_parts = time_re.match(
+                    r"(\d{1,2})(?::(\d{2}))?(?:am|pm)?",
+                    reset_time_str,
+                    time_re.IGNORECASE,
+                )
+                if time_parts:
+                    hour = int(time_parts.group(1))
+                    minute = int(time_parts.group(2) or 0)
+
+                    # Handle AM/PM
+                    if "pm" in reset_time_str.lower() and hour != 12:
+                        hour += 12
+                    elif "am" in reset_time_str.lower() and hour == 12:
+                        hour = 0
+
+                    # Create reset datetime for today
+                    reset_datetime = current_time.replace(
+                        hour=hour, minute=minute, second=0, microsecond=0
+                    )
+
+                    # If reset time has passed, ignore this error
+                    if current_time > reset_datetime:
+                        logger.info(
+                            f"Ignoring expired usage limit (reset was at {reset_time_str}, now {current_time.strftime('%I:%M%p')})"
+                        )
+                        continue  # Check next pink text match
+
+            except Exception as e:
+                logger.error(f"Parsing reset time: {e}")
+                # If we can't parse, report the error anyway
+
+            return {
+                "error_type": "usage_limit",
+                "details": f"Usage limit reached - resets at {reset_time_str} ({timezone})",
+                "reset_time": reset_time_str,
+                "timezone": timezone,
+            }
+
+        # Check specifically for 400 errors
+        if re.search(r"400.*error|bad.*request", error_text, re.IGNORECASE):
+            return {
+                "error_type": "api_400_error",
+                "details": "API 400 error - requires session swap",
+                "reset_time": None,
+            }
+
+        # Check for 401 authentication/OAuth errors
+        if re.search(
+            r"401|authentication_error|oauth.*expired|token has expired",
+            error_text,
+            re.IGNORECASE,
+        ):
+            return {
+                "error_type": "oauth_error",
+                "details": "OAuth token expired - requires human login",
+                "reset_time": None,
+            }
+
+        # General API errors in pink text
+        if re.search(r"404.*error|api.*error|rate.*limit", error_text, re.IGNORECASE):
+            # Check specifically for 500 errors
+            if re.search(
+                r"500.*error|internal.*server.*error", error_text, re.IGNORECASE
+            ):
+                return {
+                    "error_type": "api_500_error",
+                    "details": "API 500 error - requires session swap",
+                    "reset_time": None,
+                }
+            return {
+                "error_type": "api_error",
+                "details": "API error detected in console",
+                "reset_time": None,
+            }
+
+    # Check for red errors (31m or 91m)
+    red_pattern = r"\[(31|91)m([^\[]*)"
+    red_matches = re.findall(red_pattern, tmux_output)
+
+    for _, error_text in red_matches:
+        # Check for OAuth/authentication errors first
+        if re.search(
+            r"401|authentication_error|oauth.*expired|token has expired",
+            error_text,
+            re.IGNORECASE,
+        ):
+            return {
+                "error_type": "oauth_error",
+                "details": "OAuth token expired - requires human login",
+                "reset_time": None,
+            }
+        if re.search(r"error|limit|failed", error_text, re.IGNORECASE):
+            return {
+                "error_type": "api_error",
+                "details": "Error detected in console (red text)",
+                "reset_time": None,
+            }
+
+    # No errors found in colored text
+    return None
+
+
+def load_corpus():
+    """[(name, text)] for every dump in the corpus, ANSI and plain."""
+    return [
+        (path.name, path.read_text(encoding="utf-8"))
+        for path in sorted(CORPUS_DIR.glob("*.txt"))
+    ]
+
+
+def check(corpus):
+    """Compare both implementations and expected.json. Returns failure count."""
+    expected = json.loads(EXPECTED_FILE.read_text())
+    failures = 0
+    for name, text in corpus:
+        new = classify(text, now=NOW)
+        old = legacy_detect_api_errors(text, now=NOW)
+        new_type = new["error_type"] if new else None
+        want = expected.get(name, "missing")
+
+        if new != old:
+            print(f"MISMATCH  {name}: classifier={new} legacy={old}")
+            failures += 1
+        elif new_type != want:
+            print(f"UNEXPECTED {name}: got {new_type}, expected.json says {want}")
+            failures += 1
+        else:
+            print(f"ok        {name}: {new_type}")
+    return failures
+
+
+def bench(corpus, iterations):
+    """Print mean scan time per pane (microseconds) for each implementation."""
+    print(f"\n{'pane':<36}{'legacy us':>12}{'classifier us':>15}{'speedup':>9}")
+    totals = [0.0, 0.0]
+    for name, text in corpus:
+        timings = []
+        for func in (legacy_detect_api_errors, classify):
+            start = time.perf_counter()
+            for _ in range(iterations):
+                func(text, now=NOW)
+            timings.append((time.perf_counter() - start) / iterations * 1e6)
+        totals[0] += timings[0]
+        totals[1] += timings[1]
+        print(
+            f"{name:<36}{timings[0]:>12.1f}{timings[1]:>15.1f}{timings[0] / timings[1]:>8.1f}x"
+        )
+    print(
+        f"{'mean':<36}{totals[0] / len(corpus):>12.1f}{totals[1] / len(corpus):>15.1f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--check", action="store_true", help="equivalence check only")
+    parser.add_argument("-n", type=int, default=2000, help="iterations per pane")
+    args = parser.parse_args()
+
+    # Keep the expired-limit and JSON diagnostics out of the report
+    logging.getLogger("clap.autonomous-timer").setLevel(logging.ERROR)
+
+    corpus = load_corpus()
+    failures = check(corpus)
+    if failures:
+        print(f"\n{failures} of {len(corpus)} panes failed")
+        return 1
+    print(f"\nAll {len(corpus)} panes agree")
+    if not args.check:
+        bench(corpus, args.n)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,222 @@
+"""Table-driven classifier for API errors shown in the Claude tmux pane.
+
+Claude Code colours its errors, so classification works on a capture
+taken with escape codes (capture-pane -e):
+
+    [38;5;211m = Pink (errors)
+    [38;5;220m = Yellow (warnings)
+    [31m or [91m = Red (also errors)
+
+Every rule lives in a table below, in priority order. The rules for each
+colour are compiled once into a single regex: an alternation with one
+lookahead branch per rule, each a named group. One match call per
+coloured segment returns the highest-priority rule that occurs in it,
+without evaluating the rules below it.
+
+The result is the same dict detect_api_errors() has always returned:
+error_type, details, reset_time (and timezone for usage limits), or
+None if nothing matched.
+
+utils/api_error_bench.py checks this against the original sequential
+implementation over the pane corpus in utils/api_error_corpus/ and
+reports scan time per pane.
+
+Usage:
+    from api_error_classifier import classify
+    error_info = classify(capture_with_escapes)
+"""
+
+import logging
+import re
+from datetime import datetime
+
+logger = logging.getLogger("clap.autonomous-timer")
+
+_TIME = r"\d{1,2}(?::\d{2})?(?:am|pm)?"
+
+# Yellow warning, only checked in the last two lines of the pane
+YELLOW_RE = re.compile(
+    r"\[38;5;220m.*?(approaching.*?usage.*?limit.*?[·•.].*?reset.*?(" + _TIME + r"))",
+    re.IGNORECASE,
+)
+
+# One coloured run: text after a pink or red code, up to the next escape
+SEGMENT_RE = re.compile(r"\[38;5;211m(?P<pink>[^\[]*)|\[(?:31|91)m(?P<red>[^\[]*)")
+
+# Logged for diagnostics only - (json.*error) caused false-positive swaps
+JSON_RE = re.compile(r"malformed.*json|json.*error|invalid.*json", re.IGNORECASE)
+
+# (name, pattern, refinement) in priority order. A refinement is only
+# checked once its rule has hit: a general API error mentioning a 500 is
+# reported as api_500_error.
+PINK_RULES = (
+    (
+        "api_503_error",
+        r"503|upstream.*connect.*error|disconnect.*reset.*before.*headers",
+        None,
+    ),
+    (
+        "usage_limit",
+        r"limit will reset at (?P<reset_time>" + _TIME + r")\s*\((?P<timezone>[^)]+)\)",
+        None,
+    ),
+    ("api_400_error", r"400.*error|bad.*request", None),
+    ("oauth_error", r"401|authentication_error|oauth.*expired|token has expired", None),
+    (
+        "api_error",
+        r"404.*error|api.*error|rate.*limit",
+        ("api_500_error", r"500.*error|internal.*server.*error"),
+    ),
+)
+
+RED_RULES = (
+    ("oauth_error", r"401|authentication_error|oauth.*expired|token has expired", None),
+    ("red_api_error", r"error|limit|failed", None),
+)
+
+DETAILS = {
+    "approaching_limit": "Approaching usage limit warning",
+    "api_503_error": "API 503 error - upstream connection failure",
+    "api_400_error": "API 400 error - requires session swap",
+    "oauth_error": "OAuth token expired - requires human login",
+    "api_500_error": "API 500 error - requires session swap",
+    "api_error": "API error detected in console",
+    "red_api_error": "Error detected in console (red text)",
+}
+
+
+def _compile_rules(rules):
+    """Combine rules into one regex: an alternation of lookaheads.
+
+    Matched at position 0, the first branch (in priority order) whose
+    pattern occurs anywhere in the segment wins, exactly as if each rule
+    were re.search()ed in turn; later rules are never evaluated.
+    """
+    branches = []
+    for name, pattern, refinement in rules:
+        branch = rf"(?=[\s\S]*?(?P<{name}>{pattern}))"
+        if refinement:
+            branch += rf"(?:(?=[\s\S]*?(?P<{refinement[0]}>{refinement[1]}))|)"
+        branches.append(branch)
+    return re.compile("|".join(branches), re.IGNORECASE)
+
+
+def _first_hit(compiled, text):
+    """(rule name, match) for the highest-priority rule in text, or (None, None).
+
+    A refinement group closes after its rule's group, so when it matched,
+    lastgroup names the refinement (e.g. api_500_error) instead.
+    """
+    hits = compiled.match(text)
+    if hits is None:
+        return None, None
+    return hits.lastgroup, hits
+
+
+PINK_RE = _compile_rules(PINK_RULES)
+RED_RE = _compile_rules(RED_RULES)
+
+
+def _result(error_type, details=None, reset_time=None):
+    return {
+        "error_type": error_type,
+        "details": details or DETAILS[error_type],
+        "reset_time": reset_time,
+    }
+
+
+def usage_limit_expired(reset_time_str, now=None):
+    """True if a "limit will reset at <time>" time has already passed today."""
+    current_time = now or datetime.now()
+    time_parts = re.match(
+        r"(\d{1,2})(?::(\d{2}))?(?:am|pm)?", reset_time_str, re.IGNORECASE
+    )
+    if not time_parts:
+        return False
+
+    hour = int(time_parts.group(1))
+    minute = int(time_parts.group(2) or 0)
+
+    # Handle AM/PM
+    if "pm" in reset_time_str.lower() and hour != 12:
+        hour += 12
+    elif "am" in reset_time_str.lower() and hour == 12:
+        hour = 0
+
+    reset_datetime = current_time.replace(
+        hour=hour, minute=minute, second=0, microsecond=0
+    )
+    return current_time > reset_datetime
+
+
+def _classify_pink(error_text, now):
+    if JSON_RE.search(error_text):
+        logger.warning(
+            "Pink text matched JSON pattern (not acting on it): %r",
+            error_text.strip()[:200],
+        )
+
+    rule, hits = _first_hit(PINK_RE, error_text)
+    if rule is None:
+        return None
+
+    if rule == "usage_limit":
+        reset_time_str = hits["reset_time"]
+        timezone = hits["timezone"]
+        try:
+            if usage_limit_expired(reset_time_str, now):
+                logger.info(
+                    f"Ignoring expired usage limit (reset was at {reset_time_str}, "
+                    f"now {(now or datetime.now()).strftime('%I:%M%p')})"
+                )
+                return None  # Check next pink segment
+        except Exception as e:
+            logger.error(f"Parsing reset time: {e}")
+            # If we can't parse, report the error anyway
+        result = _result(
+            "usage_limit",
+            f"Usage limit reached - resets at {reset_time_str} ({timezone})",
+            reset_time_str,
+        )
+        result["timezone"] = timezone
+        return result
+
+    return _result(rule)
+
+
+def classify(pane_text, now=None):
+    """Classify a pane capture (with escape codes). Returns dict or None.
+
+    now: override the clock used to expire usage-limit messages.
+    """
+    # Check last 2 lines for yellow warnings (approaching usage limit)
+    lines = pane_text.split("\n")
+    if len(lines) >= 2:
+        if YELLOW_RE.search("\n".join(lines[-2:])):
+            # reset_time has always been None here: the time group is nested
+            # inside group 1, so the old lastindex >= 2 check never passed
+            return _result("approaching_limit")
+
+    # Pink segments are checked (in order) before any red segment
+    red_segments = []
+    for segment in SEGMENT_RE.finditer(pane_text):
+        error_text = segment["pink"]
+        if error_text is None:
+            red_segments.append(segment["red"])
+            continue
+        # Skip auto-update warnings
+        if "Auto-update failed" in error_text:
+            continue
+        result = _classify_pink(error_text, now)
+        if result:
+            return result
+
+    for error_text in red_segments:
+        rule, _ = _first_hit(RED_RE, error_text)
+        if rule == "oauth_error":
+            return _result("oauth_error")
+        if rule == "red_api_error":
+            return _result("api_error", DETAILS["red_api_error"])
+
+    # No errors found in colored text
+    return None
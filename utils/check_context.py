@@ -12,9 +12,9 @@ from pathlib import Path
 
 # Import shared functions
 try:
-    from utils.check_usage import get_current_session_id, _get_statusline_data
+    from utils.check_usage import get_current_session_id, StatuslineSnapshot
 except ImportError:
-    from check_usage import get_current_session_id, _get_statusline_data
+    from check_usage import get_current_session_id, StatuslineSnapshot
 
 # Warning thresholds (as percentages 0-100)
 YELLOW_THRESHOLD = 70
@@ -48,13 +48,15 @@ Free: {remaining:,} tokens ({remaining_pct:.1f}%)
     return display, color, status
 
 
-def check_context(return_data=False):
+def check_context(return_data=False, snapshot=None):
     """Main function to check context usage.
 
     Reads used_percentage directly from statusline JSON — the same number
     displayed in the Claude Code status bar and used by the rolling swap hook.
+    Pass a StatuslineSnapshot to share one read with check_usage().
     """
-    statusline = _get_statusline_data()
+    snapshot = snapshot or StatuslineSnapshot.current()
+    statusline = snapshot.data if snapshot else None
     if not statusline:
         error_msg = "❌ No statusline data found (data/statusline_data.json)"
         if return_data:
@@ -74,6 +76,7 @@ def check_context(return_data=False):
     used_pct = context_window.get("used_percentage", 0)
     total_input = context_window.get("total_input_tokens", 0)
     window_size = context_window.get("context_window_size", 200000)
+    current_usage = context_window.get("current_usage") or {}
 
     if return_data:
         return {
@@ -82,6 +85,7 @@ def check_context(return_data=False):
             "total_limit": window_size,
             "percentage": used_pct / 100,  # callers expect 0-1 float
             "free_tokens": window_size - total_input,
+            "cache_tokens": current_usage.get("cache_read_input_tokens", 0),
             "status": ("critical" if used_pct >= RED_THRESHOLD
                        else "warning" if used_pct >= YELLOW_THRESHOLD
                        else "good"),
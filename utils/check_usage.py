@@ -19,19 +19,59 @@ def _get_repo_root():
     return Path(__file__).resolve().parent.parent
 
 
-def _get_statusline_data():
-    """Read the statusline JSON data written by Claude Code."""
-    repo_root = _get_repo_root()
-    statusline_file = repo_root / "data" / "statusline_data.json"
+class StatuslineSnapshot:
+    """One parse of data/statusline_data.json, shared by every reader.
 
-    if not statusline_file.exists():
-        return None
+    current() only re-parses when the file's mtime, inode or size change,
+    so check_usage(), check_context() and friends cost one stat() each per
+    cycle and all see the same data. Treat .data as read-only.
+    """
 
-    try:
-        with open(statusline_file, "r") as f:
-            return json.load(f)
-    except (json.JSONDecodeError, OSError):
-        return None
+    _cached = None  # (signature, snapshot or None)
+
+    def __init__(self, data, signature):
+        self.data = data
+        self.signature = signature
+
+    @property
+    def session_id(self):
+        return self.data.get("session_id")
+
+    @property
+    def total_cost_usd(self):
+        return (self.data.get("cost") or {}).get("total_cost_usd")
+
+    @property
+    def context_window(self):
+        return self.data.get("context_window") or {}
+
+    @classmethod
+    def current(cls):
+        """The latest snapshot, or None if there's no readable statusline data."""
+        statusline_file = _get_repo_root() / "data" / "statusline_data.json"
+        try:
+            st = os.stat(statusline_file)
+        except OSError:
+            return None
+        signature = (st.st_mtime_ns, st.st_ino, st.st_size)
+
+        cached = cls._cached
+        if cached and cached[0] == signature:
+            return cached[1]
+
+        try:
+            with open(statusline_file, "r") as f:
+                snapshot = cls(json.load(f), signature)
+        except (json.JSONDecodeError, OSError):
+            snapshot = None
+        cls._cached = (signature, snapshot)
+        return snapshot
+
+
+def _get_statusline_data():
+    """Read the statusline JSON data written by Claude Code."""
+    snapshot = StatuslineSnapshot.current()
+    return snapshot.data if snapshot else None
 
 
 def get_current_session_id():
@@ -40,9 +80,9 @@ def get_current_session_id():
     Falls back to scanning JSONL files if statusline data is unavailable.
     Also updates the tracking file for consumers that read it directly.
     """
-    data = _get_statusline_data()
-    if data and data.get("session_id"):
-        session_id = data["session_id"]
+    snapshot = StatuslineSnapshot.current()
+    if snapshot and snapshot.session_id:
+        session_id = snapshot.session_id
         _update_tracking_file(session_id)
         return session_id
 
@@ -88,8 +128,18 @@ def _get_session_id_from_filesystem():
     return newest_id
 
 
+_tracked_session_id = None  # Last session id known to be in the tracking file
+
+
 def _update_tracking_file(session_id):
-    """Update data/current_session_id for consumers that read it directly."""
+    """Update data/current_session_id for consumers that read it directly.
+
+    Only touches the file when the session id changes.
+    """
+    global _tracked_session_id
+    if session_id == _tracked_session_id:
+        return
+
     repo_root = _get_repo_root()
     session_file = repo_root / "data" / "current_session_id"
 
@@ -98,6 +148,7 @@ def _update_tracking_file(session_id):
             with open(session_file, "r") as f:
                 data = json.load(f)
                 if data.get("session_id") == session_id:
+                    _tracked_session_id = session_id
                     return
     except (json.JSONDecodeError, KeyError):
         pass
@@ -112,6 +163,7 @@ def _update_tracking_file(session_id):
         session_file.parent.mkdir(parents=True, exist_ok=True)
         with open(session_file, "w") as f:
             json.dump(data, f, indent=2)
+        _tracked_session_id = session_id
     except Exception:
         pass
 
@@ -153,14 +205,18 @@ def store_cost(total_cost, session_id):
         print(f"⚠️ Could not store cost: {e}")
 
 
-def check_usage(return_data=False):
+def check_usage(return_data=False, snapshot=None):
     """Main function to check usage delta.
 
     Reads cost from statusline JSON instead of shelling out to ccusage.
     Returns the $ spent since last check (delta).
+
+    snapshot: a StatuslineSnapshot to read from, so callers checking
+    usage and context together see the same data.
     """
     # Get statusline data
-    statusline = _get_statusline_data()
+    snapshot = snapshot or StatuslineSnapshot.current()
+    statusline = snapshot.data if snapshot else None
     if not statusline:
         error_msg = "❌ No statusline data found (data/statusline_data.json)"
         if return_data:
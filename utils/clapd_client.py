@@ -0,0 +1,127 @@
+"""Thin client for clapd: run a ClAP command in the resident daemon.
+
+Wrappers call this instead of starting a full Python for their script:
+
+    python3 -S ~/claude-autonomy-platform/utils/clapd_client.py context
+
+It only imports socket/os/sys/json, connects to data/clapd.sock and hands
+over its argv, environment, working directory and stdin/stdout/stderr
+(as file descriptors, so output streams straight to the terminal). The
+daemon forks a child that already has requests, the Discord tools and
+the config parsed, runs the script there and reports its exit status.
+
+If the daemon isn't running (no socket, refused) or drops the request
+before starting it, the client execs the script directly - exactly what
+the wrapper did before.
+
+The child isn't in the terminal's process group, so Ctrl-C reaches only
+the client: it forwards the interrupt over the socket and waits for the
+child to finish. A second Ctrl-C hangs up, which terminates the child.
+
+Usage:
+    python3 -S utils/clapd_client.py <command> [args...]
+    python3 -S utils/clapd_client.py --list
+"""
+
+import json
+import os
+import socket
+import struct
+import sys
+
+CLAP_DIR = os.environ.get(
+    "CLAP_DIR", os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+SOCKET_PATH = os.path.join(CLAP_DIR, "data", "clapd.sock")
+
+# Commands the daemon will run: name -> script, relative to CLAP_DIR
+COMMANDS = {
+    "context": "utils/check_context.py",
+    "read_messages": "discord/read_messages",
+    "write_channel": "discord/write_channel_unified.py",
+    "usage_series": "utils/usage_series.py",
+    "resource_reporter": "utils/resource_reporter.py",
+    "healthcheck_status": "utils/healthcheck_status.py",
+}
+
+HEADER = struct.Struct("!I")  # payload length
+STARTED = b"S"  # daemon forked a child for the request
+STATUS = struct.Struct("!i")  # exit status, sent when the script finishes
+INTERRUPT = b"I"  # client got Ctrl-C: raise KeyboardInterrupt in the child
+
+
+def script_path(command):
+    return os.path.join(CLAP_DIR, COMMANDS[command])
+
+
+def run_direct(command, args):
+    """The old path: a fresh interpreter running the script."""
+    script = script_path(command)
+    os.execv(sys.executable, [sys.executable, script] + args)
+
+
+def _recv_exact(sock, size):
+    data = b""
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            return None
+        data += chunk
+    return data
+
+
+def run_via_daemon(command, args):
+    """Exit status from the daemon, or None if it never started the command."""
+    payload = json.dumps(
+        {"command": command, "args": args, "cwd": os.getcwd(), "env": dict(os.environ)}
+    ).encode("utf-8")
+    message = HEADER.pack(len(payload)) + payload
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        try:
+            sock.connect(SOCKET_PATH)
+            sent = socket.send_fds(sock, [message], [0, 1, 2])
+            sock.sendall(message[sent:])
+            if sock.recv(1) != STARTED:
+                return None
+        except OSError:
+            return None
+        try:
+            status = _recv_exact(sock, STATUS.size)
+        except KeyboardInterrupt:
+            try:
+                sock.sendall(INTERRUPT)
+                status = _recv_exact(sock, STATUS.size)  # Let it clean up
+            except (KeyboardInterrupt, OSError):
+                return 130  # Closing the socket terminates the child
+        if status is None:
+            print("clapd: command ended without a status", file=sys.stderr)
+            return 1
+        return STATUS.unpack(status)[0]
+    finally:
+        sock.close()
+
+
+def main(argv):
+    if len(argv) < 2 or argv[1] in ("-h", "--help"):
+        print("Usage: clapd_client.py <command> [args...]   (--list for commands)")
+        return 1
+    if argv[1] == "--list":
+        for name, script in sorted(COMMANDS.items()):
+            print(f"{name:<20} {script}")
+        return 0
+
+    command, args = argv[1], argv[2:]
+    if command not in COMMANDS:
+        print(f"clapd: unknown command '{command}'", file=sys.stderr)
+        return 2
+    if os.environ.get("CLAPD_DISABLE") != "1":
+        status = run_via_daemon(command, args)
+        if status is not None:
+            return status
+    run_direct(command, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
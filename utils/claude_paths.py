@@ -8,32 +8,31 @@ import os
 from pathlib import Path
 from typing import Tuple
 
+try:
+    from utils.config_service import ConfigFile, config_file as shared_config_file
+except ImportError:
+    from config_service import ConfigFile, config_file as shared_config_file
+
+
+def get_infrastructure_config_file() -> ConfigFile:
+    """The shared cache of claude_infrastructure_config.txt.
+
+    Lives in config/; older installs kept it in the ClAP root.
+    """
+    clap_dir = get_clap_dir()
+    path = clap_dir / 'config' / 'claude_infrastructure_config.txt'
+    legacy = clap_dir / 'claude_infrastructure_config.txt'
+    if not path.exists() and legacy.exists():
+        path = legacy
+    return shared_config_file(path)
+
 
 def read_config_value(key: str, config_file: Path) -> str:
-    """Read a value from the infrastructure config file."""
-    if not config_file.exists():
-        return ""
-    
-    # Read the value, handling variable substitution
-    with open(config_file, 'r') as f:
-        for line in f:
-            line = line.strip()
-            if line.startswith(f"{key}="):
-                value = line.split('=', 1)[1]
-                
-                # Handle variable substitution (e.g., $LINUX_USER)
-                if '$' in value:
-                    for var_line in open(config_file, 'r'):
-                        var_line = var_line.strip()
-                        if var_line.startswith('LINUX_USER='):
-                            linux_user = var_line.split('=', 1)[1]
-                            value = value.replace('$LINUX_USER', linux_user)
-                        elif var_line.startswith('PERSONAL_REPO='):
-                            personal_repo = var_line.split('=', 1)[1]
-                            value = value.replace('$PERSONAL_REPO', personal_repo)
-                
-                return value
-    return ""
+    """Read a value from the infrastructure config file.
+
+    $NAME references to other keys (e.g. $LINUX_USER) are expanded.
+    """
+    return shared_config_file(config_file).get(key, "", expand=True)
 
 
 def get_claude_paths() -> Tuple[Path, Path, Path]:
@@ -43,13 +42,10 @@ def get_claude_paths() -> Tuple[Path, Path, Path]:
     Returns:
         Tuple of (claude_home, personal_dir, autonomy_dir)
     """
-    # Get ClAP directory and config file
-    clap_dir = get_clap_dir()
-    config_file = clap_dir / 'claude_infrastructure_config.txt'
-    
     # Read from config file
-    claude_user = read_config_value('LINUX_USER', config_file) or 'sonnet-4'
-    personal_repo = read_config_value('PERSONAL_REPO', config_file) or 'personal'
+    config = get_infrastructure_config_file()
+    claude_user = config.get('LINUX_USER', expand=True) or 'sonnet-4'
+    personal_repo = config.get('PERSONAL_REPO', expand=True) or 'personal'
     
     # Override with environment variables if set
     claude_user = os.environ.get('CLAUDE_USER', claude_user)
@@ -21,6 +21,11 @@ import subprocess
 import time
 from datetime import datetime, timezone
 
+try:
+    from utils.pane_snapshot import get_snapshot
+except ImportError:
+    from pane_snapshot import get_snapshot
+
 CLAP_DIR = os.environ.get("CLAP_DIR", os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 STATE_FILE = os.environ.get("STATE_FILE_PATH",
                             os.path.join(CLAP_DIR, "data", "claude_state.json"))
@@ -104,16 +109,14 @@ def _is_paused():
 
 def _is_thinking():
     try:
-        result = subprocess.run(
-            ["tmux", "capture-pane", "-t", TMUX_SESSION, "-p", "-e", "-S", "-5"],
-            capture_output=True, text=True, timeout=5
-        )
-        if result.returncode != 0:
+        snapshot = get_snapshot(TMUX_SESSION, start=-5)
+        if snapshot is None:
             return False
+        output = snapshot.raw
         return bool(
             __import__("re").search(
                 r'\[38;5;(174|20[2-9]|21[0-6])m[^\[]*…',
-                result.stdout
+                output
             )
         )
     except Exception:
@@ -2,15 +2,22 @@
 """
 Unified configuration management for ClAP
 Centralizes all configuration loading and provides consistent access patterns
+
+Parsed files come from the shared config_service cache, so they are
+re-read when they change on disk (same cache as get_config_value()).
 """
 
 import os
-import json
 import logging
 from pathlib import Path
 from typing import Dict, Any, Optional, Union
 from functools import lru_cache
 
+try:
+    from utils.config_service import config_file, json_file
+except ImportError:
+    from config_service import config_file, json_file
+
 # Base paths
 CLAP_ROOT = Path(__file__).parent.parent
 HOME_DIR = Path.home()
@@ -36,7 +43,6 @@ FALLBACK_PATHS = {
 class ConfigManager:
     """Singleton configuration manager for ClAP"""
     _instance = None
-    _cache = {}
     
     def __new__(cls):
         if cls._instance is None:
@@ -84,24 +90,17 @@ class ConfigManager:
         Returns:
             Dictionary containing the configuration
         """
-        # Check cache first
-        cache_key = f"json_{config_name}"
-        if cache_key in self._cache:
-            return self._cache[cache_key]
-        
         config_path = self.get_config_path(config_name)
         if not config_path:
             self.logger.warning(f"Configuration file not found: {config_name}")
             return {}
         
-        try:
-            with open(config_path, 'r') as f:
-                config = json.load(f)
-            self._cache[cache_key] = config
-            return config
-        except Exception as e:
-            self.logger.error(f"Error loading JSON config {config_name}: {e}")
+        cached = json_file(config_path)
+        config = cached.values()
+        if cached.error:
+            self.logger.error(f"Error loading JSON config {config_name}: {cached.error}")
             return {}
+        return config
     
     def load_text_config(self, config_name: str) -> Dict[str, str]:
         """
@@ -113,29 +112,17 @@ class ConfigManager:
         Returns:
             Dictionary containing the configuration
         """
-        # Check cache first
-        cache_key = f"text_{config_name}"
-        if cache_key in self._cache:
-            return self._cache[cache_key]
-        
         config_path = self.get_config_path(config_name)
         if not config_path:
             self.logger.warning(f"Configuration file not found: {config_name}")
             return {}
         
-        config = {}
-        try:
-            with open(config_path, 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith('#') and '=' in line:
-                        key, value = line.split('=', 1)
-                        config[key.strip()] = value.strip()
-            self._cache[cache_key] = config
-            return config
-        except Exception as e:
-            self.logger.error(f"Error loading text config {config_name}: {e}")
+        cached = config_file(config_path)
+        config = cached.values()
+        if cached.error:
+            self.logger.error(f"Error loading text config {config_name}: {cached.error}")
             return {}
+        return config
     
     def get_value(self, config_name: str, key: str, default: Any = None) -> Any:
         """
@@ -162,8 +149,7 @@ class ConfigManager:
             return config.get(key, default)
     
     def clear_cache(self):
-        """Clear the configuration cache"""
-        self._cache.clear()
+        """Forget resolved paths (file contents revalidate themselves)"""
         self.get_config_path.cache_clear()
     
     def reload_config(self, config_name: str):
@@ -173,13 +159,8 @@ class ConfigManager:
         Args:
             config_name: Name of the configuration to reload
         """
-        # Remove from cache
-        json_key = f"json_{config_name}"
-        text_key = f"text_{config_name}"
-        self._cache.pop(json_key, None)
-        self._cache.pop(text_key, None)
-        
-        # Clear path cache for this config
+        # Contents are re-read whenever the file changes; only the
+        # resolved path (primary vs fallback) needs forgetting
         self.get_config_path.cache_clear()
 
 # Convenience functions for common configurations
@@ -0,0 +1,154 @@
+"""Shared, stat-invalidated cache of parsed ClAP config files.
+
+get_config_value() used to re-open and re-parse
+claude_infrastructure_config.txt on every call, including
+per-channel-per-cycle calls in the Discord fetcher. ConfigManager cached
+forever, so edits were never seen. Both now read through this module:
+
+- each file is parsed once and kept with its (mtime, inode, size)
+  signature, so an unchanged file costs one stat() per lookup and an
+  edit or atomic replace is picked up on the next one
+- KEY=VALUE files and JSON files share the same cache
+- typed getters (get_int, get_float, get_bool) convert and fall back to
+  the default on bad values instead of raising in a hot path
+- expand=True substitutes $NAME and ${NAME} from other keys in the same
+  file, recursively (so PERSONAL_DIR=/home/$LINUX_USER/$PERSONAL_REPO
+  resolves fully). Unknown names such as $(id -u) are left alone.
+
+Standard library only, so claude_paths can use it without an import cycle.
+
+Usage:
+    from config_service import config_file
+    config = config_file(CLAP_DIR / "config" / "claude_infrastructure_config.txt")
+    config.get("CLAUDE_NAME", "Claude")
+    config.get_int("DISCORD_CHECK_INTERVAL", 30)
+    config.get("PERSONAL_DIR", expand=True)
+"""
+
+import json
+import os
+import re
+import threading
+
+_VARIABLE = re.compile(r"\$(?:\{([A-Za-z_][A-Za-z0-9_]*)\}|([A-Za-z_][A-Za-z0-9_]*))")
+_TRUE = {"1", "true", "yes", "on"}
+_FALSE = {"0", "false", "no", "off"}
+
+_files = {}
+_files_lock = threading.Lock()
+
+
+def parse_key_values(text):
+    """KEY=VALUE pairs, ignoring blank lines, comments and [SECTION] headers."""
+    values = {}
+    for line in text.splitlines():
+        line = line.strip()
+        if line and not line.startswith("#") and "=" in line:
+            key, value = line.split("=", 1)
+            values[key.strip()] = value.strip()
+    return values
+
+
+def _signature(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_ino, st.st_size)
+
+
+class ConfigFile:
+    """One config file's parsed values, re-parsed only when it changes."""
+
+    def __init__(self, path, parser=parse_key_values):
+        self.path = os.fspath(path)
+        self.parser = parser
+        self._lock = threading.Lock()
+        self._signature = None
+        self._values = {}
+        self._expanded = {}
+        self.error = None  # Why the last read failed, if it did
+
+    def values(self):
+        """Parsed contents ({} if the file is missing or unreadable). Don't mutate."""
+        signature = _signature(self.path)
+        if signature == self._signature and signature is not None:
+            return self._values
+        with self._lock:
+            if signature != self._signature or signature is None:
+                self._load(signature)
+            return self._values
+
+    def _load(self, signature):
+        values, error = {}, None
+        if signature is None:
+            error = f"{self.path} not found"
+        else:
+            try:
+                with open(self.path, "r") as f:
+                    values = self.parser(f.read())
+            except (OSError, ValueError) as e:
+                error = str(e)
+                signature = None  # Retry on the next read
+        self._values = values
+        self._expanded = {}
+        self._signature = signature
+        self.error = error
+
+    def get(self, key, default=None, expand=False):
+        values = self.values()
+        if key not in values:
+            return default
+        if not expand or "$" not in str(values[key]):
+            return values[key]
+        expanded = self._expanded.get(key)
+        if expanded is None:
+            expanded = self._expanded[key] = self._expand(values[key], values, {key})
+        return expanded
+
+    def _expand(self, value, values, seen):
+        def substitute(match):
+            name = match.group(1) or match.group(2)
+            if name not in values or name in seen:
+                return match.group(0)
+            return self._expand(values[name], values, seen | {name})
+
+        return _VARIABLE.sub(substitute, value)
+
+    def get_int(self, key, default=None):
+        try:
+            return int(self.get(key))
+        except (TypeError, ValueError):
+            return default
+
+    def get_float(self, key, default=None):
+        try:
+            return float(self.get(key))
+        except (TypeError, ValueError):
+            return default
+
+    def get_bool(self, key, default=False):
+        value = self.get(key)
+        if value is None:
+            return default
+        value = str(value).strip().lower()
+        if value in _TRUE:
+            return True
+        if value in _FALSE:
+            return False
+        return default
+
+
+def config_file(path, parser=parse_key_values):
+    """The shared ConfigFile for path (one per path and parser per process)."""
+    key = (os.path.abspath(path), parser)
+    cached = _files.get(key)
+    if cached is None:
+        with _files_lock:
+            cached = _files.setdefault(key, ConfigFile(path, parser))
+    return cached
+
+
+def json_file(path):
+    """The shared ConfigFile for a JSON config."""
+    return config_file(path, json.loads)
@@ -0,0 +1,99 @@
+"""Forecast when the context window will fill, from statusline samples.
+
+The timer only learns that a session needs swapping when context
+crosses a fixed threshold, and the swap then does all of its slow work
+(transcript export, history parsing, CLAUDE.md assembly) while Claude
+waits. The forecaster keeps the last WINDOW turns - statusline samples
+where the context token count changed - and fits two least-squares
+lines through them:
+
+- tokens against time, for an ETA in seconds
+- tokens against turn number, for an ETA in turns
+
+so the timer can start swap preparation (utils/swap_prep.py) while
+there is still room. A new session id or a shrinking count (swap,
+compaction) starts the history over.
+
+Usage:
+    from context_forecast import ContextForecaster
+    forecaster = ContextForecaster(target=0.95)
+    forecaster.add(time.time(), session_id, total_tokens, window_size)
+    forecast = forecaster.forecast()
+    if forecast and forecast.eta_seconds < 15 * 60:
+        ...
+"""
+
+import collections
+from collections import namedtuple
+
+WINDOW = 20  # turns kept for the regression
+MIN_SAMPLES = 3
+
+Forecast = namedtuple(
+    "Forecast",
+    "eta_seconds turns_remaining tokens_per_second tokens_per_turn tokens "
+    "target_tokens as_of",
+)
+
+
+def _slope(xs, ys):
+    """Least-squares slope of ys against xs (None if xs don't vary)."""
+    n = len(xs)
+    mean_x = sum(xs) / n
+    mean_y = sum(ys) / n
+    var = sum((x - mean_x) ** 2 for x in xs)
+    if var == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / var
+
+
+class ContextForecaster:
+    """Rolling regression of context tokens over time and turns."""
+
+    def __init__(self, target=0.95, window=WINDOW):
+        self.target = target
+        self.session_id = None
+        self.limit = None
+        self.turn = 0
+        self.samples = collections.deque(maxlen=window)  # (timestamp, turn, tokens)
+
+    def reset(self, session_id=None):
+        self.session_id = session_id
+        self.turn = 0
+        self.samples.clear()
+
+    def add(self, timestamp, session_id, tokens, limit):
+        """Record one statusline reading; repeats of the last count are ignored."""
+        if session_id != self.session_id:
+            self.reset(session_id)
+        elif self.samples and tokens < self.samples[-1][2]:
+            self.reset(session_id)  # compacted or trimmed - old slope no longer applies
+        elif self.samples and tokens == self.samples[-1][2]:
+            return
+        self.limit = limit
+        self.turn += 1
+        self.samples.append((timestamp, self.turn, tokens))
+
+    def forecast(self):
+        """Forecast for reaching target, or None without enough growth to fit."""
+        if len(self.samples) < MIN_SAMPLES or not self.limit:
+            return None
+        times, turns, tokens = zip(*self.samples)
+        per_second = _slope(times, tokens)
+        per_turn = _slope(turns, tokens)
+        if not per_second or per_second <= 0 or not per_turn or per_turn <= 0:
+            return None
+
+        current = tokens[-1]
+        target_tokens = self.target * self.limit
+        remaining = max(0.0, target_tokens - current)
+        # eta_seconds counts from the last sample (as_of), not from now
+        return Forecast(
+            eta_seconds=remaining / per_second,
+            turns_remaining=remaining / per_turn,
+            tokens_per_second=per_second,
+            tokens_per_turn=per_turn,
+            tokens=current,
+            target_tokens=int(target_tokens),
+            as_of=times[-1],
+        )
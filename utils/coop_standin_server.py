@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""Local stand-in for the CoOP resource-share server.
+
+Accepts the same POST /resource-share/increment the timer sends, keeps
+running totals per Claude and answers with the fields the timer acts on
+(recommended_interval, multipliers, quota_status, overdue_alerts). It can
+simulate an outage, so the reporter's spool and replay can be tested end
+to end without touching the real server.
+
+Endpoints:
+    POST /resource-share/increment    record a cost delta
+    GET  /resource-share/totals       totals and request log as JSON
+
+Usage:
+    python3 utils/coop_standin_server.py                 # port 8765
+    python3 utils/coop_standin_server.py --fail-first 3  # 503 the first 3 POSTs
+    python3 utils/coop_standin_server.py --interval 900 --alert Quill:45
+
+Then run the timer with WEBHOOK_HOST=localhost and watch
+`python3 utils/resource_reporter.py status` drain.
+"""
+
+import argparse
+import json
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StandinState:
+    def __init__(self, interval, fail_first, alerts):
+        self.interval = interval
+        self.fail_remaining = fail_first
+        self.alerts = alerts
+        self.totals = {}
+        self.requests = []
+        self.lock = threading.Lock()
+
+
+def make_handler(state):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _reply(self, status, body):
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path != "/resource-share/totals":
+                return self._reply(404, {"error": "not found"})
+            with state.lock:
+                self._reply(200, {"totals": state.totals, "requests": state.requests})
+
+        def do_POST(self):
+            if self.path != "/resource-share/increment":
+                return self._reply(404, {"error": "not found"})
+            length = int(self.headers.get("Content-Length", 0))
+            try:
+                payload = json.loads(self.rfile.read(length))
+                name = payload["claude_name"]
+                delta = float(payload["cost_delta"])
+            except (ValueError, KeyError, TypeError) as e:
+                return self._reply(400, {"error": f"bad payload: {e}"})
+
+            with state.lock:
+                if state.fail_remaining > 0:
+                    state.fail_remaining -= 1
+                    return self._reply(503, {"error": "simulated outage"})
+                state.totals[name] = round(state.totals.get(name, 0.0) + delta, 6)
+                state.requests.append(
+                    {"received": datetime.now().isoformat(), "payload": payload}
+                )
+                total = state.totals[name]
+
+            print(
+                f"{name}: +${delta:.4f} ({payload.get('mode')}) total ${total:.4f}",
+                flush=True,
+            )
+            self._reply(
+                200,
+                {
+                    "status": "ok",
+                    "recommended_interval": state.interval,
+                    "multipliers": {"fairness": 1.0},
+                    "quota_status": "ok",
+                    # Other Claudes Mama-hen thinks are overdue
+                    "overdue_alerts": [
+                        dict(alert, expected_interval=state.interval)
+                        for alert in state.alerts
+                        if alert["name"] != name
+                    ],
+                },
+            )
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def parse_alert(text):
+    """NAME:MINUTES, e.g. Quill:45 - Mama-hen says NAME is 45 minutes overdue."""
+    name, _, minutes = text.partition(":")
+    return {"name": name, "overdue_minutes": int(minutes or 60)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "--interval",
+        type=int,
+        default=1800,
+        help="recommended_interval to hand out (seconds)",
+    )
+    parser.add_argument(
+        "--fail-first",
+        type=int,
+        default=0,
+        help="answer the first N increments with 503",
+    )
+    parser.add_argument(
+        "--alert",
+        action="append",
+        default=[],
+        type=parse_alert,
+        help="overdue Claude to report, NAME:MINUTES (repeatable)",
+    )
+    args = parser.parse_args()
+
+    state = StandinState(args.interval, args.fail_first, args.alert)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(state))
+    print(f"CoOP stand-in listening on http://{args.host}:{args.port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
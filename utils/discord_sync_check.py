@@ -38,28 +38,37 @@ def check_sync():
                     f.seek(-chunk_size, 2)
                     lines = f.read().decode('utf-8', errors='ignore').strip().split('\n')
 
-                    if lines:
-                        last_line = lines[-1]
-                        if last_line:
-                            msg_data = json.loads(last_line)
-                            transcript_last_id = msg_data.get('id')
-
-                            if state_last_id != transcript_last_id:
-                                # Check if state is ahead of transcript
-                                if int(state_last_id) > int(transcript_last_id):
-                                    issues.append({
-                                        'channel': channel,
-                                        'state_id': state_last_id,
-                                        'transcript_id': transcript_last_id,
-                                        'issue': 'state_ahead'
-                                    })
-                                else:
-                                    issues.append({
-                                        'channel': channel,
-                                        'state_id': state_last_id,
-                                        'transcript_id': transcript_last_id,
-                                        'issue': 'transcript_ahead'
-                                    })
+                    # Last message, skipping edit/delete entries (they
+                    # refer back to older messages)
+                    msg_data = None
+                    for line in reversed(lines):
+                        try:
+                            entry = json.loads(line)
+                        except json.JSONDecodeError:
+                            continue  # Empty, or cut off by the seek
+                        if not entry.get('event'):
+                            msg_data = entry
+                            break
+
+                    if msg_data:
+                        transcript_last_id = msg_data.get('id')
+
+                        if state_last_id != transcript_last_id:
+                            # Check if state is ahead of transcript
+                            if int(state_last_id) > int(transcript_last_id):
+                                issues.append({
+                                    'channel': channel,
+                                    'state_id': state_last_id,
+                                    'transcript_id': transcript_last_id,
+                                    'issue': 'state_ahead'
+                                })
+                            else:
+                                issues.append({
+                                    'channel': channel,
+                                    'state_id': state_last_id,
+                                    'transcript_id': transcript_last_id,
+                                    'issue': 'transcript_ahead'
+                                })
             except Exception as e:
                 issues.append({
                     'channel': channel,
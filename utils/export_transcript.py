@@ -5,9 +5,20 @@ Export current session transcript to context/current_export.txt
 This script is triggered by a PostToolUse hook when writing to new_session.txt.
 It bypasses Claude Code's /export command by directly reading the session .jsonl
 file and converting it to the text format expected by the conversation parser.
+
+Transcripts only ever grow, so the converted text is checkpointed in
+data/swap_prep/ together with the byte offset it covers (one file,
+replaced atomically, so the two can never disagree). Each export
+converts just the lines appended since the checkpoint. `--prewarm`
+(run by utils/swap_prep.py ahead of a forecast swap) advances the
+checkpoint without touching current_export.txt. Every writer holds
+data/swap_prep/prep.lock, so an export that starts during a pre-warm
+waits for it and then converts only the remainder.
 """
 
+import fcntl
 import json
+import os
 import sys
 from pathlib import Path
 from datetime import datetime
@@ -15,6 +26,9 @@ from datetime import datetime
 CLAP_DIR = Path.home() / "claude-autonomy-platform"
 SESSION_ID_FILE = CLAP_DIR / "data" / "current_session_id"
 EXPORT_FILE = CLAP_DIR / "context" / "current_export.txt"
+CHECKPOINT_DIR = CLAP_DIR / "data" / "swap_prep"
+CHECKPOINT_FILE = CHECKPOINT_DIR / "export_checkpoint.json"
+LOCK_FILE = CHECKPOINT_DIR / "prep.lock"
 
 # Claude Code stores transcripts here
 CLAUDE_PROJECTS_DIR = Path.home() / ".config" / "Claude" / "projects"
@@ -47,8 +61,8 @@ def find_transcript_file(session_id: str) -> Path | None:
     return None
 
 
-def convert_jsonl_to_text(transcript_file: Path) -> str:
-    """Convert .jsonl transcript to text format matching /export output.
+def convert_entry(entry: dict) -> list[str]:
+    """Convert one transcript entry to export lines.
 
     The parser expects:
     - ❯ prefix for user messages (or > which parser also handles)
@@ -56,61 +70,133 @@ def convert_jsonl_to_text(transcript_file: Path) -> str:
     - ⎿ prefix for tool outputs
     """
     lines = []
-
-    with open(transcript_file) as f:
-        for line in f:
-            try:
-                entry = json.loads(line.strip())
-            except json.JSONDecodeError:
-                continue
-
-            entry_type = entry.get("type")
-
-            # User messages
-            if entry_type == "user":
-                message = entry.get("message", {})
-                content = message.get("content", "")
-                # Handle string content only (skip lists which are tool results)
-                if isinstance(content, str) and content:
-                    # Skip if content looks like tool results
-                    if not content.startswith("[{") and not content.startswith("[{'"):
-                        lines.append(f"❯ {content}")
+    entry_type = entry.get("type")
+
+    # User messages
+    if entry_type == "user":
+        message = entry.get("message", {})
+        content = message.get("content", "")
+        # Handle string content only (skip lists which are tool results)
+        if isinstance(content, str) and content:
+            # Skip if content looks like tool results
+            if not content.startswith("[{") and not content.startswith("[{'"):
+                lines.append(f"❯ {content}")
+                lines.append("")
+
+    # Assistant messages
+    elif entry_type == "assistant":
+        message = entry.get("message", {})
+        content_list = message.get("content", [])
+
+        for item in content_list:
+            if isinstance(item, dict):
+                if item.get("type") == "text":
+                    text = item.get("text", "")
+                    if text:
+                        lines.append(f"● {text}")
                         lines.append("")
+                elif item.get("type") == "tool_use":
+                    tool_name = item.get("name", "Tool")
+                    # Brief tool indicator
+                    lines.append(f"● {tool_name}(...)")
+            elif isinstance(item, str):
+                lines.append(f"● {item}")
+                lines.append("")
+
+    # Tool results - show brief summary with ⎿ prefix
+    elif entry_type == "tool_result":
+        content = entry.get("content", "")
+        # Only include short, non-error results
+        if content and len(content) < 200 and "error" not in content.lower():
+            # Truncate and clean up
+            brief = content.replace("\n", " ")[:80]
+            lines.append(f"  ⎿  {brief}")
+
+    return lines
+
+
+def convert_jsonl_lines(f) -> list[str]:
+    """Export lines for every complete transcript line left in f."""
+    lines = []
+    for line in f:
+        if not line.endswith(b"\n"):
+            # Still being written - the next export picks it up
+            f.seek(-len(line), os.SEEK_CUR)
+            break
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(entry, dict):
+            lines.extend(convert_entry(entry))
+    return lines
 
-            # Assistant messages
-            elif entry_type == "assistant":
-                message = entry.get("message", {})
-                content_list = message.get("content", [])
-
-                for item in content_list:
-                    if isinstance(item, dict):
-                        if item.get("type") == "text":
-                            text = item.get("text", "")
-                            if text:
-                                lines.append(f"● {text}")
-                                lines.append("")
-                        elif item.get("type") == "tool_use":
-                            tool_name = item.get("name", "Tool")
-                            # Brief tool indicator
-                            lines.append(f"● {tool_name}(...)")
-                    elif isinstance(item, str):
-                        lines.append(f"● {item}")
-                        lines.append("")
 
-            # Tool results - show brief summary with ⎿ prefix
-            elif entry_type == "tool_result":
-                content = entry.get("content", "")
-                # Only include short, non-error results
-                if content and len(content) < 200 and "error" not in content.lower():
-                    # Truncate and clean up
-                    brief = content.replace("\n", " ")[:80]
-                    lines.append(f"  ⎿  {brief}")
+def convert_jsonl_to_text(transcript_file: Path) -> str:
+    """Convert .jsonl transcript to text format matching /export output."""
+    with open(transcript_file, "rb") as f:
+        return "\n".join(convert_jsonl_lines(f))
+
 
-    return "\n".join(lines)
+def load_checkpoint(session_id: str, transcript_file: Path) -> tuple[str, int]:
+    """(converted text, byte offset) saved for this transcript, or ("", 0)."""
+    try:
+        checkpoint = json.loads(CHECKPOINT_FILE.read_text())
+        st = transcript_file.stat()
+        if (
+            checkpoint.get("session_id") == session_id
+            and checkpoint.get("inode") == st.st_ino
+            and checkpoint.get("offset", 0) <= st.st_size
+        ):
+            return checkpoint["text"], checkpoint["offset"]
+    except (OSError, ValueError, KeyError):
+        pass
+    return "", 0
+
+
+def save_checkpoint(session_id: str, transcript_file: Path, text: str, offset: int):
+    # Text and offset in one file: a pair from different saves would
+    # convert the same lines twice
+    CHECKPOINT_DIR.mkdir(parents=True, exist_ok=True)
+    checkpoint = {
+        "session_id": session_id,
+        "inode": transcript_file.stat().st_ino,
+        "offset": offset,
+        "text": text,
+    }
+    tmp = CHECKPOINT_FILE.with_suffix(".tmp")
+    tmp.write_text(json.dumps(checkpoint))
+    os.replace(tmp, CHECKPOINT_FILE)
+
+
+def convert_incremental(session_id: str, transcript_file: Path) -> str:
+    """Full export text, converting only what was appended since the checkpoint."""
+    text, offset = load_checkpoint(session_id, transcript_file)
+    with open(transcript_file, "rb") as f:
+        f.seek(offset)
+        new_lines = convert_jsonl_lines(f)
+        offset = f.tell()
+    if new_lines:
+        text = "\n".join([text] + new_lines) if text else "\n".join(new_lines)
+    save_checkpoint(session_id, transcript_file, text, offset)
+    return text
+
+
+def export_transcript(prewarm: bool = False, lock: bool = True) -> bool:
+    """Convert the current session transcript to text export format.
+
+    With prewarm, only bring the checkpoint up to date. Pass lock=False
+    only if the caller already holds LOCK_FILE (utils/swap_prep.py does).
+    """
+    if not lock:
+        return _export_transcript(prewarm)
+    CHECKPOINT_DIR.mkdir(parents=True, exist_ok=True)
+    with open(LOCK_FILE, "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)  # Wait out a running pre-warm
+        return _export_transcript(prewarm)
 
 
-def export_transcript() -> bool:
-    """Convert the current session transcript to text export format."""
+def _export_transcript(prewarm: bool) -> bool:
     session_id = get_current_session_id()
     if not session_id:
         print("[EXPORT_TRANSCRIPT] No session ID found", file=sys.stderr)
@@ -126,11 +212,13 @@ def export_transcript() -> bool:
     print(f"[EXPORT_TRANSCRIPT] Found transcript: {transcript_file}")
     print(f"[EXPORT_TRANSCRIPT] Size: {transcript_file.stat().st_size} bytes")
 
+    text_content = convert_incremental(session_id, transcript_file)
+    if prewarm:
+        print(f"[EXPORT_TRANSCRIPT] Checkpoint updated ({len(text_content.splitlines())} lines)")
+        return True
+
     # Ensure export directory exists
     EXPORT_FILE.parent.mkdir(parents=True, exist_ok=True)
-
-    # Convert and write
-    text_content = convert_jsonl_to_text(transcript_file)
     EXPORT_FILE.write_text(text_content)
 
     print(f"[EXPORT_TRANSCRIPT] Exported to: {EXPORT_FILE}")
@@ -141,5 +229,5 @@ def export_transcript() -> bool:
 
 
 if __name__ == "__main__":
-    success = export_transcript()
+    success = export_transcript(prewarm="--prewarm" in sys.argv)
     sys.exit(0 if success else 1)
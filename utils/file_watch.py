@@ -0,0 +1,299 @@
+"""In-memory cache of parsed data files, invalidated by inotify.
+
+The timer polls several small files every cycle (autonomy_choice.json,
+timer_pause.json, discord_channels.json, channel_purposes.json) that
+change rarely. FileWatchCache keeps each parsed result in memory and
+only re-reads a file after it has changed:
+
+- With inotify (Linux), the parent directory is watched, so atomic
+  rename-into-place writes, deletes and re-creates are all seen. A
+  cached read costs no syscalls at all.
+- Without inotify (or if a directory can't be watched) entries are
+  validated by (mtime, inode, size) - one stat() instead of open+parse.
+
+Callbacks: watch(path, callback) calls callback(path) from the watcher
+thread whenever the file changes, so services can react immediately
+instead of waiting for their next poll. In stat mode a small poll thread
+stands in for inotify.
+
+Parse errors are cached too and re-raised to each caller until the file
+changes, so callers keep their existing try/except handling.
+
+Usage:
+    from file_watch import FileWatchCache
+    cache = FileWatchCache()
+    choice = cache.get(DATA_DIR / "autonomy_choice.json")   # parsed JSON or None
+    cache.watch(DATA_DIR / "autonomy_choice.json", lambda path: wake())
+"""
+
+import copy
+import ctypes
+import ctypes.util
+import json
+import logging
+import os
+import select
+import struct
+import threading
+import time
+
+# inotify constants (linux/inotify.h)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_IGNORED = 0x00008000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = (
+    IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+)
+
+EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+POLL_INTERVAL = 2.0  # seconds between stat checks for callbacks without inotify
+
+logger = logging.getLogger("clap.file-watch")
+
+
+def load_json(path):
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def _signature(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_ino, st.st_size)
+
+
+class _Inotify:
+    """Minimal ctypes wrapper around the inotify syscalls."""
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+    def add_watch(self, directory, mask=WATCH_MASK):
+        wd = self._add_watch(self.fd, os.fsencode(directory), mask)
+        if wd < 0:
+            raise OSError(
+                ctypes.get_errno(), f"inotify_add_watch failed for {directory}"
+            )
+        return wd
+
+    def read_events(self):
+        """Yield (wd, mask, name) for every queued event."""
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = (
+                data[offset : offset + length].rstrip(b"\0").decode("utf-8", "replace")
+            )
+            offset += length
+            yield wd, mask, name
+
+
+class _Entry:
+    __slots__ = ("value", "error", "signature", "generation")
+
+    def __init__(self, value, error, signature, generation):
+        self.value = value
+        self.error = error
+        self.signature = signature
+        self.generation = generation
+
+
+class FileWatchCache:
+    """Parsed-file cache with change callbacks."""
+
+    def __init__(self, use_inotify=True):
+        self._lock = threading.Lock()
+        self._entries = {}  # path -> _Entry
+        self._generations = {}  # path -> bumped on every change event
+        self._callbacks = {}  # path -> [callback]
+        self._dirs = {}  # directory -> wd (inotify) or None (stat mode)
+        self._wds = {}  # wd -> directory
+        self._poll_signatures = {}  # path -> last stat signature (no inotify)
+        self._inotify = None
+        self._thread = None
+        self._stop = threading.Event()
+        if use_inotify:
+            try:
+                self._inotify = _Inotify()
+            except (OSError, AttributeError) as e:
+                logger.info(f"inotify unavailable, using stat validation: {e}")
+
+    # -- reads ------------------------------------------------------------
+
+    def get(self, path, parser=load_json, default=None):
+        """Parsed contents of path, or default if it doesn't exist.
+
+        Re-raises the parser's exception if the current file is unparseable.
+        """
+        path = os.path.abspath(path)
+        watched = self._ensure_watched(path)
+        with self._lock:
+            entry = self._entries.get(path)
+            generation = self._generations.get(path, 0)
+        if entry is not None and entry.generation == generation:
+            if watched or entry.signature == _signature(path):
+                return self._result(entry, default)
+
+        signature = _signature(path)
+        value = error = None
+        if signature is not None:
+            try:
+                value = parser(path)
+            except FileNotFoundError:
+                signature = None
+            except Exception as e:
+                error = e
+        entry = _Entry(value, error, signature, generation)
+        with self._lock:
+            # Don't cache a read that raced with a change event
+            if self._generations.get(path, 0) == generation:
+                self._entries[path] = entry
+        return self._result(entry, default)
+
+    def invalidate(self, path=None):
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(os.path.abspath(path), None)
+
+    @staticmethod
+    def _result(entry, default):
+        if entry.error is not None:
+            raise entry.error
+        if entry.signature is None:
+            return default
+        # Callers may edit what they get back; keep the cached copy pristine
+        return copy.deepcopy(entry.value)
+
+    # -- change notification ----------------------------------------------
+
+    def watch(self, path, callback):
+        """Call callback(path) whenever path is created, replaced or deleted."""
+        path = os.path.abspath(path)
+        with self._lock:
+            self._callbacks.setdefault(path, []).append(callback)
+            self._poll_signatures.setdefault(path, _signature(path))
+        self._ensure_watched(path)
+        self._start_thread()
+
+    def stop(self):
+        self._stop.set()
+
+    def _ensure_watched(self, path):
+        """Watch path's directory. True if inotify covers it."""
+        if self._inotify is None:
+            return False
+        directory = os.path.dirname(path)
+        with self._lock:
+            if directory in self._dirs:
+                return self._dirs[directory] is not None
+            try:
+                wd = self._inotify.add_watch(directory)
+            except OSError as e:
+                logger.debug(f"Can't watch {directory}: {e}")
+                wd = None
+            self._dirs[directory] = wd
+            if wd is not None:
+                self._wds[wd] = directory
+        if wd is not None:
+            self._start_thread()
+        return wd is not None
+
+    def _start_thread(self):
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            target = self._inotify_loop if self._inotify else self._poll_loop
+            self._thread = threading.Thread(
+                target=target, name="file-watch", daemon=True
+            )
+            self._thread.start()
+
+    def _changed(self, path):
+        with self._lock:
+            self._generations[path] = self._generations.get(path, 0) + 1
+            self._entries.pop(path, None)
+            callbacks = list(self._callbacks.get(path, ()))
+        for callback in callbacks:
+            try:
+                callback(path)
+            except Exception as e:
+                logger.error(f"File watch callback failed for {path}: {e}")
+
+    def _inotify_loop(self):
+        fd = self._inotify.fd
+        next_poll = time.monotonic() + POLL_INTERVAL
+        while not self._stop.is_set():
+            # Unwatched paths are polled on a deadline: a steady stream of
+            # events (e.g. statusline rewrites) must not starve them
+            now = time.monotonic()
+            if now >= next_poll:
+                self._poll_unwatched()
+                next_poll = now + POLL_INTERVAL
+            readable, _, _ = select.select([fd], [], [], max(0.0, next_poll - now))
+            if not readable:
+                continue
+            for wd, mask, name in self._inotify.read_events():
+                directory = self._wds.get(wd)
+                if directory is None:
+                    continue
+                if mask & (IN_DELETE_SELF | IN_IGNORED):
+                    # Directory gone - drop back to stat validation for it
+                    with self._lock:
+                        self._dirs[directory] = None
+                        self._wds.pop(wd, None)
+                        self._entries = {
+                            p: e
+                            for p, e in self._entries.items()
+                            if os.path.dirname(p) != directory
+                        }
+                    continue
+                if name:
+                    self._changed(os.path.join(directory, name))
+
+    def _poll_unwatched(self):
+        """Stat-poll callback paths whose directory inotify isn't covering."""
+        with self._lock:
+            paths = [
+                p for p in self._callbacks if self._dirs.get(os.path.dirname(p)) is None
+            ]
+        self._check_signatures(paths)
+
+    def _poll_loop(self):
+        while not self._stop.wait(POLL_INTERVAL):
+            with self._lock:
+                paths = list(self._callbacks)
+            self._check_signatures(paths)
+
+    def _check_signatures(self, paths):
+        for path in paths:
+            signature = _signature(path)
+            with self._lock:
+                last = self._poll_signatures.get(path, signature)
+                self._poll_signatures[path] = signature
+            if signature != last:
+                self._changed(path)
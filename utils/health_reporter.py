@@ -17,6 +17,7 @@ from pathlib import Path
 HEALTH_DIR = Path(os.path.expanduser("~/.local/state/clap/health"))
 ESSENTIAL_DIR = HEALTH_DIR / "essential"
 OPTIONAL_DIR = HEALTH_DIR / "optional"
+METRICS_DIR = HEALTH_DIR / "metrics"
 
 # Staleness thresholds in seconds
 ESSENTIAL_STALE_SECONDS = 120   # 2 minutes (timer runs every 30s)
@@ -58,6 +59,27 @@ def write_status(name, tier, status, details="", source="unknown"):
         pass
 
 
+def write_metrics(name, metrics, source="unknown"):
+    """Write a component's latency metrics (not a pass/fail check).
+
+    Args:
+        name: Metrics file name (e.g. "autonomous_timer")
+        metrics: JSON-serialisable dict, e.g. LoopMetrics.summary()
+        source: Which component wrote this
+    """
+    METRICS_DIR.mkdir(parents=True, exist_ok=True)
+    data = {
+        "last_update": datetime.now(timezone.utc).isoformat(),
+        "source": source,
+        "metrics": metrics,
+    }
+    try:
+        with open(METRICS_DIR / f"{name}.json", "w") as f:
+            json.dump(data, f, indent=2)
+    except OSError:
+        pass
+
+
 def read_status(name, tier):
     """Read a health status file.
 
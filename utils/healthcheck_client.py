@@ -0,0 +1,171 @@
+"""Non-blocking healthchecks.io pinger shared by ClAP services.
+
+Services used to fork `curl --retry 3` for every ping, blocking their
+loop for up to 30s whenever hc-ping.com was slow. HealthcheckClient
+queues pings for a background thread that sends them over one
+keep-alive HTTP session:
+
+- ping()/start()/success()/fail() return immediately
+- failed pings are retried with exponential backoff (1s doubling to
+  60s), unless a newer ping has been queued, which supersedes them
+- loop_started()/loop_finished() time one loop iteration per interval
+  with a start + success (or fail) pair sharing a run id, so
+  healthchecks.io shows how long the service's loop takes
+
+The ping URL is read once, when the client is created. A client with no
+URL does nothing.
+
+Usage:
+    from healthcheck_client import HealthcheckClient
+    healthcheck = HealthcheckClient(get_config_value("SESSION_SWAP_PING"))
+    while True:
+        healthcheck.loop_started()
+        try:
+            do_work()
+            healthcheck.loop_finished()
+        except Exception as e:
+            healthcheck.loop_finished(error=e)
+"""
+
+import collections
+import logging
+import threading
+import time
+import uuid
+
+try:
+    from utils.lazy_import import lazy_import
+except ImportError:
+    from lazy_import import lazy_import
+
+requests = lazy_import("requests")  # Only the sender thread needs it
+
+PING_INTERVAL = 30  # seconds between timed loop iterations
+TIMEOUT = 10
+MAX_ATTEMPTS = 4
+BACKOFF_MIN = 1
+BACKOFF_MAX = 60
+MAX_QUEUED = 20  # oldest pings are dropped beyond this
+
+logger = logging.getLogger("clap.healthcheck")
+
+
+class HealthcheckClient:
+    """Fire-and-forget healthchecks.io pings from a background thread."""
+
+    def __init__(self, url, interval=PING_INTERVAL, timeout=TIMEOUT):
+        self.url = (url or "").strip().rstrip("/")
+        self.interval = interval
+        self.timeout = timeout
+        self.sent = 0
+        self.failed = 0
+        self.last_error = None
+        self._queue = collections.deque(maxlen=MAX_QUEUED)
+        self._cond = threading.Condition()
+        self._thread = None
+        self._session = None
+        self._backoff = 0
+        self._loop_rid = None
+        self._loop_started = None
+        self._last_timed = None
+
+    @property
+    def enabled(self):
+        return bool(self.url)
+
+    # -- pings ------------------------------------------------------------
+
+    def ping(self, kind="", body=None, rid=None):
+        """Queue a ping: kind is "" (success), "start" or "fail"."""
+        if not self.enabled:
+            return
+        with self._cond:
+            self._queue.append((kind, body, rid))
+            self._cond.notify()
+        self._start_thread()
+
+    def start(self, rid=None):
+        self.ping("start", rid=rid)
+
+    def success(self, body=None, rid=None):
+        self.ping("", body, rid)
+
+    def fail(self, body=None, rid=None):
+        self.ping("fail", body, rid)
+
+    # -- loop timing ------------------------------------------------------
+
+    def loop_started(self):
+        """Mark the start of a loop iteration. One per interval is timed."""
+        now = time.monotonic()
+        if self._loop_rid is not None:
+            return
+        if self._last_timed is not None and now - self._last_timed < self.interval:
+            return
+        self._last_timed = now
+        self._loop_started = now
+        self._loop_rid = str(uuid.uuid4())
+        self.start(self._loop_rid)
+
+    def loop_finished(self, error=None):
+        """Report the timed iteration (if this is one) as success or fail."""
+        if self._loop_rid is None:
+            return
+        rid, self._loop_rid = self._loop_rid, None
+        body = f"loop iteration took {time.monotonic() - self._loop_started:.3f}s"
+        if error is not None:
+            self.fail(f"{error}\n{body}", rid)
+        else:
+            self.success(body, rid)
+
+    # -- sender -----------------------------------------------------------
+
+    def _start_thread(self):
+        with self._cond:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="healthcheck", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        self._session = requests.Session()
+        while True:
+            with self._cond:
+                while not self._queue:
+                    self._cond.wait()
+                kind, body, rid = self._queue.popleft()
+
+            for attempt in range(1, MAX_ATTEMPTS + 1):
+                if self._backoff:
+                    time.sleep(self._backoff)
+                if self._send(kind, body, rid):
+                    self._backoff = 0
+                    break
+                self._backoff = min(max(self._backoff * 2, BACKOFF_MIN), BACKOFF_MAX)
+                with self._cond:
+                    if self._queue:
+                        break  # A newer ping supersedes this one
+            else:
+                logger.info(
+                    f"Giving up on healthcheck ping after {MAX_ATTEMPTS} attempts"
+                )
+
+    def _send(self, kind, body, rid):
+        url = f"{self.url}/{kind}" if kind else self.url
+        try:
+            response = self._session.post(
+                url,
+                data=(body or "").encode("utf-8"),
+                params={"rid": rid} if rid else None,
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+        except requests.RequestException as e:
+            self.failed += 1
+            self.last_error = str(e)
+            logger.info(f"Healthcheck ping failed: {e}")
+            return False
+        self.sent += 1
+        return True
@@ -2,41 +2,53 @@
 """
 Infrastructure Configuration Reader
 Reads values from claude_infrastructure_config.txt
+
+The file is parsed once and re-parsed only when its mtime, inode or size
+changes (see config_service.py), so get_config_value() is cheap enough
+for per-cycle and per-channel calls.
 """
 
 import os
-import re
 import sys
 
 # Add the utils directory to Python path so we can import claude_paths
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from claude_paths import get_clap_dir
+from claude_paths import get_infrastructure_config_file
+
+_reported_error = None
+
+
+def _lookup(method, *args):
+    """Call a ConfigFile getter on the shared, change-invalidated parse"""
+    global _reported_error
+    config = get_infrastructure_config_file()
+    result = getattr(config, method)(*args)
+    # Report a missing/unreadable file once, not on every lookup
+    if config.error != _reported_error:
+        _reported_error = config.error
+        if config.error:
+            print(f"Error reading infrastructure config: {config.error}")
+    return result
 
 def read_infrastructure_config():
     """Read configuration from claude_infrastructure_config.txt"""
-    config_path = os.path.join(get_clap_dir(), "config", "claude_infrastructure_config.txt")
-    config = {}
-    
-    try:
-        with open(config_path, 'r') as f:
-            content = f.read()
-            
-        # Find all KEY=VALUE pairs
-        for line in content.split('\n'):
-            line = line.strip()
-            if line and not line.startswith('#') and '=' in line:
-                key, value = line.split('=', 1)
-                config[key.strip()] = value.strip()
-                
-        return config
-    except Exception as e:
-        print(f"Error reading infrastructure config: {e}")
-        return {}
-
-def get_config_value(key, default=None):
-    """Get a specific config value"""
-    config = read_infrastructure_config()
-    return config.get(key, default)
+    return dict(_lookup("values"))
+
+def get_config_value(key, default=None, expand=False):
+    """Get a specific config value (expand=True resolves $LINUX_USER etc.)"""
+    return _lookup("get", key, default, expand)
+
+def get_config_int(key, default=None):
+    """Config value as an int, or default if missing or not a number"""
+    return _lookup("get_int", key, default)
+
+def get_config_float(key, default=None):
+    """Config value as a float, or default if missing or not a number"""
+    return _lookup("get_float", key, default)
+
+def get_config_bool(key, default=False):
+    """Config value as a bool (true/false, yes/no, on/off, 1/0)"""
+    return _lookup("get_bool", key, default)
 
 if __name__ == "__main__":
     if len(sys.argv) > 1:
@@ -0,0 +1,58 @@
+"""Deferred imports for modules that are slow to load and rarely needed early.
+
+requests alone is most of a service's import time, yet the health and
+resource reporters only use it from their background sender threads. A lazy module is
+a placeholder that imports the real module the first time one of its
+attributes is used, then copies the real module's namespace into itself
+so later lookups are ordinary attribute reads:
+
+    requests = lazy_import("requests")       # nothing imported yet
+    ...
+    requests.post(url, json=payload)         # imported here, once
+
+Thread-safe: the first concurrent users wait for one import. Import
+errors surface at first use, exactly as they would have at import.
+`python3 utils/startup_profile.py` shows what each entry point imports.
+
+Usage:
+    from lazy_import import lazy_import
+    requests = lazy_import("requests")
+"""
+
+import importlib
+import sys
+import threading
+import types
+
+
+class LazyModule(types.ModuleType):
+    """Module placeholder that imports the real module on first attribute use."""
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__["_lazy_lock"] = threading.Lock()
+        self.__dict__["_lazy_module"] = None
+
+    def _lazy_load(self):
+        with self._lazy_lock:
+            module = self.__dict__["_lazy_module"]
+            if module is None:
+                module = importlib.import_module(self.__name__)
+                self.__dict__.update(module.__dict__)
+                self.__dict__["_lazy_module"] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._lazy_load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self.__dict__["_lazy_module"] else "not loaded"
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+def lazy_import(name):
+    """The module if it's already imported, otherwise a LazyModule for it."""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
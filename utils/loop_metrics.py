@@ -0,0 +1,135 @@
+"""Lightweight latency metrics for ClAP service loops.
+
+Wrap a phase of work in a span and its duration is recorded:
+
+    with METRICS.span("context_check"):
+        check_context()
+
+Each series keeps its most recent WINDOW observations in memory, from
+which summary() reports rolling p50/p95/p99 (plus cumulative count and
+sum). The scheduler feeds it every duty's run time and its loop lag -
+how late the duty started compared to when it was due.
+
+write_prometheus() renders every series as a Prometheus summary into a
+textfile (for node_exporter's textfile collector); the same numbers go
+to the health dir via health_reporter.write_metrics().
+
+Usage:
+    from loop_metrics import LoopMetrics
+    metrics = LoopMetrics("clap_timer")
+    with metrics.span("tmux_capture"):
+        ...
+    metrics.observe("loop_lag_seconds", 0.02, duty="discord")
+    metrics.write_prometheus(DATA_DIR / "metrics" / "autonomous_timer.prom")
+"""
+
+import collections
+import math
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+WINDOW = 1024  # observations kept per series for percentiles
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class _Series:
+    __slots__ = ("samples", "count", "total", "last")
+
+    def __init__(self, window):
+        self.samples = collections.deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+        self.last = None
+
+
+def _percentile(ordered, q):
+    """Nearest-rank percentile of an already sorted list."""
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+class LoopMetrics:
+    """Rolling latency histograms keyed by metric name and labels."""
+
+    def __init__(self, prefix, window=WINDOW):
+        self.prefix = prefix
+        self.window = window
+        self._series = {}  # (metric, ((label, value), ...)) -> _Series
+        self._lock = threading.Lock()
+
+    def observe(self, metric, value, **labels):
+        key = (metric, tuple(sorted(labels.items())))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series(self.window)
+            series.samples.append(value)
+            series.count += 1
+            series.total += value
+            series.last = value
+
+    @contextmanager
+    def span(self, phase, metric="phase_seconds"):
+        """Time the body of a with-block as one observation of phase."""
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.observe(metric, time.monotonic() - started, phase=phase)
+
+    def summary(self):
+        """{metric: [{labels, count, sum, last, max, p50, p95, p99}, ...]}"""
+        with self._lock:
+            snapshot = [
+                (metric, labels, sorted(s.samples), s.count, s.total, s.last)
+                for (metric, labels), s in self._series.items()
+            ]
+        result = {}
+        for metric, labels, ordered, count, total, last in sorted(snapshot):
+            entry = {
+                "labels": dict(labels),
+                "count": count,
+                "sum": round(total, 6),
+                "last": round(last, 6),
+                "max": round(ordered[-1], 6),
+            }
+            for q in QUANTILES:
+                entry[f"p{int(q * 100)}"] = round(_percentile(ordered, q), 6)
+            result.setdefault(metric, []).append(entry)
+        return result
+
+    def to_prometheus(self):
+        """Every series as a Prometheus summary, in text exposition format."""
+        lines = []
+        for metric, entries in self.summary().items():
+            name = f"{self.prefix}_{metric}"
+            lines.append(f"# TYPE {name} summary")
+            for entry in entries:
+                labels = [f'{k}="{v}"' for k, v in entry["labels"].items()]
+                for q in QUANTILES:
+                    quantile = ",".join(labels + [f'quantile="{q}"'])
+                    lines.append(f"{name}{{{quantile}}} {entry[f'p{int(q * 100)}']}")
+                suffix = "{" + ",".join(labels) + "}" if labels else ""
+                lines.append(f"{name}_sum{suffix} {entry['sum']}")
+                lines.append(f"{name}_count{suffix} {entry['count']}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        """Atomically replace path with the current metrics."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(self.to_prometheus())
+            os.chmod(tmp, 0o644)  # readable by node_exporter
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
@@ -43,14 +43,21 @@ def find_rag_memory_db():
     print(f"❌ rag-memory.db not found. Set RAG_MEMORY_DB environment variable.", file=sys.stderr)
     sys.exit(1)
 
-DB_PATH = find_rag_memory_db()
+DB_PATH = None  # Resolved on first search, so importing this module never exits
+
+def get_db_path():
+    """rag-memory.db location, looked up once"""
+    global DB_PATH
+    if DB_PATH is None:
+        DB_PATH = find_rag_memory_db()
+    return DB_PATH
 
 def search_memory(query):
     """
     Simple text-based search of rag-memory database
     Returns: dict with entities, chunks, relationships
     """
-    conn = sqlite3.connect(DB_PATH)
+    conn = sqlite3.connect(get_db_path())
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
 
@@ -0,0 +1,213 @@
+"""Outbound message queue with a dedicated sender thread.
+
+Delivering a prompt to Claude (send_to_claude.sh) waits for Claude to
+stop thinking and can block for many minutes. Callers enqueue instead
+and carry on; one worker thread delivers messages in order of:
+
+- priority: PRIORITY_CRITICAL (e.g. critical context warnings) ahead of
+  PRIORITY_HIGH ahead of PRIORITY_NORMAL routine prompts, FIFO within
+  a priority
+- coalescing: a message enqueued with the same key as one still waiting
+  replaces its text rather than queueing a second copy, so repeated
+  notifications collapse to the latest one (key defaults to the text)
+- ttl: a message still waiting after ttl seconds is dropped unsent
+- on_sent: called (on the worker thread) only once the message was
+  actually delivered, for bookkeeping that mustn't happen for a message
+  that was coalesced away, expired or failed
+
+enqueue() returns a Delivery that tracks the message's status (queued,
+sending, sent, failed, coalesced, expired) and can be waited on.
+busy(key) says whether a message with that key is waiting or being sent.
+
+Usage:
+    from outbound_queue import OutboundQueue, PRIORITY_CRITICAL
+    outbound = OutboundQueue(deliver_func)       # deliver_func(text) -> bool
+    delivery = outbound.enqueue("hello", key="notification", ttl=600)
+    outbound.enqueue(prompt, key="turn", on_sent=consume_turn)
+    outbound.enqueue("95% context!", priority=PRIORITY_CRITICAL)
+    delivery.wait(5)                             # True once sent
+    outbound.status()                            # for health reporting
+"""
+
+import collections
+import heapq
+import itertools
+import logging
+import threading
+import time
+
+PRIORITY_CRITICAL = 0
+PRIORITY_HIGH = 1
+PRIORITY_NORMAL = 2
+
+HISTORY_SIZE = 50  # finished deliveries kept for status()
+
+
+class Delivery:
+    """Status of one enqueued message."""
+
+    def __init__(self, message_id, text, priority, key, ttl, on_sent=None):
+        self.id = message_id
+        self.text = text
+        self.priority = priority
+        self.key = key
+        self.expires = time.monotonic() + ttl if ttl else None
+        self.status = "queued"
+        self.queued_at = time.time()
+        self.started_at = None  # When the worker began sending it
+        self.finished_at = None
+        self.replaced_by = None
+        self.on_sent = on_sent
+        self._done = threading.Event()
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        """Block until delivered or given up on. True if it was sent.
+
+        A coalesced message follows its replacement, within the same timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        delivery = self
+        while True:
+            remaining = (
+                None if deadline is None else max(0.0, deadline - time.monotonic())
+            )
+            delivery._done.wait(remaining)
+            if delivery.replaced_by is None:
+                return delivery.status == "sent"
+            delivery = delivery.replaced_by
+
+    def _finish(self, status):
+        self.status = status
+        self.finished_at = time.time()
+        self._done.set()
+
+    def summary(self):
+        return {
+            "id": self.id,
+            "status": self.status,
+            "priority": self.priority,
+            "key": self.key,
+            "queued_at": self.queued_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "preview": self.text[:50],
+        }
+
+
+class OutboundQueue:
+    """Priority queue of outbound messages drained by one worker thread."""
+
+    def __init__(self, deliver, logger=None):
+        self.deliver = deliver
+        self.logger = logger or logging.getLogger("clap.outbound-queue")
+        self._heap = []  # (priority, seq, Delivery)
+        self._pending = {}  # key -> queued Delivery
+        self._history = collections.deque(maxlen=HISTORY_SIZE)
+        self._current = None
+        self._seq = itertools.count(1)
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stopping = False
+
+    def start(self):
+        with self._cond:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stopping = False
+            self._thread = threading.Thread(
+                target=self._run, name="outbound-queue", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout=None):
+        """Stop the worker once the message being sent (if any) finishes."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def enqueue(self, text, priority=PRIORITY_NORMAL, key=None, ttl=None, on_sent=None):
+        """Queue text for delivery and return its Delivery."""
+        key = key or text
+        with self._cond:
+            delivery = Delivery(next(self._seq), text, priority, key, ttl, on_sent)
+            previous = self._pending.pop(key, None)
+            if previous is not None:
+                # Latest text wins; keep the more urgent priority
+                delivery.priority = min(priority, previous.priority)
+                previous.replaced_by = delivery
+                previous._finish("coalesced")
+                self._history.append(previous)
+            self._pending[key] = delivery
+            heapq.heappush(self._heap, (delivery.priority, delivery.id, delivery))
+            self._cond.notify()
+        self.start()
+        return delivery
+
+    def pending(self):
+        with self._cond:
+            return len(self._pending)
+
+    def busy(self, key):
+        """True while a message with this key is waiting or being sent."""
+        with self._cond:
+            return key in self._pending or (
+                self._current is not None and self._current.key == key
+            )
+
+    def status(self):
+        """Queue depth, the message in flight and recent outcomes."""
+        with self._cond:
+            return {
+                "pending": len(self._pending),
+                "sending": self._current.summary() if self._current else None,
+                "recent": [d.summary() for d in self._history],
+            }
+
+    def _next(self):
+        """Highest-priority live delivery, waiting for one if necessary."""
+        with self._cond:
+            while not self._stopping:
+                while self._heap:
+                    _, _, delivery = heapq.heappop(self._heap)
+                    if delivery.done:
+                        continue  # coalesced into a later message
+                    self._pending.pop(delivery.key, None)
+                    if delivery.expires and time.monotonic() > delivery.expires:
+                        delivery._finish("expired")
+                        self._history.append(delivery)
+                        self.logger.info(
+                            f"Dropped stale message before sending: {delivery.text[:50]}..."
+                        )
+                        continue
+                    delivery.status = "sending"
+                    delivery.started_at = time.time()
+                    self._current = delivery
+                    return delivery
+                self._cond.wait()
+            return None
+
+    def _run(self):
+        while True:
+            delivery = self._next()
+            if delivery is None:
+                return
+            try:
+                sent = bool(self.deliver(delivery.text))
+            except Exception as e:
+                self.logger.error(f"Delivering queued message: {e}")
+                sent = False
+            if sent and delivery.on_sent is not None:
+                try:
+                    delivery.on_sent()
+                except Exception as e:
+                    self.logger.error(f"After delivering queued message: {e}")
+            with self._cond:
+                self._current = None
+                delivery._finish("sent" if sent else "failed")
+                self._history.append(delivery)
@@ -0,0 +1,100 @@
+"""Per-cycle tmux pane snapshots shared by every pane consumer.
+
+Error detection wants the pane with colour codes, rate-limit menu
+detection wants plain text, and state detection wants the last few
+lines. Rather than each capturing the pane itself, they all read one
+PaneSnapshot: captured once (with escapes), stamped with a timestamp and
+a content hash, with the ANSI-stripped view derived on demand.
+
+A snapshot younger than max_age is reused, so consumers running in the
+same scheduler pass share a single capture. The digest lets callers
+skip work when the pane hasn't changed since they last looked.
+
+Usage:
+    from pane_snapshot import get_snapshot
+    snap = get_snapshot("autonomous-claude")
+    if snap and snap.digest != last_digest:
+        scan(snap.raw)
+    if snap and "> /rate-limit-options" in snap.plain: ...
+"""
+
+import hashlib
+import re
+import threading
+import time
+
+try:
+    from utils.tmux_control import capture_pane
+except ImportError:
+    from tmux_control import capture_pane
+
+DEFAULT_MAX_AGE = 2.0  # seconds a snapshot counts as "this cycle"
+
+# CSI sequences (colours, cursor movement) and OSC sequences (titles, links)
+ANSI_RE = re.compile(r"\x1b\[[0-9;?]*[ -/]*[@-~]|\x1b\][^\x07\x1b]*(?:\x07|\x1b\\)")
+
+
+def strip_ansi(text):
+    """Remove terminal escape sequences, leaving the visible text."""
+    return ANSI_RE.sub("", text)
+
+
+class PaneSnapshot:
+    """One capture of a pane: raw ANSI text plus derived views."""
+
+    __slots__ = ("target", "raw", "timestamp", "captured_at", "digest", "_plain")
+
+    def __init__(self, target, raw):
+        self.target = target
+        self.raw = raw
+        self.timestamp = time.time()
+        self.captured_at = time.monotonic()
+        self.digest = hashlib.blake2b(
+            raw.encode("utf-8", "replace"), digest_size=16
+        ).hexdigest()
+        self._plain = None
+
+    @property
+    def plain(self):
+        """The pane text with escape sequences stripped (computed once)."""
+        if self._plain is None:
+            self._plain = strip_ansi(self.raw)
+        return self._plain
+
+    @property
+    def age(self):
+        return time.monotonic() - self.captured_at
+
+
+_cache = {}
+_lock = threading.Lock()
+
+
+def get_snapshot(target, max_age=DEFAULT_MAX_AGE, start=None):
+    """Latest snapshot of target, capturing only if the cached one is stale.
+
+    start: optional capture-pane -S value (negative = include scrollback).
+    Returns None if the pane can't be captured.
+    """
+    key = (target, start)
+    with _lock:
+        snapshot = _cache.get(key)
+        if snapshot is not None and snapshot.age <= max_age:
+            return snapshot
+
+    raw = capture_pane(target, escapes=True, start=start)
+    if raw is None:
+        return None
+
+    snapshot = PaneSnapshot(target, raw)
+    with _lock:
+        _cache[key] = snapshot
+    return snapshot
+
+
+def invalidate(target=None):
+    """Drop cached snapshots (all, or just those for target)."""
+    with _lock:
+        for key in list(_cache):
+            if target is None or key[0] == target:
+                del _cache[key]
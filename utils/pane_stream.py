@@ -0,0 +1,270 @@
+"""Incremental error scanner fed by tmux pipe-pane.
+
+Instead of regex-scanning the whole captured pane every cycle, this tails
+the pane's output stream and scans only newly written bytes, raising a
+typed event (usage_limit, api_500_error, oauth_error, approaching_limit)
+as soon as the error text is drawn.
+
+The old pipe-pane session logging was removed for instability (see
+docs/pipe-pane-instability-report.md): a log file on disk shared with
+other tools, unbounded growth, and pipes left dangling when things
+restarted. This avoids each of those:
+
+- No file: tmux writes into a private FIFO (mode 0700 temp dir) that only
+  this process reads. Kernel pipe buffers are bounded, and the in-memory
+  ring buffer is capped at buffer_size bytes.
+- Single writer: we only attach if the pane has no pipe already, so we
+  never replace (or get replaced by) another pipe-pane user.
+- Detach/reattach: when the writer goes away (pane restarted, session
+  swapped) the reader sees EOF and reattaches with backoff; stop() and
+  interpreter exit always detach the pipe.
+
+Events are hints, not verdicts: callers should treat them as "look now"
+and let detect_api_errors() on a fresh capture decide what to do.
+
+Usage:
+    from pane_stream import PaneStreamScanner
+    scanner = PaneStreamScanner("autonomous-claude", on_event)
+    scanner.start()       # on_event({"error_type": "usage_limit", ...})
+    scanner.stop()
+"""
+
+import atexit
+import logging
+import os
+import re
+import select
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+
+BUFFER_SIZE = 64 * 1024  # bytes of recent output kept in memory
+OVERLAP = 1024  # bytes re-scanned so matches split across reads are caught
+EVENT_COOLDOWN = 10  # seconds before the same event type is raised again
+REATTACH_MIN = 2
+REATTACH_MAX = 60
+
+logger = logging.getLogger("clap.pane-stream")
+
+_TEXT = rb"[^\x1b]*?"  # text within one colour run
+_TIME = rb"(\d{1,2}(?::\d{2})?(?:am|pm)?)"
+_PINK = rb"\x1b\[38;5;211m"
+
+# One precompiled alternation; the named group that matched is the type.
+# Same colour/text rules as detect_api_errors(), applied to the raw stream.
+STREAM_PATTERNS = re.compile(
+    rb"(?P<usage_limit>"
+    + _PINK
+    + _TEXT
+    + rb"limit will reset at "
+    + _TIME
+    + rb"\s*\(([^)\x1b]+)\))"
+    rb"|(?P<api_500_error>"
+    + _PINK
+    + _TEXT
+    + rb"(?:500"
+    + _TEXT
+    + rb"error|internal"
+    + _TEXT
+    + rb"server"
+    + _TEXT
+    + rb"error))"
+    rb"|(?P<oauth_error>\x1b\[(?:38;5;211|31|91)m"
+    + _TEXT
+    + rb"(?:401|authentication_error|oauth"
+    + _TEXT
+    + rb"expired|token has expired))"
+    rb"|(?P<approaching_limit>\x1b\[38;5;220m"
+    + _TEXT
+    + rb"approaching"
+    + _TEXT
+    + rb"usage"
+    + _TEXT
+    + rb"limit"
+    + _TEXT
+    + rb"(?:\xc2\xb7|\xe2\x80\xa2|\.)"
+    + _TEXT
+    + rb"reset"
+    + _TEXT
+    + _TIME
+    + rb")",
+    re.IGNORECASE,
+)
+
+EVENT_DETAILS = {
+    "usage_limit": "Usage limit reached (stream)",
+    "api_500_error": "API 500 error (stream)",
+    "oauth_error": "OAuth token expired (stream)",
+    "approaching_limit": "Approaching usage limit warning (stream)",
+}
+
+
+def _decode(value):
+    return value.decode("utf-8", errors="replace") if value else None
+
+
+class PaneStreamScanner:
+    """Tails one tmux pane via pipe-pane and raises typed error events."""
+
+    def __init__(self, target, on_event, buffer_size=BUFFER_SIZE):
+        self.target = target
+        self.on_event = on_event
+        self.buffer_size = buffer_size
+        self.buffer = bytearray()  # ring buffer of recent output
+        self.bytes_seen = 0
+        self.events = 0
+        self._tail = b""
+        self._last_event = {}
+        self._dir = None
+        self._fifo = None
+        self._attached = False
+        self._stop = threading.Event()
+        self._thread = None
+
+    # -- lifecycle --------------------------------------------------------
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._dir = tempfile.mkdtemp(prefix="clap-pane-stream-")
+        self._fifo = os.path.join(self._dir, "pane.fifo")
+        os.mkfifo(self._fifo, 0o600)
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="pane-stream", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def stop(self):
+        self._stop.set()
+        self._detach()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=3)
+        if self._dir:
+            shutil.rmtree(self._dir, ignore_errors=True)
+            self._dir = None
+
+    def recent(self):
+        """Recent raw output (up to buffer_size bytes) as text."""
+        return bytes(self.buffer).decode("utf-8", errors="replace")
+
+    # -- pipe management --------------------------------------------------
+
+    def _tmux(self, *args):
+        try:
+            return subprocess.run(
+                ["tmux", *args], capture_output=True, text=True, timeout=5
+            )
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.debug(f"tmux {args[0]} failed: {e}")
+            return None
+
+    def _attach(self):
+        """Point the pane's output at our FIFO. True if we now own the pipe."""
+        probe = self._tmux("display-message", "-p", "-t", self.target, "#{pane_pipe}")
+        if probe is None or probe.returncode != 0:
+            return False
+        if probe.stdout.strip() == "1":
+            logger.warning(
+                f"{self.target} already has a pipe-pane writer - not attaching"
+            )
+            return False
+        # -O: pane output only, nothing is written back into the pane
+        result = self._tmux(
+            "pipe-pane", "-O", "-t", self.target, f"exec cat > '{self._fifo}'"
+        )
+        self._attached = result is not None and result.returncode == 0
+        return self._attached
+
+    def _detach(self):
+        if self._attached:
+            self._attached = False
+            self._tmux("pipe-pane", "-t", self.target)  # no command = close pipe
+
+    # -- reading ----------------------------------------------------------
+
+    def _run(self):
+        backoff = REATTACH_MIN
+        while not self._stop.is_set():
+            fd = None
+            try:
+                # Open our end first (non-blocking) so the writer's open
+                # never blocks tmux
+                fd = os.open(self._fifo, os.O_RDONLY | os.O_NONBLOCK)
+                if self._attach():
+                    logger.info(f"Streaming {self.target} output for error detection")
+                    if self._pump(fd):
+                        backoff = REATTACH_MIN
+            except OSError as e:
+                logger.warning(f"Pane stream error: {e}")
+            finally:
+                if fd is not None:
+                    os.close(fd)
+                self._detach()
+            if self._stop.wait(backoff):
+                break
+            backoff = min(backoff * 2, REATTACH_MAX)
+
+    def _pump(self, fd):
+        """Read until the writer goes away. Returns True if data flowed."""
+        got_data = False
+        while not self._stop.is_set():
+            readable, _, _ = select.select([fd], [], [], 1.0)
+            if not readable:
+                continue
+            try:
+                chunk = os.read(fd, 65536)
+            except BlockingIOError:
+                continue
+            if not chunk:
+                logger.info(f"{self.target} pipe closed - reattaching")
+                return got_data
+            got_data = True
+            self.feed(chunk)
+        return got_data
+
+    def feed(self, chunk):
+        """Scan newly appended bytes (plus a small overlap) for errors."""
+        self.bytes_seen += len(chunk)
+        self.buffer += chunk
+        if len(self.buffer) > self.buffer_size:
+            del self.buffer[: len(self.buffer) - self.buffer_size]
+
+        window = self._tail + chunk
+        fresh_from = len(self._tail)
+        self._tail = window[-OVERLAP:]
+
+        for match in STREAM_PATTERNS.finditer(window):
+            # Matches wholly inside the overlap were reported last time
+            if match.end() <= fresh_from:
+                continue
+            self._emit(match)
+
+    def _emit(self, match):
+        error_type = match.lastgroup
+        now = time.monotonic()
+        if now - self._last_event.get(error_type, -EVENT_COOLDOWN) < EVENT_COOLDOWN:
+            return
+        self._last_event[error_type] = now
+
+        event = {
+            "error_type": error_type,
+            "details": EVENT_DETAILS[error_type],
+            "reset_time": None,
+        }
+        groups = match.groups()
+        index = match.re.groupindex[error_type]
+        if error_type == "usage_limit":
+            event["reset_time"] = _decode(groups[index])
+            event["timezone"] = _decode(groups[index + 1])
+        elif error_type == "approaching_limit":
+            event["reset_time"] = _decode(groups[index])
+
+        self.events += 1
+        try:
+            self.on_event(event)
+        except Exception as e:
+            logger.error(f"Pane stream event handler failed: {e}")
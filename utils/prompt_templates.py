@@ -0,0 +1,262 @@
+"""Validated, precompiled prompt templates from config/prompts.json.
+
+The timer used to json.load prompts.json once at import and str.format
+raw template strings at every use, so an edited template needed a
+restart and a typo ({percentage:.0q}, {pecentage}) only surfaced as an
+exception in the middle of a cycle. PromptRegistry instead:
+
+- validates every template when the file is loaded: each field must be
+  one its caller supplies (TEMPLATE_FIELDS, or any known field for
+  templates the code doesn't know yet), and a trial render with sample
+  values must succeed
+- precompiles each template into its literal chunks and field slots, so
+  a render is one join; templates without fields render once at load
+- caches derived strings (the swap command list) with the templates
+- reload() swaps in a new version atomically and keeps the previous good
+  one if the new file is invalid, logging why
+
+Usage:
+    from prompt_templates import PromptRegistry
+    prompts = PromptRegistry(CONFIG_DIR / "prompts.json")
+    prompts.render("autonomy_turn", turn_number=1, total_turns=3, ...)
+    prompts.threshold("context_critical", 95)
+    cache.watch(CONFIG_DIR / "prompts.json", lambda path: prompts.reload())
+
+    python3 utils/prompt_templates.py check [config/prompts.json]
+"""
+
+import json
+import logging
+import os
+import string
+import sys
+import threading
+from pathlib import Path
+
+logger = logging.getLogger("clap.prompts")
+
+DEFAULT_SWAP_KEYWORDS = ["AUTONOMY", "BUSINESS", "CREATIVE", "HEDGEHOGS", "NONE"]
+DEFAULT_SWAP_FORMAT = "session_swap {keyword}"
+
+# Fields each caller passes to its template
+TEMPLATE_FIELDS = {
+    "context_first_warning": {"percentage", "discord_notification"},
+    "context_escalated": {"percentage", "discord_notification"},
+    "context_critical": {"percentage", "discord_notification"},
+    "autonomy_normal": {
+        "percentage",
+        "discord_notification",
+        "current_time",
+        "context_line",
+        "day_of_week",
+    },
+    "autonomy_turn": {
+        "turn_number",
+        "total_turns",
+        "current_time",
+        "discord_notification",
+        "context_line",
+    },
+    "discord_urgent_with_context": {"notification_line", "current_time", "percentage"},
+    "discord_new_message": {"emoji", "prefix", "message_info"},
+    "session_complete": {"time", "keyword"},  # rendered by session_swap.sh
+}
+
+# Sample values for the trial render at load time
+FIELD_SAMPLES = {
+    "percentage": 87.5,
+    "turn_number": 2,
+    "total_turns": 5,
+    "discord_notification": "\n🔔 Unread messages in: #general",
+    "notification_line": "\n🔔 Unread messages in: #general",
+    "current_time": "2025-01-01 12:00",
+    "time": "2025-01-01 12:00",
+    "context_line": "Context: 87.5%",
+    "day_of_week": "Wednesday",
+    "keyword": "AUTONOMY",
+    "emoji": "🔔",
+    "prefix": "Reminder:",
+    "message_info": "#general",
+}
+
+
+class PromptTemplateError(ValueError):
+    """prompts.json (or one template in it) is invalid."""
+
+
+class CompiledTemplate:
+    """A template split once into literal chunks and (field, spec, conversion) slots."""
+
+    __slots__ = ("name", "fields", "_literals", "_slots", "_static")
+
+    def __init__(self, name, text):
+        self.name = name
+        self._literals = []
+        self._slots = []
+        literal = []
+        try:
+            parsed = list(string.Formatter().parse(text))
+        except ValueError as e:
+            raise PromptTemplateError(f"{name}: {e}") from None
+        for chunk, field, spec, conversion in parsed:
+            literal.append(chunk)
+            if field is None:
+                continue
+            if not field.isidentifier():
+                raise PromptTemplateError(
+                    f"{name}: field '{{{field}}}' must be a plain name"
+                )
+            if spec and ("{" in spec or "}" in spec):
+                raise PromptTemplateError(
+                    f"{name}: nested field in '{{{field}:{spec}}}'"
+                )
+            self._literals.append("".join(literal))
+            self._slots.append((field, spec, conversion))
+            literal = []
+        self._literals.append("".join(literal))
+        self.fields = {field for field, _, _ in self._slots}
+        self._static = self._literals[0] if not self._slots else None
+
+    def render(self, values):
+        if self._static is not None:
+            return self._static
+        parts = [self._literals[0]]
+        for (field, spec, conversion), literal in zip(self._slots, self._literals[1:]):
+            value = values[field]
+            if conversion == "r":
+                value = repr(value)
+            elif conversion == "s":
+                value = str(value)
+            elif conversion == "a":
+                value = ascii(value)
+            parts.append(format(value, spec))
+            parts.append(literal)
+        return "".join(parts)
+
+
+class PromptSet:
+    """One validated version of prompts.json."""
+
+    def __init__(self, config):
+        if not isinstance(config, dict):
+            raise PromptTemplateError("top level must be a JSON object")
+        self.config = config
+        self.templates = {}
+        for name, entry in (config.get("prompts") or {}).items():
+            text = entry.get("template") if isinstance(entry, dict) else None
+            if not isinstance(text, str):
+                raise PromptTemplateError(f"{name}: missing 'template' string")
+            template = CompiledTemplate(name, text)
+            allowed = TEMPLATE_FIELDS.get(name, FIELD_SAMPLES.keys())
+            unknown = template.fields - set(allowed)
+            if unknown:
+                raise PromptTemplateError(
+                    f"{name}: unknown field(s) {', '.join(sorted(unknown))} "
+                    f"(available: {', '.join(sorted(allowed))})"
+                )
+            try:
+                template.render(FIELD_SAMPLES)
+            except (ValueError, TypeError) as e:
+                raise PromptTemplateError(f"{name}: {e}") from None
+            self.templates[name] = template
+
+        self.thresholds = config.get("thresholds") or {}
+        for key, value in self.thresholds.items():
+            if not isinstance(value, (int, float)) or isinstance(value, bool):
+                raise PromptTemplateError(f"thresholds.{key} must be a number")
+
+        swap = config.get("swap_commands") or {}
+        keywords = swap.get("keywords", DEFAULT_SWAP_KEYWORDS)
+        command = CompiledTemplate(
+            "swap_commands", swap.get("new_format", DEFAULT_SWAP_FORMAT)
+        )
+        if command.fields - {"keyword"}:
+            raise PromptTemplateError("swap_commands.new_format may only use {keyword}")
+        self.swap_commands = " | ".join(
+            command.render({"keyword": kw}) for kw in keywords
+        )
+
+
+class PromptRegistry:
+    """The current PromptSet for a prompts.json, reloaded on demand."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._current = None
+        self.reload()
+
+    @property
+    def loaded(self):
+        return self._current is not None
+
+    @property
+    def config(self):
+        current = self._current
+        return current.config if current else {}
+
+    def reload(self):
+        """Load the file again. On any error the previous version stays in use."""
+        try:
+            with open(self.path, "r") as f:
+                config = json.load(f)
+            prompts = PromptSet(config)
+        except FileNotFoundError:
+            logger.info(f"Prompts configuration file not found: {self.path}")
+            return False
+        except (ValueError, OSError) as e:
+            keeping = (
+                "keeping previous prompts"
+                if self._current
+                else "using built-in prompts"
+            )
+            logger.error(f"Invalid prompts configuration {self.path}: {e} - {keeping}")
+            return False
+        with self._lock:
+            replaced = self._current is not None
+            self._current = prompts
+        if replaced:
+            logger.info(f"Reloaded {len(prompts.templates)} prompt templates")
+        return True
+
+    def has(self, name):
+        current = self._current
+        return bool(current and name in current.templates)
+
+    def render(self, name, **values):
+        """The rendered template, or None if there is no such template."""
+        current = self._current
+        template = current.templates.get(name) if current else None
+        return template.render(values) if template else None
+
+    def threshold(self, name, default):
+        current = self._current
+        return current.thresholds.get(name, default) if current else default
+
+    def swap_commands(self):
+        current = self._current
+        if current:
+            return current.swap_commands
+        return " | ".join(
+            DEFAULT_SWAP_FORMAT.format(keyword=kw) for kw in DEFAULT_SWAP_KEYWORDS
+        )
+
+
+def main(argv):
+    if len(argv) < 2 or argv[1] != "check":
+        print("Usage: prompt_templates.py check [prompts.json]")
+        return 1
+    clap_dir = Path(os.environ.get("CLAP_DIR", Path(__file__).resolve().parent.parent))
+    path = Path(argv[2]) if len(argv) > 2 else clap_dir / "config" / "prompts.json"
+    try:
+        with open(path, "r") as f:
+            prompts = PromptSet(json.load(f))
+    except (OSError, ValueError) as e:
+        print(f"❌ {path}: {e}")
+        return 1
+    print(f"✅ {path}: {len(prompts.templates)} templates OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,236 @@
+"""Durable, batched reporter for CoOP resource-share cost deltas.
+
+check_usage() moves its cost baseline as soon as it computes a delta, so
+a delta that fails to POST used to be lost for good. Here every delta is
+first committed to a small SQLite spool, then a background thread sends
+it:
+
+- batching: everything waiting in the spool is summed per mode into one
+  /resource-share/increment POST, so a backlog replays as one request
+- durability: rows are deleted only after the server accepts them, so
+  deltas survive webhook outages and timer restarts
+- backoff: failed sends retry after 5s, doubling up to 5 minutes
+- identity: claude_name, hostname and IP are resolved once
+- responses: every accepted POST's JSON (recommended_interval,
+  overdue_alerts, ...) is handed to on_response, whichever send it
+  came from
+
+utils/coop_standin_server.py is a local stand-in for the CoOP server.
+
+Usage:
+    from resource_reporter import ResourceShareReporter
+    reporter = ResourceShareReporter(url, DATA_DIR / "resource_share_spool.sqlite3",
+                                     claude_name="Delta", on_response=apply)
+    reporter.report(0.0123, mode="autonomy", current_interval=1800)
+
+    python3 utils/resource_reporter.py status    # what's waiting in the spool
+"""
+
+import logging
+import os
+import socket
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+
+try:
+    from utils.lazy_import import lazy_import
+except ImportError:
+    from lazy_import import lazy_import
+
+requests = lazy_import("requests")  # Only the sender thread needs it
+
+SPOOL_DB = "resource_share_spool.sqlite3"  # in data/
+TIMEOUT = 5
+BACKOFF_MIN = 5
+BACKOFF_MAX = 300
+
+logger = logging.getLogger("clap.resource-share")
+
+
+def resolve_identity():
+    """(hostname, ip_address) for parallel instance detection."""
+    hostname = socket.gethostname()
+    try:
+        ip_address = socket.gethostbyname(hostname)
+    except OSError:
+        ip_address = "unknown"
+    return hostname, ip_address
+
+
+class ResourceSpool:
+    """Unsent cost deltas, committed to SQLite before anything is sent."""
+
+    def __init__(self, path):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(path), timeout=5, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS spool ("
+            "id INTEGER PRIMARY KEY, created REAL NOT NULL, mode TEXT NOT NULL, "
+            "cost_delta REAL NOT NULL, current_interval INTEGER)"
+        )
+
+    def add(self, cost_delta, mode, current_interval):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO spool (created, mode, cost_delta, current_interval) "
+                "VALUES (?, ?, ?, ?)",
+                (time.time(), mode, cost_delta, current_interval),
+            )
+
+    def batches(self):
+        """Pending deltas summed per mode: [(mode, total, interval, last_id)]."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT mode, SUM(cost_delta), MAX(id) FROM spool GROUP BY mode"
+            ).fetchall()
+            result = []
+            for mode, total, last_id in rows:
+                # The most recent interval is the one the server should see
+                interval = self._conn.execute(
+                    "SELECT current_interval FROM spool WHERE id = ?", (last_id,)
+                ).fetchone()[0]
+                result.append((mode, total, interval, last_id))
+            return result
+
+    def remove(self, mode, up_to_id):
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM spool WHERE mode = ? AND id <= ?", (mode, up_to_id)
+            )
+
+    def summary(self):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT mode, COUNT(*), SUM(cost_delta), MIN(created) "
+                "FROM spool GROUP BY mode"
+            ).fetchall()
+
+
+class ResourceShareReporter:
+    """Spools cost deltas and delivers them to the CoOP webhook."""
+
+    def __init__(self, url, spool_path, claude_name="Unknown", on_response=None):
+        self.url = url
+        self.claude_name = claude_name
+        self.on_response = on_response
+        self.spool = ResourceSpool(spool_path)
+        self._identity = None
+        self._session = None
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._backoff = 0
+
+    def report(self, cost_delta, mode, current_interval=None):
+        """Record a cost delta durably and return; sending happens later."""
+        self.spool.add(cost_delta, mode, current_interval)
+        self.start()
+        self._wakeup.set()
+
+    def start(self):
+        """Start the sender (also replays anything left from last run)."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="resource-share", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self):
+        self._session = requests.Session()
+        while True:
+            try:
+                if self._identity is None:
+                    self._identity = resolve_identity()
+                sent = self._send_pending()
+            except Exception as e:
+                # Never let the sender thread die silently; treat as a failed send
+                logger.error(f"Resource-share sender error: {e}")
+                sent = False
+            if sent:
+                self._backoff = 0
+                self._wakeup.wait()
+            else:
+                self._backoff = min(max(self._backoff * 2, BACKOFF_MIN), BACKOFF_MAX)
+                logger.info(
+                    f"Resource-share send failed - retrying in {self._backoff}s"
+                )
+                time.sleep(self._backoff)
+            self._wakeup.clear()
+
+    def _send_pending(self):
+        """Send every pending batch. False if any is still unsent."""
+        hostname, ip_address = self._identity
+        for mode, total, interval, last_id in self.spool.batches():
+            payload = {
+                "claude_name": self.claude_name,
+                "cost_delta": round(total, 6),
+                "mode": mode,
+                "current_interval": interval,
+                "hostname": hostname,  # Parallel instance detection
+                "ip_address": ip_address,  # Parallel instance detection
+            }
+            try:
+                response = self._session.post(self.url, json=payload, timeout=TIMEOUT)
+            except requests.exceptions.RequestException as e:
+                logger.warning(f"resource-share webhook request failed: {e}")
+                return False
+            if 400 <= response.status_code < 500 and response.status_code != 429:
+                # Rejected outright: retrying can't help, and it would hold
+                # back every later delta
+                logger.error(
+                    f"Resource-share webhook rejected ${total:.4f} ({mode}) with "
+                    f"{response.status_code} - dropping it: {response.text[:200]}"
+                )
+                self.spool.remove(mode, last_id)
+                continue
+            if response.status_code != 200:
+                logger.warning(
+                    f"Resource-share webhook returned {response.status_code}"
+                )
+                return False
+
+            self.spool.remove(mode, last_id)
+            logger.debug(
+                f"Resource-share reported ${total:.4f} cost for {self.claude_name}"
+            )
+            try:
+                data = response.json()
+            except ValueError as e:
+                logger.debug(f"Could not parse resource-share response: {e}")
+                continue
+            if self.on_response and isinstance(data, dict):
+                try:
+                    self.on_response(data)
+                except Exception as e:
+                    logger.error(f"Handling resource-share response: {e}")
+        return True
+
+
+def main(argv):
+    if len(argv) < 2 or argv[1] != "status":
+        print("Usage: resource_reporter.py status")
+        return 1
+    clap_dir = Path(os.environ.get("CLAP_DIR", Path(__file__).resolve().parent.parent))
+    spool_path = clap_dir / "data" / SPOOL_DB
+    if not spool_path.exists():
+        print("No resource-share spool")
+        return 0
+    rows = ResourceSpool(spool_path).summary()
+    if not rows:
+        print("Spool empty - everything has been reported")
+    for mode, count, total, oldest in rows:
+        age = time.time() - oldest
+        print(
+            f"{mode}: {count} deltas, ${total:.4f} unsent (oldest {age / 60:.0f}m ago)"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
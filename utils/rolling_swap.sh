@@ -157,6 +157,7 @@ sleep 2
 
 rm -f "$CLAP_DIR/data/api_error_state.json"
 rm -f "$CLAP_DIR/data/context_escalation_state.json"
+python3 "$CLAP_DIR/utils/state_store.py" delete context_state || true
 rm -f "$CLAP_DIR/data/last_discord_notification.txt"
 rm -f "/tmp/${USER}_context_marker_placed"
 rm -f "/tmp/${USER}_rolling_swap_triggered"
@@ -0,0 +1,300 @@
+"""Duty scheduler for long-running ClAP services.
+
+Replaces the "do everything, then sleep 30s" loop with a set of named
+duties, each with its own cadence:
+
+- interval: how often the duty runs
+- jitter:   fraction of the interval randomly added/removed per run, so
+            duties with equal cadence don't all fire on the same tick
+- deadline: how late (seconds) a run may start before we log an overrun
+
+Given a LoopMetrics, every run's duration and loop lag (start time minus
+due time) are recorded per duty.
+
+The scheduler sleeps until the next duty is due, and any thread (file
+watcher, stream scanner) can call wake() to run a duty immediately
+instead of waiting out its interval. Signal handlers must not call wake()
+(they can interrupt a holder of the scheduler's lock); wake_on_signal()
+installs one that does it safely. schedule() adds a
+one-shot duty, for "check again in N seconds" follow-ups that must not
+hold up everything else by sleeping inside a duty.
+
+Usage:
+    from scheduler import Scheduler
+    scheduler = Scheduler(logger)
+    scheduler.add("resource_usage", track_resource_usage, interval=30, jitter=0.1)
+    scheduler.add("discord", check_discord, interval=30, deadline=5)
+    scheduler.wake("discord")          # e.g. from a file watcher thread
+    scheduler.wake("alerts", within=0.5)  # coalesce a burst of events
+    scheduler.wake_on_signal(signal.SIGUSR1, "discord")
+    scheduler.schedule("error_recheck", recheck, delay=60)  # runs once
+    scheduler.run_forever()
+"""
+
+import heapq
+import itertools
+import logging
+import os
+import random
+import signal
+import threading
+import time
+
+
+class Duty:
+    """A named unit of periodic work."""
+
+    def __init__(self, name, func, interval, jitter=0.0, deadline=None, once=False):
+        self.name = name
+        self.func = func
+        self.interval = float(interval)
+        self.jitter = float(jitter)
+        self.deadline = deadline
+        self.once = once  # Removed after its first run
+        self.next_run = time.monotonic()
+        self.last_run = None
+        self.last_duration = 0.0
+        self.last_lag = 0.0
+        self.runs = 0
+        self.overruns = 0
+        self.failures = 0
+        self.enabled = True
+        self.running = False
+        self.wake_pending = False
+        self.token = None
+
+    def next_interval(self):
+        """Interval until the next run, with jitter applied."""
+        if not self.jitter:
+            return self.interval
+        spread = self.interval * self.jitter
+        return max(0.0, self.interval + random.uniform(-spread, spread))
+
+    def stats(self):
+        """Snapshot of run statistics for logging/health reporting."""
+        return {
+            "interval": self.interval,
+            "runs": self.runs,
+            "overruns": self.overruns,
+            "failures": self.failures,
+            "last_duration": round(self.last_duration, 3),
+            "last_lag": round(self.last_lag, 3),
+        }
+
+
+class Scheduler:
+    """Runs duties at their own cadence, waking early on demand.
+
+    Duty functions may return a number to override the delay (seconds)
+    until their next run, e.g. to sleep exactly until a known deadline.
+    Returning None keeps the duty's normal interval.
+    """
+
+    def __init__(self, logger=None, metrics=None):
+        self.logger = logger or logging.getLogger("clap.scheduler")
+        self.metrics = metrics
+        self.duties = {}
+        self._heap = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._running = False
+        self._before_pass = []
+        self._after_pass = []
+        self._seq = itertools.count()
+
+    def add(self, name, func, interval, jitter=0.0, deadline=None, run_now=True):
+        """Register a duty. Runs immediately unless run_now is False."""
+        duty = Duty(name, func, interval, jitter=jitter, deadline=deadline)
+        if not run_now:
+            duty.next_run = time.monotonic() + duty.next_interval()
+        with self._lock:
+            self.duties[name] = duty
+            self._push(duty)
+        return duty
+
+    def schedule(self, name, func, delay):
+        """Run func once, delay seconds from now, as duty name.
+
+        Scheduling a name that is already pending replaces it, so repeated
+        follow-ups for the same condition never pile up.
+        """
+        duty = Duty(name, func, delay, once=True)
+        duty.next_run = time.monotonic() + max(0.0, delay)
+        with self._lock:
+            previous = self.duties.get(name)
+            if previous is not None:
+                previous.token = None  # Its heap entry is now stale
+            self.duties[name] = duty
+            self._push(duty)
+        self._wakeup.set()
+        return duty
+
+    def before_pass(self, func):
+        """Register a hook called before the first duty of each pass."""
+        self._before_pass.append(func)
+
+    def after_pass(self, func):
+        """Register a hook called after every pass that ran at least one duty."""
+        self._after_pass.append(func)
+
+    def wake(self, name=None, within=0.0):
+        """Make a duty (or all duties) due now. Safe to call from any thread.
+
+        within: run no later than this many seconds from now. Repeated
+        wakes inside that window never push the run back, so a burst of
+        events (e.g. file writes) is coalesced into one run.
+        """
+        due = time.monotonic() + max(0.0, within)
+        with self._lock:
+            targets = [self.duties[name]] if name else list(self.duties.values())
+            for duty in targets:
+                if duty.running:
+                    duty.wake_pending = True
+                elif duty.next_run > due:
+                    duty.next_run = due
+                    self._push(duty)
+        self._wakeup.set()
+
+    def wake_on_signal(self, signum, *names):
+        """Wake duties (default: all) whenever signum arrives.
+
+        The handler only writes a byte to a pipe; a relay thread makes the
+        wake() calls, as the handler may have interrupted the main thread
+        while it holds _lock. Call from the main thread.
+        """
+        read_fd, write_fd = os.pipe()
+        os.set_blocking(write_fd, False)
+
+        def handle(signum, frame):
+            try:
+                os.write(write_fd, b"\0")
+            except BlockingIOError:
+                pass  # Pipe full - a wake is already on its way
+
+        def relay():
+            while os.read(read_fd, 512):
+                for name in names or (None,):
+                    self.wake(name)
+
+        threading.Thread(
+            target=relay, name=f"scheduler-signal-{signum}", daemon=True
+        ).start()
+        signal.signal(signum, handle)
+
+    def run_at(self, name, delay):
+        """Reschedule a duty to run after delay seconds (earlier or later)."""
+        with self._lock:
+            duty = self.duties[name]
+            duty.next_run = time.monotonic() + max(0.0, delay)
+            self._push(duty)
+        self._wakeup.set()
+
+    def set_enabled(self, name, enabled):
+        """Enable or disable a duty without removing it."""
+        with self._lock:
+            self.duties[name].enabled = enabled
+
+    def seconds_until_next(self):
+        """Seconds until the earliest due duty (0 if one is overdue)."""
+        with self._lock:
+            self._discard_stale()
+            if not self._heap:
+                return None
+            return max(0.0, self._heap[0][0] - time.monotonic())
+
+    def run_pending(self):
+        """Run every duty that is currently due. Returns number of duties run."""
+        ran = 0
+        while True:
+            with self._lock:
+                self._discard_stale()
+                if not self._heap or self._heap[0][0] > time.monotonic():
+                    break
+                _, _, duty = heapq.heappop(self._heap)
+                duty.token = None
+                duty.running = duty.enabled
+            if duty.enabled:
+                if not ran:
+                    self._run_hooks(self._before_pass, "before-pass")
+                self._run(duty)
+                ran += 1
+            else:
+                with self._lock:
+                    duty.next_run = time.monotonic() + duty.next_interval()
+                    self._push(duty)
+        if ran:
+            self._run_hooks(self._after_pass, "after-pass")
+        return ran
+
+    def _run_hooks(self, hooks, kind):
+        for hook in hooks:
+            try:
+                hook()
+            except Exception as e:
+                self.logger.error(f"Scheduler {kind} hook failed: {e}")
+
+    def run_forever(self):
+        """Run duties until stop() is called."""
+        self._running = True
+        while self._running:
+            self.run_pending()
+            timeout = self.seconds_until_next()
+            self._wakeup.wait(timeout if timeout is not None else 60)
+            self._wakeup.clear()
+
+    def stop(self):
+        self._running = False
+        self._wakeup.set()
+
+    def _run(self, duty):
+        started = time.monotonic()
+        duty.last_lag = max(0.0, started - duty.next_run)
+        if duty.deadline is not None and duty.last_lag > duty.deadline:
+            duty.overruns += 1
+            self.logger.warning(
+                f"Duty '{duty.name}' started {duty.last_lag:.1f}s late "
+                f"(deadline {duty.deadline}s)"
+            )
+
+        delay = None
+        try:
+            delay = duty.func()
+        except Exception as e:
+            duty.failures += 1
+            self.logger.error(f"Duty '{duty.name}' failed: {e}")
+
+        finished = time.monotonic()
+        duty.last_run = finished
+        duty.last_duration = finished - started
+        duty.runs += 1
+        if self.metrics is not None:
+            self.metrics.observe("duty_seconds", duty.last_duration, duty=duty.name)
+            self.metrics.observe("loop_lag_seconds", duty.last_lag, duty=duty.name)
+
+        if not isinstance(delay, (int, float)) or isinstance(delay, bool):
+            delay = duty.next_interval()
+
+        with self._lock:
+            duty.running = False
+            if duty.once:
+                # Done, unless it scheduled its own successor under the same name
+                if self.duties.get(duty.name) is duty:
+                    del self.duties[duty.name]
+                return
+            if duty.wake_pending:
+                # wake() arrived while the duty was running - go again now
+                duty.wake_pending = False
+                duty.next_run = finished
+            else:
+                duty.next_run = finished + max(0.0, delay)
+            self._push(duty)
+
+    def _push(self, duty):
+        # Entries are (time, seq, duty). Re-pushing supersedes older entries
+        # for the same duty; those are dropped when they reach the top.
+        duty.token = next(self._seq)
+        heapq.heappush(self._heap, (duty.next_run, duty.token, duty))
+
+    def _discard_stale(self):
+        while self._heap and self._heap[0][1] != self._heap[0][2].token:
+            heapq.heappop(self._heap)
@@ -180,8 +180,9 @@ if [ -f "$CLAP_DIR/data/api_error_state.json" ]; then
 fi
 
 # Clear context escalation state to prevent runaway warnings
-if [ -f "$CLAP_DIR/data/context_escalation_state.json" ]; then
-    rm "$CLAP_DIR/data/context_escalation_state.json"
+# (kept in the timer's state store; the .json is only pre-migration)
+rm -f "$CLAP_DIR/data/context_escalation_state.json"
+if python3 "$CLAP_DIR/utils/state_store.py" delete context_state; then
     echo "[SESSION_SWAP] Cleared context escalation state"
 fi
 
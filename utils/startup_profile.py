@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""Cold-start and import-cost profiler for ClAP services and wrappers.
+
+Services restart often (watchdog, clap-start, session swaps) and every
+wrapper call is a cold start, so import time adds up. For every Python
+entry point - the ExecStart of each systemd unit in systemd/ and
+services/, plus the scripts the wrappers and clapd commands run - this
+starts a fresh interpreter that runs the entry point's top-level code
+(with __name__ != "__main__", so no main loop starts) under
+`-X importtime`, and reports:
+
+- wall-clock start time above an empty script's, best of --runs
+- how many modules were imported
+- the heaviest top-level imports by cumulative time
+
+Entry points run from a scratch copy of the tree, with HOME pointed
+at the scratch directory, so import-time side effects (data dirs, state
+stores) stay out of the real install.
+
+--check compares against config/startup_budget.json and exits 1 if any
+budgeted entry point imports more modules or takes longer than allowed.
+Module counts are deterministic; the millisecond budget is deliberately
+loose so slow CI runners don't fail it.
+
+Usage:
+    python3 utils/startup_profile.py                  # table for every entry point
+    python3 utils/startup_profile.py core/autonomous_timer.py --top 15
+    python3 utils/startup_profile.py --json
+    python3 utils/startup_profile.py --check          # CI budget gate
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+CLAP_DIR = Path(__file__).resolve().parent.parent
+BUDGET_FILE = CLAP_DIR / "config" / "startup_budget.json"
+UNIT_DIRS = ("systemd", "services")
+WRAPPER_DIR = "wrappers"
+
+# Runs an entry point's module-level code without its __main__ block
+BOOTSTRAP = (
+    "import os, runpy, sys; "
+    "sys.argv = [sys.argv[1]]; "
+    "sys.path[0] = os.path.dirname(sys.argv[0]); "
+    "runpy.run_path(sys.argv[0], run_name='__clap_profile__')"
+)
+IMPORTTIME = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+COPY_IGNORE = shutil.ignore_patterns(".git", "data", "logs", "__pycache__", "*.log")
+
+# What the bootstrap imports by itself (site, runpy...); filled in by main()
+BASE_MODULES = set()
+
+
+def is_python_script(path):
+    if path.suffix == ".py":
+        return True
+    try:
+        with open(path, "rb") as f:
+            return b"python" in f.readline()
+    except OSError:
+        return False
+
+
+def discover_entry_points():
+    """Relative paths of every Python entry point, services first."""
+    found = []
+
+    def add(rel):
+        rel = os.path.normpath(rel)
+        path = CLAP_DIR / rel
+        if rel not in found and path.is_file() and is_python_script(path):
+            found.append(rel)
+
+    for unit_dir in UNIT_DIRS:
+        for unit in sorted((CLAP_DIR / unit_dir).glob("*.service")):
+            for line in unit.read_text().splitlines():
+                if line.startswith("ExecStart="):
+                    for word in line.split("=", 1)[1].split():
+                        if "claude-autonomy-platform/" in word:
+                            add(word.split("claude-autonomy-platform/", 1)[1])
+
+    # Scripts wrappers run, directly or through clapd
+    try:
+        sys.path.insert(0, str(CLAP_DIR / "utils"))
+        from clapd_client import COMMANDS
+    except ImportError:
+        COMMANDS = {}
+    for script in COMMANDS.values():
+        add(script)
+    script_ref = re.compile(r"(?:claude-autonomy-platform/|\butils/)([\w./-]+)")
+    for wrapper in sorted((CLAP_DIR / WRAPPER_DIR).iterdir()):
+        if not wrapper.is_file():
+            continue
+        try:
+            text = wrapper.read_text()
+        except (OSError, UnicodeDecodeError):
+            continue
+        for match in script_ref.finditer(text):
+            ref = match.group(0)
+            rel = ref.split("claude-autonomy-platform/", 1)[-1]
+            if rel.endswith("clapd_client.py"):
+                command = text[match.end() :].split()[0:1]
+                if command and command[0] in COMMANDS:
+                    add(COMMANDS[command[0]])
+                continue
+            add(rel)
+    return found
+
+
+def _run(args, env):
+    started = time.perf_counter()
+    result = subprocess.run(
+        args, env=env, capture_output=True, text=True, cwd=env["CLAP_DIR"]
+    )
+    return time.perf_counter() - started, result
+
+
+def _run_script(script, env):
+    return _run([sys.executable, "-X", "importtime", "-c", BOOTSTRAP, script], env)
+
+
+def parse_importtime(stderr):
+    """[(name, self_us, cumulative_us, depth)] from -X importtime output."""
+    modules = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules.append((name, int(self_us), int(cumulative_us), len(indent) // 2))
+    return modules
+
+
+def profile(clap_dir, rel, env, runs, baseline, top):
+    script = str(clap_dir / rel)
+    best, result = None, None
+    for _ in range(runs):
+        elapsed, result = _run_script(script, env)
+        best = elapsed if best is None else min(best, elapsed)
+        if result.returncode != 0:
+            break
+
+    modules = [m for m in parse_importtime(result.stderr) if m[0] not in BASE_MODULES]
+    entry = {
+        "entry_point": rel,
+        "ok": result.returncode == 0,
+        "ms": round(max(0.0, best - baseline) * 1000, 1),
+        "modules": len(modules),
+        "top": [
+            {"module": name, "cumulative_ms": round(cumulative / 1000, 1)}
+            for name, _, cumulative, depth in sorted(
+                (m for m in modules if m[3] <= 1), key=lambda m: -m[2]
+            )[:top]
+        ],
+    }
+    if result.returncode != 0:
+        errors = [
+            l for l in result.stderr.splitlines() if not l.startswith("import time:")
+        ]
+        entry["error"] = errors[-1] if errors else f"exit {result.returncode}"
+    return entry
+
+
+def check(results, budget):
+    failures = []
+    by_entry = {r["entry_point"]: r for r in results}
+    for rel, limits in budget.get("entry_points", {}).items():
+        result = by_entry.get(rel)
+        if result is None:
+            failures.append(f"{rel}: not profiled")
+        elif not result["ok"]:
+            failures.append(f"{rel}: failed to start ({result.get('error')})")
+        else:
+            if "max_modules" in limits and result["modules"] > limits["max_modules"]:
+                failures.append(
+                    f"{rel}: imports {result['modules']} modules (budget {limits['max_modules']})"
+                )
+            if "max_ms" in limits and result["ms"] > limits["max_ms"]:
+                failures.append(
+                    f"{rel}: starts in {result['ms']}ms (budget {limits['max_ms']}ms)"
+                )
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile ClAP entry point start-up")
+    parser.add_argument(
+        "entry_points", nargs="*", help="paths relative to the ClAP dir"
+    )
+    parser.add_argument("--runs", type=int, default=3, help="best of N cold starts")
+    parser.add_argument("--top", type=int, default=5, help="heaviest imports to list")
+    parser.add_argument("--json", action="store_true")
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help=f"fail if over the budget in {BUDGET_FILE.relative_to(CLAP_DIR)}",
+    )
+    args = parser.parse_args()
+
+    budget = {}
+    if args.check:
+        budget = json.loads(BUDGET_FILE.read_text())
+    entry_points = args.entry_points or (
+        list(budget.get("entry_points", {})) if args.check else discover_entry_points()
+    )
+
+    with tempfile.TemporaryDirectory(prefix="clap-startup-") as scratch:
+        # Profile a copy under a scratch HOME, as ~/claude-autonomy-platform
+        clap_copy = Path(scratch) / "claude-autonomy-platform"
+        shutil.copytree(CLAP_DIR, clap_copy, symlinks=True, ignore=COPY_IGNORE)
+        for empty_dir in ("data", "logs"):  # As on a fresh install
+            (clap_copy / empty_dir).mkdir(exist_ok=True)
+        env = dict(os.environ, CLAP_DIR=str(clap_copy), HOME=scratch)
+        env.pop("PYTHONPATH", None)
+        # Compile once so every measured run reads cached bytecode
+        subprocess.run(
+            [sys.executable, "-m", "compileall", "-q", str(clap_copy)],
+            capture_output=True,
+        )
+
+        # Baseline: the same bootstrap running an empty script
+        empty = Path(scratch) / "empty.py"
+        empty.write_text("")
+        runs = [_run_script(str(empty), env) for _ in range(args.runs)]
+        baseline = min(elapsed for elapsed, _ in runs)
+        BASE_MODULES.update(m[0] for m in parse_importtime(runs[0][1].stderr))
+
+        results = [
+            profile(clap_copy, rel, env, args.runs, baseline, args.top)
+            for rel in entry_points
+        ]
+
+    if args.json:
+        print(
+            json.dumps(
+                {"baseline_ms": round(baseline * 1000, 1), "entry_points": results},
+                indent=2,
+            )
+        )
+    else:
+        print(f"Empty script: {baseline * 1000:.0f}ms (subtracted below)\n")
+        for r in results:
+            status = "" if r["ok"] else f"  ❌ {r['error']}"
+            print(
+                f"{r['entry_point']:<45} {r['ms']:>7.1f}ms {r['modules']:>4} modules{status}"
+            )
+            for t in r["top"]:
+                print(f"    {t['cumulative_ms']:>7.1f}ms  {t['module']}")
+
+    if args.check:
+        if args.entry_points:  # Only judge what was asked for
+            budget = {
+                "entry_points": {
+                    rel: limits
+                    for rel, limits in budget.get("entry_points", {}).items()
+                    if rel in args.entry_points
+                }
+            }
+        failures = check(results, budget)
+        if failures:
+            print("\n❌ Start-up budget exceeded:")
+            for failure in failures:
+                print(f"  - {failure}")
+            return 1
+        print("\n✅ All entry points within start-up budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,253 @@
+"""Transactional key/value state store for ClAP services (SQLite, WAL).
+
+Replaces the timer's scattered little state files in data/ (one open,
+parse and non-atomic rewrite each, several times a cycle) with one
+SQLite database:
+
+- Reads come from an in-memory copy, refreshed in a single read
+  transaction only when another connection has committed (PRAGMA
+  data_version), so a cycle costs at most one SELECT.
+- Writes are buffered and committed together by flush(), so a cycle
+  costs at most one write transaction. A process killed mid-cycle loses
+  that cycle's writes, never half a file.
+- migrate_files() imports the old files once and removes them.
+
+Values are stored as JSON. Typed accessors cover the common shapes
+(dicts, strings, ints, datetimes).
+
+Files that other tools read or write (api_error_state.json,
+timer_pause.json, autonomy_choice.json) stay files; write them with
+atomic_write_json() so readers never see a torn write.
+
+Usage:
+    from state_store import StateStore
+    store = StateStore(DATA_DIR / "timer_state.sqlite3")
+    store.set("context_state", {"first_warning_sent": True})
+    when = store.get_datetime("last_autonomy_prompt")
+    store.flush()
+
+    python3 utils/state_store.py dump
+    python3 utils/state_store.py delete context_state    # e.g. from swap scripts
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+TIMER_STATE_DB = "timer_state.sqlite3"  # in data/, shared with the CLI below
+
+_MISSING = object()
+
+
+def atomic_write_json(path, data, indent=2):
+    """Write JSON to path via a temp file + rename, so it is never torn."""
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=indent)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+class StateStore:
+    """Small JSON key/value store with batched, atomic commits."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            str(self.path), timeout=5, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS state ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, updated REAL NOT NULL)"
+        )
+        self._values = {}
+        self._dirty = {}  # key -> JSON text, or None for a delete
+        self._data_version = None
+        self.refresh()
+
+    # -- transactions -----------------------------------------------------
+
+    def refresh(self):
+        """Reload from disk if another connection has committed since."""
+        with self._lock:
+            version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            if version == self._data_version:
+                return
+            self._data_version = version
+            rows = self._conn.execute("SELECT key, value FROM state").fetchall()
+            self._values = {}
+            for key, value in rows:
+                try:
+                    self._values[key] = json.loads(value)
+                except ValueError:
+                    continue
+            # Our own pending writes win over what's on disk
+            for key, value in self._dirty.items():
+                if value is None:
+                    self._values.pop(key, None)
+                else:
+                    self._values[key] = json.loads(value)
+
+    def flush(self):
+        """Commit all pending writes in one transaction. Returns keys written."""
+        with self._lock:
+            if not self._dirty:
+                return 0
+            now = time.time()
+            upserts = [(k, v, now) for k, v in self._dirty.items() if v is not None]
+            deletes = [(k,) for k, v in self._dirty.items() if v is None]
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO state (key, value, updated) VALUES (?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET value=excluded.value, "
+                    "updated=excluded.updated",
+                    upserts,
+                )
+                self._conn.executemany("DELETE FROM state WHERE key = ?", deletes)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            written = len(self._dirty)
+            self._dirty.clear()
+            return written
+
+    def close(self):
+        with self._lock:
+            self.flush()
+            self._conn.close()
+
+    # -- generic access ---------------------------------------------------
+
+    def get(self, key, default=None):
+        with self._lock:
+            value = self._values.get(key, _MISSING)
+        if value is _MISSING:
+            return default
+        # Hand out copies of containers so callers can't edit the cache
+        return (
+            json.loads(json.dumps(value)) if isinstance(value, (dict, list)) else value
+        )
+
+    def set(self, key, value):
+        encoded = json.dumps(value)
+        with self._lock:
+            self._values[key] = json.loads(encoded)
+            self._dirty[key] = encoded
+
+    def delete(self, key):
+        with self._lock:
+            self._values.pop(key, None)
+            self._dirty[key] = None
+
+    def keys(self):
+        with self._lock:
+            return sorted(self._values)
+
+    # -- typed accessors --------------------------------------------------
+
+    def get_dict(self, key, default=None):
+        value = self.get(key)
+        return value if isinstance(value, dict) else default
+
+    def get_str(self, key, default=None):
+        value = self.get(key)
+        return value if isinstance(value, str) else default
+
+    def get_int(self, key, default=None):
+        value = self.get(key)
+        return (
+            value if isinstance(value, int) and not isinstance(value, bool) else default
+        )
+
+    def get_datetime(self, key, default=None):
+        value = self.get(key)
+        try:
+            return datetime.fromisoformat(value)
+        except (TypeError, ValueError):
+            return default
+
+    def set_datetime(self, key, when=None):
+        self.set(key, (when or datetime.now()).isoformat())
+
+    # -- migration --------------------------------------------------------
+
+    def migrate_files(self, files):
+        """Import legacy state files once, then remove them.
+
+        files: iterable of (key, path, kind) where kind is "json", "text"
+        or a callable turning the file's text into the stored value.
+        A file is only imported if the key isn't already in the store.
+        Returns the keys migrated.
+        """
+        migrated = []
+        for key, path, kind in files:
+            path = Path(path)
+            if not path.exists():
+                continue
+            if self.get(key, _MISSING) is _MISSING:
+                try:
+                    text = path.read_text()
+                    if kind == "json":
+                        value = json.loads(text)
+                    elif kind == "text":
+                        value = text.strip()
+                    else:
+                        value = kind(text)
+                except (OSError, ValueError, TypeError, KeyError):
+                    continue  # Unreadable - leave it for a human to look at
+                self.set(key, value)
+                migrated.append(key)
+        self.flush()
+        # Only remove the files once their contents are committed
+        for key, path, _ in files:
+            if self.get(key, _MISSING) is not _MISSING:
+                try:
+                    Path(path).unlink()
+                except OSError:
+                    pass
+        return migrated
+
+
+def main(argv):
+    if len(argv) < 2 or argv[1] not in ("dump", "get", "delete"):
+        print("Usage: state_store.py dump | get KEY... | delete KEY...")
+        return 1
+    clap_dir = Path(os.environ.get("CLAP_DIR", Path(__file__).resolve().parent.parent))
+    store = StateStore(clap_dir / "data" / TIMER_STATE_DB)
+    command, keys = argv[1], argv[2:]
+    if command == "dump":
+        for key in store.keys():
+            print(f"{key}: {json.dumps(store.get(key))}")
+    elif command == "get":
+        for key in keys:
+            print(json.dumps(store.get(key)))
+    elif command == "delete":
+        for key in keys:
+            store.delete(key)
+        store.flush()
+    store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
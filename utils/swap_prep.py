@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Pre-warm the slow parts of a session swap before it is triggered.
+
+Launched in the background by the autonomous timer when the context
+forecast (utils/context_forecast.py) says the window will fill soon:
+
+- converts the session transcript up to now into the export checkpoint,
+  so the swap's export only converts the last few turns
+- refreshes the cached natural commands section of CLAUDE.md
+
+session_swap.sh runs the same export and context builder as before and
+picks both caches up automatically; nothing here changes what a swap
+produces, only how much is left to do. Runs are serialised with the
+export's checkpoint lock and recorded in data/swap_prep/status.json.
+
+Usage:
+    python3 utils/swap_prep.py           # prepare now
+    python3 utils/swap_prep.py status    # when the last preparation ran
+"""
+
+import fcntl
+import json
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+try:
+    from utils.export_transcript import export_transcript, CHECKPOINT_DIR, LOCK_FILE
+except ImportError:
+    from export_transcript import export_transcript, CHECKPOINT_DIR, LOCK_FILE
+
+CLAP_DIR = Path(__file__).resolve().parent.parent
+STATUS_FILE = CHECKPOINT_DIR / "status.json"
+
+
+def prepare():
+    """Run every pre-warm step; returns the status written."""
+    started = time.monotonic()
+    steps = {}
+
+    step_start = time.monotonic()
+    steps["export"] = {
+        "ok": export_transcript(prewarm=True, lock=False)
+    }  # main() holds it
+    steps["export"]["seconds"] = round(time.monotonic() - step_start, 3)
+
+    step_start = time.monotonic()
+    result = subprocess.run(
+        [
+            sys.executable,
+            str(CLAP_DIR / "context" / "project_session_context_builder.py"),
+            "--prewarm",
+        ],
+        capture_output=True,
+        text=True,
+    )
+    steps["natural_commands"] = {
+        "ok": result.returncode == 0,
+        "seconds": round(time.monotonic() - step_start, 3),
+    }
+
+    status = {
+        "prepared_at": datetime.now().isoformat(),
+        "seconds": round(time.monotonic() - started, 3),
+        "steps": steps,
+    }
+    tmp = STATUS_FILE.with_suffix(".tmp")
+    tmp.write_text(json.dumps(status, indent=2))
+    os.replace(tmp, STATUS_FILE)
+    return status
+
+
+def main(argv):
+    if len(argv) > 1 and argv[1] == "status":
+        if not STATUS_FILE.exists():
+            print("No swap preparation has run yet")
+            return 0
+        print(STATUS_FILE.read_text())
+        return 0
+
+    CHECKPOINT_DIR.mkdir(parents=True, exist_ok=True)
+    with open(LOCK_FILE, "w") as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            print("[SWAP_PREP] Another preparation is running")
+            return 0
+        status = prepare()
+    print(
+        f"[SWAP_PREP] Prepared in {status['seconds']}s: {json.dumps(status['steps'])}"
+    )
+    return 0 if all(step["ok"] for step in status["steps"].values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,408 @@
+"""Persistent tmux control-mode client shared by pane/session probes.
+
+Instead of forking `tmux capture-pane`, `tmux list-sessions`,
+`tmux has-session` and `pgrep` several times a cycle, each process keeps
+one `tmux -C` client open and sends those commands down its stdin.
+
+The client attaches to its own small session (clap-control) rather than
+the Claude session, so it never counts as a human attaching to
+autonomous-claude. The session is marked destroy-unattached, so it goes
+away when the last ClAP process disconnects.
+
+Change notifications: subscribe(callback) calls
+    callback(kind, name, old, new)
+with kind "session" (existence/attach count changed) or "pane"
+(pane activity/cursor/history changed). tmux pushes %sessions-changed
+and client notifications immediately; pane changes are picked up by a
+cheap in-connection poll (no fork) every poll_interval seconds.
+
+If tmux can't be reached in control mode, every call falls back to the
+old one-shot subprocess, so callers never need to care.
+
+Usage:
+    from tmux_control import capture_pane, session_attached, session_exists
+    text = capture_pane("autonomous-claude", escapes=True)
+    if session_attached("autonomous-claude"): ...
+"""
+
+import collections
+import logging
+import os
+import re
+import subprocess
+import threading
+import time
+
+CONTROL_SESSION = "clap-control"
+COMMAND_TIMEOUT = 5
+RECONNECT_INTERVAL = 30  # seconds between reconnect attempts after failure
+
+logger = logging.getLogger("clap.tmux-control")
+
+
+def _quote(arg):
+    """Quote an argument for the tmux command parser."""
+    return "'" + str(arg).replace("'", "'\\''") + "'"
+
+
+class _Pending:
+    """A command waiting for its %begin/%end block."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.ok = False
+        self.lines = []
+
+
+class TmuxControl:
+    """One long-lived `tmux -C` client with a blocking command API."""
+
+    def __init__(self, control_session=CONTROL_SESSION, poll_interval=2.0):
+        self.control_session = control_session
+        self.poll_interval = poll_interval
+        self._proc = None
+        self._lock = threading.Lock()
+        # Reentrant: connect() sends its first command, which calls connect()
+        self._connect_lock = threading.RLock()
+        self._pending = collections.deque()
+        self._subscribers = []
+        self._watched_panes = set()
+        self._sessions = None
+        self._pane_state = {}
+        self._last_attempt = 0.0
+        self._poke = threading.Event()
+
+    # -- connection -------------------------------------------------------
+
+    @property
+    def connected(self):
+        return self._proc is not None and self._proc.poll() is None
+
+    def connect(self):
+        """Start the control client. Returns True if connected."""
+        if self.connected:
+            return True
+        # The scheduler thread and the watcher/reconnect path can both get
+        # here; only one of them may spawn a client and its threads
+        with self._connect_lock:
+            return self._connect()
+
+    def _connect(self):
+        if self.connected:
+            return True
+        now = time.monotonic()
+        if now - self._last_attempt < RECONNECT_INTERVAL and self._last_attempt:
+            return False
+        self._last_attempt = now
+
+        # Don't start a tmux server just to watch it
+        try:
+            probe = subprocess.run(
+                ["tmux", "list-sessions"], capture_output=True, timeout=COMMAND_TIMEOUT
+            )
+            if probe.returncode != 0:
+                return False
+            self._proc = subprocess.Popen(
+                ["tmux", "-C", "new-session", "-A", "-s", self.control_session, "cat"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.debug(f"tmux control mode unavailable: {e}")
+            self._proc = None
+            return False
+
+        threading.Thread(
+            target=self._reader, name="tmux-control-reader", daemon=True
+        ).start()
+        threading.Thread(
+            target=self._watcher, name="tmux-control-watcher", daemon=True
+        ).start()
+        self.command(
+            f"set-option -t {_quote(self.control_session)} destroy-unattached on"
+        )
+        logger.info("tmux control-mode client connected")
+        return True
+
+    def close(self):
+        proc, self._proc = self._proc, None
+        if proc and proc.poll() is None:
+            try:
+                proc.stdin.close()
+                proc.wait(timeout=2)
+            except (OSError, subprocess.TimeoutExpired):
+                proc.kill()
+        self._fail_pending()
+
+    # -- commands ---------------------------------------------------------
+
+    def command(self, cmd, timeout=COMMAND_TIMEOUT):
+        """Run a tmux command. Returns (ok, output_lines) or (False, None) if
+        the control client isn't usable."""
+        if not self.connect():
+            return False, None
+        pending = _Pending()
+        with self._lock:
+            try:
+                # Append before writing so the reader can never see the
+                # response before the pending entry exists
+                self._pending.append(pending)
+                self._proc.stdin.write((cmd + "\n").encode())
+                self._proc.stdin.flush()
+            except (OSError, AttributeError, ValueError):
+                self._pending.remove(pending)
+                self.close()
+                return False, None
+        if not pending.done.wait(timeout):
+            logger.warning(f"tmux control command timed out: {cmd[:60]}")
+            self.close()
+            return False, None
+        return pending.ok, pending.lines
+
+    def _reader(self):
+        proc = self._proc
+        block = None
+        end_marker = None
+        try:
+            for raw in proc.stdout:
+                line = raw.rstrip(b"\n").decode("utf-8", errors="replace")
+                if block is not None:
+                    # Only the exact %end/%error with our %begin's
+                    # time/number/flags closes the block
+                    if line in end_marker:
+                        if block is not False:
+                            block.ok = line == end_marker[0]
+                            block.done.set()
+                        block = None
+                    elif block is not False:
+                        block.lines.append(line)
+                    continue
+
+                if line.startswith("%begin "):
+                    fields = line.split(" ", 1)[1]
+                    end_marker = (f"%end {fields}", f"%error {fields}")
+                    # flags == 1: a command this client sent
+                    if fields.endswith(" 1"):
+                        with self._lock:
+                            block = self._pending.popleft() if self._pending else False
+                    else:
+                        block = False
+                elif line.startswith(
+                    (
+                        "%sessions-changed",
+                        "%client-detached",
+                        "%client-session-changed",
+                        "%session-renamed",
+                    )
+                ):
+                    self._poke.set()
+                elif line.startswith("%exit"):
+                    break
+        except (OSError, ValueError):
+            pass
+        finally:
+            if self._proc is proc:
+                self._proc = None
+            self._fail_pending()
+            logger.info("tmux control-mode client disconnected")
+
+    def _fail_pending(self):
+        with self._lock:
+            while self._pending:
+                pending = self._pending.popleft()
+                pending.lines = None  # Caller falls back to a subprocess
+                pending.done.set()
+
+    # -- queries ----------------------------------------------------------
+
+    def capture_pane(self, target, escapes=False, start=None):
+        """Pane content as text (like capture-pane -p), or None on failure."""
+        cmd = f"capture-pane -p -t {_quote(target)}"
+        if escapes:
+            cmd += " -e"
+        if start is not None:
+            cmd += f" -S {int(start)}"
+        ok, lines = self.command(cmd)
+        if ok:
+            return "".join(line + "\n" for line in lines)
+        if lines is None:
+            args = ["tmux", "capture-pane", "-t", target, "-p"]
+            if escapes:
+                args.append("-e")
+            if start is not None:
+                args += ["-S", str(int(start))]
+            return _run_fallback(args)
+        return None
+
+    def list_sessions(self):
+        """Map of session name -> number of attached clients."""
+        fmt = "#{session_name}\t#{session_attached}"
+        ok, lines = self.command(f"list-sessions -F {_quote(fmt)}")
+        if lines is None:
+            output = _run_fallback(["tmux", "list-sessions", "-F", fmt])
+            if output is None:
+                return {}
+            lines = output.splitlines()
+        elif not ok:
+            return {}
+        sessions = {}
+        for line in lines:
+            name, _, attached = line.rpartition("\t")
+            if name:
+                try:
+                    sessions[name] = int(attached)
+                except ValueError:
+                    sessions[name] = 0
+        return sessions
+
+    def session_exists(self, name):
+        return name in self.list_sessions()
+
+    def session_attached(self, name):
+        return self.list_sessions().get(name, 0) > 0
+
+    def pane_pid(self, target):
+        """PID of the first pane's process in target, or None."""
+        fmt = "#{pane_pid}"
+        ok, lines = self.command(f"list-panes -t {_quote(target)} -F {_quote(fmt)}")
+        if lines is None:
+            output = _run_fallback(["tmux", "list-panes", "-t", target, "-F", fmt])
+            lines = output.splitlines() if output else []
+        elif not ok:
+            return None
+        return lines[0].strip() if lines and lines[0].strip() else None
+
+    # -- change notifications ---------------------------------------------
+
+    def subscribe(self, callback, panes=()):
+        """Register callback(kind, name, old, new) for session/pane changes.
+
+        panes: targets whose activity should also be watched.
+        """
+        self._subscribers.append(callback)
+        self._watched_panes.update(panes)
+        self.connect()
+        self._poke.set()
+
+    def _watcher(self):
+        proc = self._proc
+        while self._proc is proc and self.connected:
+            self._poke.wait(self.poll_interval)
+            self._poke.clear()
+            if not self._subscribers:
+                continue
+            try:
+                self._check_changes()
+            except Exception as e:
+                logger.debug(f"tmux change check failed: {e}")
+
+    def _check_changes(self):
+        sessions = self.list_sessions()
+        if self._sessions is not None:  # First poll just records the baseline
+            for name in set(sessions) | set(self._sessions):
+                if name == self.control_session:
+                    continue
+                old, new = self._sessions.get(name), sessions.get(name)
+                if old != new:
+                    self._notify("session", name, old, new)
+        self._sessions = sessions
+
+        fmt = "#{window_activity} #{history_size} #{cursor_x},#{cursor_y}"
+        for target in list(self._watched_panes):
+            ok, lines = self.command(
+                f"display-message -p -t {_quote(target)} {_quote(fmt)}"
+            )
+            new = lines[0] if ok and lines else None
+            old = self._pane_state.get(target)
+            if new != old:
+                self._pane_state[target] = new
+                if old is not None:
+                    self._notify("pane", target, old, new)
+
+    def _notify(self, kind, name, old, new):
+        for callback in list(self._subscribers):
+            try:
+                callback(kind, name, old, new)
+            except Exception as e:
+                logger.error(f"tmux change callback failed: {e}")
+
+
+def _run_fallback(args):
+    """One-shot tmux subprocess, used when control mode isn't available."""
+    try:
+        result = subprocess.run(
+            args, capture_output=True, text=True, timeout=COMMAND_TIMEOUT
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout
+
+
+def child_process_running(parent_pid, name):
+    """True if parent_pid has a child whose command name matches name.
+
+    Same semantics as `pgrep -P parent_pid name`, but reads /proc
+    directly instead of forking.
+    """
+    if not os.path.isdir("/proc/self"):
+        try:
+            result = subprocess.run(
+                ["pgrep", "-P", str(parent_pid), name], capture_output=True
+            )
+            return result.returncode == 0
+        except OSError:
+            return False
+
+    pattern = re.compile(name)
+    parent_pid = str(parent_pid)
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "rb") as f:
+                stat = f.read().decode("utf-8", errors="replace")
+        except OSError:
+            continue
+        # Format: pid (comm) state ppid ... - comm may contain spaces/parens
+        comm_start, comm_end = stat.find("("), stat.rfind(")")
+        fields = stat[comm_end + 2 :].split()
+        if len(fields) > 1 and fields[1] == parent_pid:
+            if pattern.search(stat[comm_start + 1 : comm_end]):
+                return True
+    return False
+
+
+_control = None
+_control_lock = threading.Lock()
+
+
+def get_control():
+    """Process-wide shared control client."""
+    global _control
+    with _control_lock:
+        if _control is None:
+            _control = TmuxControl()
+        return _control
+
+
+def capture_pane(target, escapes=False, start=None):
+    return get_control().capture_pane(target, escapes=escapes, start=start)
+
+
+def session_exists(name):
+    return get_control().session_exists(name)
+
+
+def session_attached(name):
+    return get_control().session_attached(name)
+
+
+def pane_pid(target):
+    return get_control().pane_pid(target)
+
+
+def subscribe(callback, panes=()):
+    get_control().subscribe(callback, panes=panes)
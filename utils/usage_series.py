@@ -0,0 +1,340 @@
+"""Append-only per-turn usage time series with minute/hour/day rollups.
+
+check_usage() only remembers the last total cost, so there is no history
+to spot expensive periods or estimate quota burn. The timer appends one
+fixed-width record per cost change to data/usage_series/records.bin:
+
+    timestamp (float64), session id (16-byte UUID), cost delta (float64),
+    context tokens (uint32), cache-read tokens (uint32)
+
+and keeps minute.bin, hour.bin and day.bin rollups (bucket start,
+turns, cost, peak context tokens, cache tokens) up to date as it goes.
+Only the newest bucket ever changes, so a rollup update is a single
+in-place write.
+
+Timestamps never go backwards, so every file is sorted by its first
+field. Range queries binary-search the memory-mapped file (O(log n))
+and read only the records in range. Nothing ever scans logs.
+
+Usage:
+    from usage_series import UsageSeries
+    series = UsageSeries(DATA_DIR / "usage_series")
+    series.append(time.time(), session_id, 0.0123, 91000, 45000)
+    series.totals(time.time() - 86400)           # cost/turns over 24h
+    series.rollup("hour", start=time.time() - 6 * 3600)
+
+    python3 utils/usage_series.py summary         # 1h / 24h / 7d usage
+    python3 utils/usage_series.py rollup hour --hours 24 [--json]
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+import uuid
+from collections import namedtuple
+from datetime import datetime
+from pathlib import Path
+
+MAGIC = b"CLAPUSE1"
+HEADER = struct.Struct("<8sI")  # magic, record size
+RECORD = struct.Struct("<d16sdII")
+BUCKET = struct.Struct("<qIdIQ")
+
+RESOLUTIONS = {"minute": 60, "hour": 3600, "day": 86400}
+
+UsageRecord = namedtuple(
+    "UsageRecord", "timestamp session_id cost_delta context_tokens cache_tokens"
+)
+Bucket = namedtuple("Bucket", "start turns cost peak_context_tokens cache_tokens")
+
+
+def _session_bytes(session_id):
+    try:
+        return uuid.UUID(session_id).bytes
+    except (TypeError, ValueError, AttributeError):
+        return bytes(16)  # unknown
+
+
+def _session_str(raw):
+    return str(uuid.UUID(bytes=raw)) if any(raw) else None
+
+
+def bucket_start(timestamp, resolution):
+    """Start of the bucket containing timestamp (days follow local midnight)."""
+    if resolution == "day":
+        lt = time.localtime(timestamp)
+        return int(time.mktime((lt.tm_year, lt.tm_mon, lt.tm_mday, 0, 0, 0, 0, 0, -1)))
+    width = RESOLUTIONS[resolution]
+    return int(timestamp // width * width)
+
+
+class _RecordFile:
+    """A header plus fixed-width records, sorted by their first field."""
+
+    def __init__(self, path, record, writable):
+        self.record = record
+        self._map = None
+        self._mapped = 0
+        self.fd = os.open(
+            path, os.O_RDWR | os.O_CREAT if writable else os.O_RDONLY, 0o644
+        )
+        size = os.fstat(self.fd).st_size
+        if size == 0 and writable:
+            os.pwrite(self.fd, HEADER.pack(MAGIC, record.size), 0)
+            size = HEADER.size
+        magic, record_size = HEADER.unpack(os.pread(self.fd, HEADER.size, 0))
+        if magic != MAGIC or record_size != record.size:
+            raise ValueError(f"{path} is not a usage series file of this version")
+        torn = (size - HEADER.size) % record.size
+        if torn and writable:
+            # A write cut short by a crash - drop the partial record
+            os.ftruncate(self.fd, size - torn)
+
+    def __len__(self):
+        return (os.fstat(self.fd).st_size - HEADER.size) // self.record.size
+
+    def _view(self):
+        size = os.fstat(self.fd).st_size
+        if size != self._mapped:
+            if self._map is not None:
+                self._map.close()
+            self._map = mmap.mmap(self.fd, size, access=mmap.ACCESS_READ)
+            self._mapped = size
+        return self._map
+
+    def get(self, index):
+        return self.record.unpack_from(
+            self._view(), HEADER.size + index * self.record.size
+        )
+
+    def last(self):
+        count = len(self)
+        return self.get(count - 1) if count else None
+
+    def bisect_left(self, key):
+        """Index of the first record whose first field is >= key."""
+        view = self._view()
+        lo, hi = 0, (len(view) - HEADER.size) // self.record.size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if (
+                self.record.unpack_from(view, HEADER.size + mid * self.record.size)[0]
+                < key
+            ):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def slice(self, start=None, end=None):
+        """Records with start <= first field < end."""
+        lo = self.bisect_left(start) if start is not None else 0
+        hi = self.bisect_left(end) if end is not None else len(self)
+        view = self._view()
+        offset = HEADER.size + lo * self.record.size
+        return [
+            self.record.unpack_from(view, offset + i * self.record.size)
+            for i in range(hi - lo)
+        ]
+
+    def append(self, values):
+        os.pwrite(self.fd, self.record.pack(*values), os.fstat(self.fd).st_size)
+
+    def replace_last(self, values):
+        size = os.fstat(self.fd).st_size
+        os.pwrite(self.fd, self.record.pack(*values), size - self.record.size)
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+        os.close(self.fd)
+
+
+class UsageSeries:
+    """Per-turn usage records plus incrementally maintained rollups."""
+
+    def __init__(self, directory, writable=True):
+        self.directory = Path(directory)
+        if writable:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        self.records = _RecordFile(self.directory / "records.bin", RECORD, writable)
+        self.rollups = {
+            name: _RecordFile(self.directory / f"{name}.bin", BUCKET, writable)
+            for name in RESOLUTIONS
+        }
+        if writable:
+            self._catch_up_rollups()
+
+    def __len__(self):
+        return len(self.records)
+
+    def append(
+        self, timestamp, session_id, cost_delta, context_tokens=0, cache_tokens=0
+    ):
+        last = self.records.last()
+        if last and timestamp < last[0]:
+            timestamp = last[0]  # Keep the file sorted if the clock steps back
+        values = (
+            timestamp,
+            _session_bytes(session_id),
+            cost_delta,
+            max(0, min(int(context_tokens or 0), 0xFFFFFFFF)),
+            max(0, min(int(cache_tokens or 0), 0xFFFFFFFF)),
+        )
+        self.records.append(values)
+        self._roll(values)
+
+    def _roll(self, values):
+        for name, rollup in self.rollups.items():
+            self._roll_into(name, rollup, values)
+
+    @staticmethod
+    def _roll_into(name, rollup, values):
+        timestamp, _, cost_delta, context_tokens, cache_tokens = values
+        start = bucket_start(timestamp, name)
+        last = rollup.last()
+        if last and last[0] == start:
+            rollup.replace_last(
+                (
+                    start,
+                    last[1] + 1,
+                    last[2] + cost_delta,
+                    max(last[3], context_tokens),
+                    last[4] + cache_tokens,
+                )
+            )
+        else:
+            rollup.append((start, 1, cost_delta, context_tokens, cache_tokens))
+
+    def _catch_up_rollups(self):
+        """Bring the rollups level with records.bin after a crash.
+
+        A record is written before its rollups, so a crash can leave the
+        newest bucket short and later buckets missing: rebuild the newest
+        bucket from its records, then roll in everything after it.
+        """
+        for name, rollup in self.rollups.items():
+            last = rollup.last()
+            pending = self.records.slice(last[0] if last else None)
+            if last:
+                in_newest = [v for v in pending if bucket_start(v[0], name) == last[0]]
+                if in_newest:
+                    rebuilt = (
+                        last[0],
+                        len(in_newest),
+                        sum(v[2] for v in in_newest),
+                        max(v[3] for v in in_newest),
+                        sum(v[4] for v in in_newest),
+                    )
+                    if rebuilt != tuple(last):
+                        rollup.replace_last(rebuilt)
+                pending = pending[len(in_newest) :]
+            for values in pending:
+                self._roll_into(name, rollup, values)
+
+    # -- queries ----------------------------------------------------------
+
+    def range(self, start=None, end=None):
+        """UsageRecords with start <= timestamp < end."""
+        return [
+            UsageRecord(ts, _session_str(sid), cost, context, cache)
+            for ts, sid, cost, context, cache in self.records.slice(start, end)
+        ]
+
+    def rollup(self, resolution, start=None, end=None):
+        """Buckets of the given resolution starting in [start, end)."""
+        if start is not None:
+            start = bucket_start(start, resolution)
+        return [
+            Bucket(*values) for values in self.rollups[resolution].slice(start, end)
+        ]
+
+    def totals(self, start=None, end=None):
+        """Turns, cost, peak context and cache tokens over [start, end).
+
+        Uses minute buckets, so the range is rounded to whole minutes.
+        """
+        buckets = self.rollup("minute", start, end)
+        return {
+            "turns": sum(b.turns for b in buckets),
+            "cost": round(sum(b.cost for b in buckets), 6),
+            "peak_context_tokens": max(
+                (b.peak_context_tokens for b in buckets), default=0
+            ),
+            "cache_tokens": sum(b.cache_tokens for b in buckets),
+        }
+
+    def close(self):
+        self.records.close()
+        for rollup in self.rollups.values():
+            rollup.close()
+
+
+def _summary(series, now):
+    result = {}
+    for label, seconds in (
+        ("last_hour", 3600),
+        ("last_24h", 86400),
+        ("last_7d", 7 * 86400),
+    ):
+        result[label] = series.totals(now - seconds)
+    hours = series.rollup("hour", now - 86400)
+    busiest = max(hours, key=lambda b: b.cost, default=None)
+    result["busiest_hour_24h"] = busiest._asdict() if busiest else None
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-turn usage time series")
+    sub = parser.add_subparsers(dest="command", required=True)
+    summary = sub.add_parser("summary", help="usage over the last hour, day and week")
+    summary.add_argument("--json", action="store_true")
+    rollup = sub.add_parser("rollup", help="list rollup buckets")
+    rollup.add_argument("resolution", choices=list(RESOLUTIONS))
+    rollup.add_argument("--hours", type=float, default=24)
+    rollup.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    clap_dir = Path(os.environ.get("CLAP_DIR", Path(__file__).resolve().parent.parent))
+    directory = clap_dir / "data" / "usage_series"
+    if not (directory / "records.bin").exists():
+        print("No usage history recorded yet")
+        return 0
+    series = UsageSeries(directory, writable=False)
+    now = time.time()
+
+    if args.command == "summary":
+        data = _summary(series, now)
+        if args.json:
+            print(json.dumps(data, indent=2))
+            return 0
+        for label in ("last_hour", "last_24h", "last_7d"):
+            t = data[label]
+            print(
+                f"  {label.replace('_', ' ').title():<12} ${t['cost']:.2f} over {t['turns']} turns"
+            )
+        busiest = data["busiest_hour_24h"]
+        if busiest:
+            when = datetime.fromtimestamp(busiest["start"]).strftime("%H:%M")
+            print(
+                f"  Busiest hour  {when} (${busiest['cost']:.2f}, {busiest['turns']} turns)"
+            )
+    else:
+        buckets = series.rollup(args.resolution, now - args.hours * 3600)
+        if args.json:
+            print(json.dumps([b._asdict() for b in buckets], indent=2))
+            return 0
+        for b in buckets:
+            when = datetime.fromtimestamp(b.start).strftime("%Y-%m-%d %H:%M")
+            print(
+                f"{when}  ${b.cost:8.4f}  {b.turns:4d} turns  peak ctx {b.peak_context_tokens:,}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())